@@ -0,0 +1,87 @@
+"""
+Run every benchmark and save the results as JSON.
+
+    python -m benchmarks --output before.json
+    python -m benchmarks --output after.json --compare before.json
+
+`--quick` limits the game benchmarks to the default arena.
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+
+import numpy as np
+
+from . import game, overload, properties, vecenv
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def flatten(results, prefix="") -> dict:
+    """Numeric leaves keyed by their path, e.g. `game.api.13x7x3.attack.bare`."""
+    if isinstance(results, dict):
+        items = results.items()
+    elif isinstance(results, list):
+        items = ((_case_key(case, i), case) for i, case in enumerate(results))
+    else:
+        return {prefix: results} if isinstance(results, (int, float)) else {}
+    flat = {}
+    for key, value in items:
+        flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def _case_key(case, i) -> str:
+    if isinstance(case, dict) and "size" in case and "robots" in case:
+        return "x".join(map(str, case["size"])) + f"/{case['robots']}"
+    return str(i)
+
+
+def compare(results: dict, baseline: dict):
+    new, old = flatten(results), flatten(baseline)
+    for key in sorted(new.keys() & old.keys()):
+        if old[key]:
+            print(f"{key:60} {old[key]:14.4g} -> {new[key]:14.4g}  ({new[key] / old[key]:6.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="print the ratio to the results in this JSON file")
+    parser.add_argument("--quick", action="store_true", help="only the default arena")
+    parser.add_argument("--ticks", type=int, default=200, help="ticks per match in the loop benchmark")
+    args = parser.parse_args()
+
+    sizes = game.SIZES[:1] if args.quick else game.SIZES
+    results = {
+        "meta": metadata(),
+        "game": game.run(sizes, ticks=args.ticks),
+        "properties": properties.run(),
+        "overload": overload.run(),
+        "vecenv": vecenv.run(),
+    }
+    game.report(results["game"])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Throughput of the simulation hot paths.
+
+    python -m benchmarks.game
+
+- `api`: calls per second of the `Game` API, both the bare method body and
+  the full call through `delay` on a virtual clock.
+- `loop`: ticks per second of a headless match of wandering robots.
+- `setup`: time to build an arena, which is mostly building its walls,
+  and to register its robots.
+"""
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from robocraft.config import CONFIG
+from robocraft.game import Game
+from robocraft.robot import Robot
+
+
+# (length, width, height), as in `init.room` of the config
+Size = Tuple[int, int, int]
+
+APIS = ("moveForward", "attack", "senseForward", "senseSurroundings", "getStatus")
+
+
+class Wanderer(Robot):
+    async def run(self):
+        while True:
+            await self.senseForward()
+            await self.moveForward()
+            await self.rotateLeft()
+
+
+def room(size: Size) -> dict:
+    length, width, height = size
+    return {"length": length, "width": width, "height": height}
+
+
+def setup(size: Size, robots: int, ticks: Optional[int] = None) -> Tuple[Game, List, Dict[str, float]]:
+    """A headless game of `robots` wanderers, their entities and the time spent building it."""
+    timeout = None if ticks is None else ticks / CONFIG['init']['game']['ticksPerSec']
+    timings = {}
+    start = time.perf_counter()
+    game = Game(headless=True, room=room(size), timeout=timeout)
+    timings["build"] = time.perf_counter() - start
+    wanderers = [Wanderer() for _ in range(robots)]
+    start = time.perf_counter()
+    for wanderer in wanderers:
+        game.register(wanderer)
+    timings["register"] = time.perf_counter() - start
+    timings["entities"] = len(game.store)
+    return game, [game.entities.get_or_create(wanderer.uuid) for wanderer in wanderers], timings
+
+
+def run_api(size: Size, number: int = 2000) -> Dict[str, Dict[str, float]]:
+    game, (me, other), _ = setup(size, 2)
+    # 让对手正对自己，attack走的是造成伤害的路径
+    game._set_status(other, "location", game._get_status(me, "location") + game._get_status(me, "direction"))
+    home = game._get_status(me, "location")
+    loop = game.clock.new_event_loop()
+    game.clock.start(loop)
+    results = {}
+    try:
+        for name in APIS:
+            method = getattr(game, name)
+
+            def bare():
+                body = method.__wrapped__
+                start = time.perf_counter()
+                for _ in range(number):
+                    body(game, me)
+                return time.perf_counter() - start
+
+            async def scheduled():
+                start = time.perf_counter()
+                for _ in range(number):
+                    await method(me)
+                return time.perf_counter() - start
+
+            results[name] = {"bare": number / bare()}
+            game._set_status(me, "location", home)
+            results[name]["scheduled"] = number / loop.run_until_complete(scheduled())
+            game._set_status(me, "location", home)
+    finally:
+        loop.close()
+    return results
+
+
+def run_loop(size: Size, robots: int, ticks: int = 200) -> Dict[str, float]:
+    game, _, timings = setup(size, robots, ticks)
+    start = time.perf_counter()
+    game.run()
+    elapsed = time.perf_counter() - start
+    return dict(timings, ticks=game.clock.now, ticks_per_sec=game.clock.now / elapsed)
+
+
+SIZES: Sequence[Size] = ((13, 7, 3), (101, 101, 10), (1000, 1000, 10))
+ROBOTS: Dict[Size, Sequence[int]] = {
+    (13, 7, 3): (2, 10, 100),
+    (101, 101, 10): (2, 100, 1000),
+    (1000, 1000, 10): (2, 1000),
+}
+
+
+def run(sizes: Sequence[Size] = SIZES, ticks: int = 200, number: int = 2000) -> dict:
+    results = {"api": {}, "loop": []}
+    for size in sizes:
+        key = "x".join(map(str, size))
+        results["api"][key] = run_api(size, number)
+        for robots in ROBOTS.get(size, (2,)):
+            results["loop"].append(dict(size=list(size), robots=robots, **run_loop(size, robots, ticks)))
+    return results
+
+
+def report(results: dict):
+    for size, apis in results["api"].items():
+        for name, rates in apis.items():
+            print(f"{size:14} {name:18} bare {rates['bare']:12.0f}/s  scheduled {rates['scheduled']:10.0f}/s")
+    for case in results["loop"]:
+        size = "x".join(map(str, case["size"]))
+        print(f"{size:14} robots {case['robots']:5}  build {case['build']:8.3f}s  register {case['register']:8.3f}s"
+              f"  {case['ticks_per_sec']:10.1f} ticks/s")
+
+
+def main():
+    report(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Microbenchmark of `utils.typecheck.overload` dispatch.
+
+    python -m benchmarks.overload
+
+Compares the cached dispatcher against binding every candidate signature
+on every call, which is what `overload` used to do.
+"""
+from functools import wraps
+from numbers import Real
+import timeit
+
+from robocraft.utils.property import AttackProperty
+from robocraft.utils.typecheck import _check_function, overload
+
+
+def uncached_overload(func):
+    registered = [func]
+
+    def register(f):
+        registered.append(f)
+        return wrapped
+
+    @wraps(func)
+    def wrapped(*args, **kwargs):
+        for fn in reversed(registered):
+            try:
+                _check_function(fn, args, kwargs)
+            except TypeError:
+                continue
+            return fn(*args, **kwargs)
+        raise TypeError
+
+    wrapped.register = register
+    return wrapped
+
+
+def make(decorator):
+    @decorator
+    def scale(self, other):
+        return "property"
+
+    @scale.register
+    def scale(self, other: Real):
+        return "number"
+
+    return scale
+
+
+def run(number: int = 20000) -> dict:
+    prop = AttackProperty(1.0)
+    results = {}
+    for name, decorator in (("uncached", uncached_overload), ("cached", overload)):
+        fn = make(decorator)
+        results[name] = {
+            "number": timeit.timeit(lambda: fn(prop, 2.0), number=number) / number,
+            "fallback": timeit.timeit(lambda: fn(prop, prop), number=number) / number,
+        }
+    return results
+
+
+def main():
+    results = run()
+    for case in ("number", "fallback"):
+        before = results["uncached"][case] * 1e6
+        after = results["cached"][case] * 1e6
+        print(f"{case:10} uncached {before:8.2f}us  cached {after:8.2f}us  speedup {before / after:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
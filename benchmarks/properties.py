@@ -0,0 +1,32 @@
+"""
+Arithmetic on the generated property classes.
+
+    python -m benchmarks.properties
+"""
+import timeit
+
+from robocraft.utils.property import ComponentProperty, RobotProperty, SpeedProperty
+from robocraft.config import CONFIG
+
+
+def run(number: int = 20000) -> dict:
+    robot = RobotProperty(**CONFIG['init']['player']['properties'])
+    speed = SpeedProperty(**CONFIG['ticks'])
+    component = ComponentProperty(defense=0.1, speed=0.05)
+    cases = {
+        "robot * number": lambda: robot * 1.5,
+        "robot * component": lambda: robot * (component + 1),
+        "speed / number": lambda: speed / 1.05,
+        "component + component": lambda: component + component,
+        "copy": robot.copy,
+    }
+    return {name: number / timeit.timeit(case, number=number) for name, case in cases.items()}
+
+
+def main():
+    for name, rate in run().items():
+        print(f"{name:22} {rate:12.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
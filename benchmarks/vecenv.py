@@ -0,0 +1,39 @@
+"""
+Robot-steps per second of `VecArena`.
+
+    python -m benchmarks.vecenv
+"""
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+
+from robocraft.vecenv import ACTIONS, VecArena
+
+from .game import Wanderer
+
+
+ARENAS: Sequence[int] = (1, 64, 1024, 4096)
+
+
+def run_arenas(arenas: int, steps: int = 200) -> float:
+    env = VecArena(arenas, [Wanderer, Wanderer])
+    random = np.random.default_rng(0)
+    actions = random.integers(len(ACTIONS), size=(steps, arenas, 2))
+    start = time.perf_counter()
+    for step in range(steps):
+        env.step(actions[step])
+    return arenas * 2 * steps / (time.perf_counter() - start)
+
+
+def run(arenas: Sequence[int] = ARENAS, steps: int = 200) -> Dict[str, float]:
+    return {str(n): run_arenas(n, steps) for n in arenas}
+
+
+def main():
+    for arenas, rate in run().items():
+        print(f"{arenas:>6} arenas {rate:14.0f} robot-steps/s")
+
+
+if __name__ == "__main__":
+    main()
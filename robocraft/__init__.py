@@ -2,4 +2,6 @@ from . import (
     display, env, entities,
     robot, utils, config,
     events, exceptions, game,
+    clock, metrics, recording, host, spectate, observation, vecenv,
+    navigation,
 )
@@ -0,0 +1,371 @@
+import asyncio
+from contextvars import ContextVar
+import heapq
+import math
+import selectors
+from typing import Callable, Dict, List, Optional
+
+
+# 当前上下文里正在进行的比赛的虚拟时钟，由VirtualClock.start设置
+_running: ContextVar[Optional["VirtualClock"]] = ContextVar("clock", default=None)
+
+
+class Clock:
+    """Turns game ticks into awaitable delays.
+
+    Everything in the game that waits (the `delay` decorator, `halt`,
+    `Game.loop`) goes through `Clock.sleep` with a whole number of ticks.
+    Sleepers are parked in a timing wheel: one slot per due tick, holding
+    its futures in arrival order, and a heap of the ticks that have a
+    slot. A tick's slot is woken in one batch, whichever way the clock is
+    driven, so real-time and virtual matches play out the same tick for
+    tick, and the bookkeeping grows with the number of distinct due ticks
+    rather than with the number of sleepers.
+
+    `idle` is the game loop's wait: it wakes after the slot of the next
+    tick anything is due, skipping the ticks nobody waits for.
+    """
+
+    def __init__(self, tick: float):
+        self.tick = tick
+        self._holds = 0
+        self._now = 0
+        self._slots: Dict[int, List[asyncio.Future]] = {}
+        self._ticks: List[int] = []
+        # idle的等待者，[到期的tick, future, 最早的tick]；到期的tick会随新的sleep提前
+        self._idler: Optional[list] = None
+        # 换算成tick的事件循环定时器，和sleep的槽分开，在同一个tick里最后唤醒
+        self._timers: Dict[int, List[asyncio.Future]] = {}
+        self._timer_ticks: List[int] = []
+
+    @property
+    def now(self) -> int:
+        return self._now
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        pass
+
+    def stop(self, loop: asyncio.AbstractEventLoop):
+        """The match on `loop` is over; the clock keeps its last tick."""
+
+    def hold(self):
+        """Keep time from being skipped ahead until the matching `release`.
+
+        Only a `VirtualClock` skips time, and it won't while held; wall time
+        goes on regardless.
+        """
+        self._holds += 1
+
+    def release(self):
+        self._holds -= 1
+
+    async def sleep(self, ticks: int):
+        future = asyncio.get_running_loop().create_future()
+        due = self.now + ticks
+        slot = self._slots.get(due)
+        if slot is None:
+            slot = self._slots[due] = []
+            heapq.heappush(self._ticks, due)
+        slot.append(future)
+        self.touch(due)
+        self._scheduled(due)
+        await future
+
+    async def idle(self, limit: int) -> int:
+        """Sleep until the end of the next tick anything is due, but not past `limit`.
+
+        Waits at least one tick. The wait is woken after every other sleeper
+        of its tick, and cut short when something is scheduled earlier (see
+        `touch`). Returns the tick it was due at.
+        """
+        if self._idler is not None:
+            raise RuntimeError("The clock is already idling")
+        earliest = self.now + 1
+        due = self._next_due(earliest)
+        due = limit if due is None else min(due, limit)
+        future = asyncio.get_running_loop().create_future()
+        self._idler = [max(due, earliest), future, earliest]
+        self._scheduled(self._idler[0])
+        try:
+            return await future
+        finally:
+            self._idler = None
+
+    def touch(self, due: int):
+        """Make sure `idle` wakes at tick `due` at the latest."""
+        idler = self._idler
+        if idler is not None and due < idler[0] and not idler[1].done():
+            idler[0] = max(due, idler[2])
+            self._scheduled(idler[0])
+
+    def lateness(self, due: int) -> float:
+        """Seconds between the deadline of tick `due` and now."""
+        return (self.now - due) * self.tick
+
+    def _scheduled(self, due: int):
+        pass
+
+    def _timer(self, future: asyncio.Future, due: int):
+        """Resolve `future` at tick `due`, after that tick's sleepers and idle wait.
+
+        That is where a loop timer with the same deadline would fire.
+        """
+        slot = self._timers.get(due)
+        if slot is None:
+            slot = self._timers[due] = []
+            heapq.heappush(self._timer_ticks, due)
+        slot.append(future)
+        self._scheduled(due)
+
+    def _next_due(self, after: Optional[int] = None) -> Optional[int]:
+        """Earliest due tick, but not before `after`.
+
+        Only sleepers count when `after` is given; otherwise the idle wait
+        and the timers do too.
+        """
+        ticks, slots = self._ticks, self._slots
+        _prune(ticks, slots)
+        due = ticks[0] if ticks else None
+        if after is not None:
+            if due is not None and due < after:
+                due = min((t for t in ticks if t >= after and not all(f.done() for f in slots[t])), default=None)
+            return due
+        idler = self._idler
+        if idler is not None and not idler[1].done() and (due is None or idler[0] < due):
+            due = idler[0]
+        timers = self._timer_ticks
+        _prune(timers, self._timers)
+        if timers and (due is None or timers[0] < due):
+            due = timers[0]
+        return due
+
+    def _wake(self):
+        ticks, slots = self._ticks, self._slots
+        while ticks and ticks[0] <= self._now:
+            due = heapq.heappop(ticks)
+            for future in slots.pop(due):
+                if not future.done():
+                    future.set_result(due)
+        idler = self._idler
+        if idler is not None and idler[0] <= self._now and not idler[1].done():
+            idler[1].set_result(idler[0])
+        ticks, slots = self._timer_ticks, self._timers
+        while ticks and ticks[0] <= self._now:
+            due = heapq.heappop(ticks)
+            for future in slots.pop(due):
+                if not future.done():
+                    future.set_result(due)
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.new_event_loop()
+
+
+def _prune(ticks: List[int], slots: Dict[int, List[asyncio.Future]]):
+    # 只剩已取消的future的槽直接丢掉
+    while ticks and all(future.done() for future in slots[ticks[0]]):
+        del slots[heapq.heappop(ticks)]
+
+
+class RealtimeClock(Clock):
+    """Wall-clock pacing, `tick` seconds per tick.
+
+    A single loop timer is armed for the earliest due tick; when it fires
+    every sleeper due by then is woken in one batch.
+    """
+
+    # 浮点误差的容忍度，避免在tick边界上被算成前一个tick
+    EPSILON = 1e-3
+
+    def __init__(self, tick: float):
+        super().__init__(tick)
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__origin: float = 0.0
+        self.__timer: Optional[asyncio.TimerHandle] = None
+        self.__armed: Optional[int] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self.__loop = loop
+        self.__origin = loop.time()
+        self.__timer = self.__armed = None
+        self._now = 0
+
+    def stop(self, loop: asyncio.AbstractEventLoop):
+        if self.__loop is not loop:
+            return
+        self._now = self.now
+        if self.__timer is not None:
+            self.__timer.cancel()
+        self.__loop = self.__timer = self.__armed = None
+
+    @property
+    def now(self) -> int:
+        if self.__loop is None:
+            return self._now
+        elapsed = math.floor((self.__loop.time() - self.__origin) / self.tick + self.EPSILON)
+        return max(self._now, elapsed)
+
+    async def sleep(self, ticks: int):
+        loop = asyncio.get_running_loop()
+        if loop is not self.__loop:
+            # 在Game.run之外直接调用API时，绑定到当前运行的事件循环
+            self.start(loop)
+        await super().sleep(ticks)
+
+    def lateness(self, due: int) -> float:
+        if self.__loop is None:
+            return super().lateness(due)
+        return self.__loop.time() - (self.__origin + due * self.tick)
+
+    def _scheduled(self, due: int):
+        if self.__armed is None or due < self.__armed:
+            self.__arm(due)
+
+    def __arm(self, due: int):
+        if self.__timer is not None:
+            self.__timer.cancel()
+        self.__armed = due
+        self.__timer = self.__loop.call_at(self.__origin + due * self.tick, self.__fire)
+
+    def __fire(self):
+        self._now = max(self._now, self.__armed)
+        self.__timer = self.__armed = None
+        self._wake()
+        due = self._next_due()
+        if due is not None:
+            self.__arm(due)
+
+
+class VirtualClock(Clock):
+    """Discrete-event scheduler driven by tick count.
+
+    When the event loop has nothing else to run it calls `advance`, which
+    jumps straight to the next due tick, so a match runs as fast as the CPU
+    allows and always in the same order. It must run on a
+    `VirtualEventLoop`, either its own or one shared with other matches.
+    `start` makes it the clock of the current context, which the tasks
+    started from it inherit.
+    """
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        if not isinstance(loop, VirtualEventLoop):
+            raise TypeError("A VirtualClock can only run on a VirtualEventLoop")
+        loop.attach(self)
+        _running.set(self)
+
+    def stop(self, loop: asyncio.AbstractEventLoop):
+        loop.detach(self)
+
+    def advance(self, limit: Optional[int] = None) -> bool:
+        """Move to the next due tick, but not past `limit`.
+
+        Returns whether the clock moved or woke anything.
+        """
+        if self._holds:
+            return False
+        target = self._next_due()
+        if limit is not None and (target is None or limit < target):
+            target = limit
+        if target is None:
+            return False
+        self._now = max(self._now, target)
+        self._wake()
+        return True
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return VirtualEventLoop(self)
+
+
+class _IdleSelector(selectors.DefaultSelector):
+    """Advances `VirtualClock`s whenever the loop would otherwise block.
+
+    The first clock is the loop's own; the others belong to matches that
+    share the loop.
+    """
+
+    def __init__(self, clocks: List[VirtualClock]):
+        super().__init__()
+        self.__clocks = clocks
+
+    def select(self, timeout=None):
+        if timeout is None or timeout > 0:
+            clock = self.__clocks[0]
+            # 各场比赛互不影响，整个循环都空闲时各自跳到自己下一个到期的tick
+            advanced = [other.advance() for other in self.__clocks[1:]]
+            if not any(advanced):
+                limit = None
+                if timeout is not None:
+                    limit = clock.now + math.ceil(timeout / clock.tick)
+                advanced.append(clock.advance(limit))
+            if any(advanced):
+                timeout = 0
+        return super().select(timeout)
+
+
+class _TickTimer:
+    """What `VirtualEventLoop.call_at` returns for a timer kept by an attached clock."""
+
+    def __init__(self, when: float, future: asyncio.Future):
+        self.__when = when
+        self.__future = future
+
+    def when(self) -> float:
+        return self.__when
+
+    def cancel(self):
+        self.__future.cancel()
+
+    def cancelled(self) -> bool:
+        return self.__future.cancelled()
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time is the virtual clock's time.
+
+    Plain `asyncio.sleep` calls inside robots keep working and are rounded
+    up to whole ticks. Other virtual clocks can be attached, so that many
+    headless matches run side by side on one loop, each at its own pace.
+    Inside an attached clock's match, `time` is that clock's time and loop
+    timers are kept by that clock, so they don't depend on the other
+    matches.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self.__clocks = [clock]
+        super().__init__(_IdleSelector(self.__clocks))
+        self.__clock = clock
+        self.__attached = set()
+
+    def attach(self, clock: VirtualClock):
+        if clock not in self.__clocks:
+            self.__clocks.append(clock)
+            self.__attached.add(clock)
+
+    def detach(self, clock: VirtualClock):
+        if clock is not self.__clock and clock in self.__clocks:
+            self.__clocks.remove(clock)
+            self.__attached.discard(clock)
+
+    def __current(self, context=None) -> VirtualClock:
+        clock = context.get(_running) if context is not None else _running.get()
+        return clock if clock in self.__attached else self.__clock
+
+    def time(self) -> float:
+        clock = self.__current()
+        return clock.now * clock.tick
+
+    def call_later(self, delay: float, callback: Callable, *args, context=None):
+        clock = self.__current(context)
+        return self.call_at(clock.now * clock.tick + delay, callback, *args, context=context)
+
+    def call_at(self, when: float, callback: Callable, *args, context=None):
+        clock = self.__current(context)
+        if clock is self.__clock:
+            return super().call_at(when, callback, *args, context=context)
+        # 和_IdleSelector一样向上取整到整tick
+        due = clock.now + math.ceil((when - clock.now * clock.tick) / clock.tick)
+        if due <= clock.now:
+            return self.call_soon(callback, *args, context=context)
+        future = self.create_future()
+        future.add_done_callback(lambda f: f.cancelled() or callback(*args), context=context)
+        clock._timer(future, due)
+        return _TickTimer(when, future)
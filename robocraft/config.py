@@ -1,8 +1,36 @@
 import os
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
 
 import yaml
 
+from .utils.property import CapacityProperty, ComponentProperty, RobotProperty, SpeedProperty
+
 
 __path = os.path.join(os.path.dirname(__file__), "config.yml")
 with open(__path, "r") as f:
     CONFIG = yaml.safe_load(f)
+
+
+class Component(NamedTuple):
+    costs: CapacityProperty
+    properties: ComponentProperty
+
+
+def _compile(cls, data, where: str):
+    try:
+        return cls(**data)
+    except TypeError as e:
+        raise ValueError(f"Invalid {where} in config.yml: {e}") from None
+
+
+# 下面这些表在加载时构造并校验一次，之后只读
+BASE_PROPERTIES: RobotProperty = _compile(RobotProperty, CONFIG['init']['player']['properties'], "init.player.properties")
+BASE_TIME_COSTS: SpeedProperty = _compile(SpeedProperty, CONFIG['ticks'], "ticks")
+COMPONENTS: Mapping[str, Component] = MappingProxyType({
+    name: Component(
+        _compile(CapacityProperty, spec['costs'], f"costs of component {name}"),
+        _compile(ComponentProperty, spec['properties'], f"properties of component {name}"),
+    )
+    for name, spec in CONFIG['components'].items()
+})
@@ -0,0 +1,137 @@
+"""
+Vertex data of the 3-D view, built with numpy only.
+
+Coordinates are the game's: the inside of the room is `|x| <= length // 2`,
+`|y| <= height // 2` and `|z| <= width // 2`, one unit per cell.
+
+- `arena_faces`: the six inner faces of the room, one quad each. Texture
+  coordinates count cells, so a repeating cell texture draws the grid; the
+  vertex count does not depend on the size of the room.
+- `RobotBuffer`: one cube per robot in a single vertex array, rewritten
+  only for robots that changed.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class Face(NamedTuple):
+    name: str
+    vertices: np.ndarray
+    normals: np.ndarray
+    texcoords: np.ndarray
+
+
+# (名字, 法线所在的轴, 墙在这根轴的哪一侧)
+FACES = (
+    ("left", 0, -1), ("right", 0, 1),
+    ("bottom", 1, -1), ("top", 1, 1),
+    ("back", 2, -1), ("front", 2, 1),
+)
+
+# 单位立方体的12个三角形，中心在原点
+_CORNERS = np.array([[x, y, z] for x in (-.5, .5) for y in (-.5, .5) for z in (-.5, .5)], dtype=np.float32)
+_CUBE_TRIANGLES = (
+    (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5),
+    (0, 4, 5), (0, 5, 1), (2, 3, 7), (2, 7, 6),
+    (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3),
+)
+CUBE = _CORNERS[np.array(_CUBE_TRIANGLES).ravel()]
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=16)
+def arena_faces(length: int, height: int, width: int) -> Tuple[Face, ...]:
+    """The inner faces of a room, as two triangles each, cached by its size."""
+    extent = np.array([length // 2, height // 2, width // 2], dtype=np.float32) + .5
+    faces = []
+    for name, axis, side in FACES:
+        u, v = [a for a in range(3) if a != axis]
+        corners = np.zeros((4, 3), dtype=np.float32)
+        corners[:, axis] = side * extent[axis]
+        corners[:, u] = extent[u] * np.array([-1, 1, 1, -1])
+        corners[:, v] = extent[v] * np.array([-1, -1, 1, 1])
+        normal = np.zeros(3, dtype=np.float32)
+        normal[axis] = -side
+        order = [0, 1, 2, 0, 2, 3]
+        # 三角形按逆时针朝向房间内部
+        if np.cross(corners[1] - corners[0], corners[2] - corners[0]) @ normal < 0:
+            order = [0, 2, 1, 0, 3, 2]
+        cells = np.array([[0, 0], [2 * extent[u], 0], [2 * extent[u], 2 * extent[v]], [0, 2 * extent[v]]],
+                         dtype=np.float32)
+        faces.append(Face(
+            name,
+            _readonly(corners[order]),
+            _readonly(np.tile(normal, (6, 1))),
+            _readonly(cells[order]),
+        ))
+    return tuple(faces)
+
+
+class RobotBuffer:
+    """Cubes of every robot in one vertex array.
+
+    Each robot owns a slot of `len(CUBE)` vertices. `update` rewrites only the
+    slots of the rows it is given and widens `dirty`, the slot range that
+    has to be uploaded again. Dead robots and unused slots collapse to a
+    point, which draws nothing.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.vertices = np.zeros((capacity * len(CUBE), 3), dtype=np.float32)
+        self.slots: Dict[int, int] = {}
+        self.dirty: Optional[Tuple[int, int]] = None
+        self.grown = True
+
+    @property
+    def capacity(self) -> int:
+        return len(self.vertices) // len(CUBE)
+
+    def update(self, rows: Iterable[int], locations: np.ndarray, alive: np.ndarray):
+        """Place the robots of `rows` (entity ids) at `locations`."""
+        rows = list(rows)
+        if not rows:
+            return
+        slots = np.array([self.__slot(row) for row in rows], dtype=np.int64)
+        cubes = self.vertices.reshape(-1, len(CUBE), 3)
+        locations = np.asarray(locations, dtype=np.float32)
+        shown = np.asarray(alive, dtype=bool)[:, None, None]
+        cubes[slots] = locations[:, None, :] + np.where(shown, CUBE[None], 0)
+        low, high = int(slots.min()), int(slots.max()) + 1
+        if self.dirty is not None:
+            low, high = min(low, self.dirty[0]), max(high, self.dirty[1])
+        self.dirty = (low, high)
+
+    def update_from_store(self, store, rows: Iterable[int], player_type: type):
+        """Take the players among `rows` from an `EntityStore`."""
+        rows = np.fromiter(rows, dtype=np.int64)
+        if not len(rows) or player_type not in store.types:
+            return
+        rows = rows[store.type[rows] == store.types.index(player_type)]
+        self.update(rows.tolist(), store.location[rows], store.alive[rows])
+
+    def update_from_frame(self, frame, player_type: int):
+        """Take the players of a spectator frame; `player_type` is their type code."""
+        rows = frame.rows[frame.rows["type"] == player_type]
+        self.update(rows["entity"].tolist(), rows["location"], rows["alive"])
+
+    def take_dirty(self) -> Optional[Tuple[int, int]]:
+        """Vertex range changed since the last call, or None."""
+        dirty, self.dirty = self.dirty, None
+        if dirty is None:
+            return None
+        return dirty[0] * len(CUBE), dirty[1] * len(CUBE)
+
+    def __slot(self, row: int) -> int:
+        slot = self.slots.get(row)
+        if slot is None:
+            slot = self.slots[row] = len(self.slots)
+            if slot >= self.capacity:
+                self.vertices = np.concatenate([self.vertices, np.zeros_like(self.vertices)])
+                self.grown = True
+        return slot
@@ -1,23 +1,55 @@
+from functools import lru_cache
+from typing import Iterable, Tuple
+
 import ratcave as rc
 
-from ..misc.type_check import type_check
-from .resources import mesh_reader
+from ..entities import Entity
+from ..utils.typecheck import type_check
+from .geometry import RobotBuffer, arena_faces
 
 
+@lru_cache(maxsize=16)
 @type_check()
-def getPlayground(length: int, height: int, width: int):
-    # center = mesh_reader.get_mesh("Cube", position=(0, 0, 0), scale=.01)
-    playground = []
-    for x in range(length):
-        for y in range(height):
-            # playground.append(mesh_reader.get_mesh("Cube", position=(x, y, 0), scale=.5))
-            playground.append(mesh_reader.get_mesh("Cube", position=(x, y, width), scale=.5))
-    # for x in range(length):
-    #     for z in range(width):
-    #         playground.append(mesh_reader.get_mesh("Cube", position=(x, 0, z), scale=.5))
-    #         playground.append(mesh_reader.get_mesh("Cube", position=(x, height, z), scale=.5))
-    # for x in range(length):
-    #     for y in range(height):
-    #         playground.append(mesh_reader.get_mesh("Cube", position=(0, y, z), scale=.5))
-    #         playground.append(mesh_reader.get_mesh("Cube", position=(length, y, z), scale=.5))
-    return playground
+def getPlayground(length: int, height: int, width: int) -> Tuple[rc.Mesh, ...]:
+    """The six inner faces of the room, one merged mesh (one draw call) each.
+
+    Cached by room size, so every view of the same room shares the meshes;
+    it is a tuple so that no view can change what the others get.
+    """
+    return tuple(
+        rc.Mesh.from_incomplete_data(face.vertices, normals=face.normals, texcoords=face.texcoords,
+                                     name=face.name, mean_center=False)
+        for face in arena_faces(length, height, width)
+    )
+
+
+class Robots:
+    """Every robot as one dynamic mesh.
+
+    Call `update` with the rows that changed (`pop` of the view's own
+    `Game.track_changes`, or the rows of a spectator frame through
+    `buffer.update_from_frame`) and `sync` once per frame; only the
+    vertices of robots that moved are copied into the mesh.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.buffer = RobotBuffer(capacity)
+        self.mesh = None
+
+    def update(self, store, rows: Iterable[int]):
+        self.buffer.update_from_store(store, rows, Entity.Player)
+
+    def sync(self) -> rc.Mesh:
+        buffer = self.buffer
+        if buffer.grown or self.mesh is None:
+            # 容量变了就重建网格，否则只拷贝变化的那一段顶点
+            buffer.grown = False
+            buffer.take_dirty()
+            self.mesh = rc.Mesh.from_incomplete_data(buffer.vertices, name="robots",
+                                                     mean_center=False, dynamic=True)
+        else:
+            dirty = buffer.take_dirty()
+            if dirty is not None:
+                low, high = dirty
+                self.mesh.vertices[low:high] = buffer.vertices[low:high]
+        return self.mesh
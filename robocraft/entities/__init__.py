@@ -1,3 +1,4 @@
 from .entity import Entity, EntityFactory
 from .blocks import Wall
 from .robot import Player
+from .store import EntityStore
@@ -3,4 +3,4 @@ from .entity import Entity
 
 @Entity.register
 class Wall(Entity):
-    pass
+    __slots__ = ()
@@ -1,46 +1,66 @@
-from typing import Type, Optional
-from uuid import uuid4, UUID
+import itertools
+from typing import Dict, Type, Optional
+from uuid import UUID
 
 
 class Entity:
+    """Something that occupies a cell.
+
+    Entities are compared and hashed by identity. `id` is the sequential
+    integer handed out by `EntityFactory` (and the entity's row in the
+    game's `EntityStore`); only players, which robots address from outside,
+    carry a `uuid`.
+    """
+    __slots__ = ("id",)
     visible: bool = True
+    uuid: Optional[UUID] = None
 
     def __init__(self, **kwargs):
-        self.visible = self.__class__.visible
+        self.id = -1
         for key, value in kwargs.items():
             setattr(self, key, value)
 
     @classmethod
     def register(cls, subclass: type):
         setattr(cls, subclass.__qualname__, subclass)
+        return subclass
 
-    def __eq__(self, other):
-        return self.uuid == other.uuid
-
-    def __hash__(self):
-        return hash(self.uuid)
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(id={self.id})"
 
 
 class EntityFactory:
+    """Registry of a game's entities.
+
+    Ids are sequential integers. Players are also indexed by uuid; walls are
+    only reachable through their id.
+    """
+
     def __init__(self):
-        self.entities = {}
+        self.entities: Dict[UUID, Entity] = {}
+        self.__ids = itertools.count()
+        self.__count = 0
+
+    def __len__(self) -> int:
+        return self.__count
 
     def get_or_create(self, uuid: UUID, entity_type: Optional[Type[Entity]]=None, *args, **kwargs) -> Entity:
-        if uuid in self.entities:
-            return self.entities[uuid]
+        entity = self.entities.get(uuid)
+        if entity is not None:
+            return entity
         elif entity_type is not None:
-            obj = entity_type(*args, **kwargs)
-            obj.uuid = uuid
-            self.entities[uuid] = obj
-            return obj
+            entity = self.create(entity_type, *args, **kwargs)
+            entity.uuid = uuid
+            self.entities[uuid] = entity
+            return entity
         else:
             raise KeyError(f"Can't find entity with uuid {uuid}")
 
     def create(self, entity_type: Optional[Type[Entity]]=None, *args, **kwargs) -> Entity:
-        obj = entity_type(*args, **kwargs)
-        obj.uuid = uuid4()
-        self.entities[obj.uuid] = obj
-        return obj
+        entity = entity_type(*args, **kwargs)
+        entity.id = next(self.__ids)
+        self.__count += 1
+        return entity
 
     def keys(self):
         return self.entities.keys()
@@ -3,6 +3,8 @@ from .entity import Entity
 
 @Entity.register
 class Player(Entity):
+    __slots__ = ("robot", "uuid")
+
     def __init__(self, robot, **kwargs):
         self.robot = robot
         super().__init__(**kwargs)
@@ -0,0 +1,69 @@
+from typing import Any, List
+
+import numpy as np
+
+from .entity import Entity
+
+
+class EntityStore:
+    """Columnar state of every entity in a game.
+
+    Players and walls share one schema. Entities are added in the order the
+    `EntityFactory` hands out their ids, so a lookup is `column[entity.id]`.
+    Hot state (location, direction, hp, alive, type) lives in contiguous
+    NumPy columns that grow by doubling; rarely read per-player objects
+    (properties, enhancements, time costs and the per-API tick table) live
+    in plain lists and are None for walls.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.__size = 0
+        self.location = np.zeros((capacity, 3), dtype=np.int64)
+        self.direction = np.zeros((capacity, 3), dtype=np.int64)
+        self.hp = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.type = np.zeros(capacity, dtype=np.uint8)
+        self.entities: List[Entity] = []
+        self.properties: List[Any] = []
+        self.enhancements: List[Any] = []
+        self.timeCosts: List[Any] = []
+        self.ticks: List[Any] = []
+        self.types: List[type] = []
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def add(self, entity: Entity, location, direction=(0, 0, 0), hp: float = 0.0,
+            properties=None, enhancements=None, timeCosts=None, ticks=None) -> int:
+        """Append `entity` as row `entity.id`, which must be the next row."""
+        i = self.__size
+        if entity.id != i:
+            raise ValueError(f"{entity} added out of order, expected id {i}")
+        if i == len(self.hp):
+            self.__grow()
+        entity_type = type(entity)
+        if entity_type not in self.types:
+            self.types.append(entity_type)
+        self.location[i] = location
+        self.direction[i] = direction
+        self.hp[i] = hp
+        self.alive[i] = True
+        self.type[i] = self.types.index(entity_type)
+        self.entities.append(entity)
+        self.properties.append(properties)
+        self.enhancements.append(enhancements)
+        self.timeCosts.append(timeCosts)
+        self.ticks.append(ticks)
+        self.__size += 1
+        return i
+
+    def type_of(self, i: int) -> type:
+        return self.types[self.type[i]]
+
+    def __grow(self):
+        for column in ("location", "direction", "hp", "alive", "type"):
+            array = getattr(self, column)
+            setattr(self, column, np.concatenate([array, np.zeros_like(array)]))
+
+    def nbytes(self) -> int:
+        return sum(getattr(self, column).nbytes for column in ("location", "direction", "hp", "alive", "type"))
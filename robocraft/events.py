@@ -1,10 +1,50 @@
-from collections import defaultdict, deque
+import asyncio
+from collections import Counter, defaultdict, deque
+import inspect
+import logging
+from typing import Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
 
 
 class EventHandler:
-    def __init__(self):
+    """Bounded event queue of one subscriber (the game or a robot).
+
+    - At most `maxlen` events are pending. When full, `overflow` decides
+      whether the oldest pending event or the incoming one is dropped.
+    - Events registered with `coalesce` merge into the pending event of the
+      same name instead of queueing again.
+    - Events with a higher priority are dispatched first; ties keep their
+      firing order.
+    - `poll` runs the handlers concurrently and waits for them at most
+      `budget` seconds; slower handlers keep running in the background.
+    - `stats` counts queued, coalesced, dropped and dispatched events;
+      `fired` counts every `fire` per event name, whatever became of it.
+    """
+
+    def __init__(self, maxlen: int = 1024, overflow: str = DROP_OLDEST, budget: Optional[float] = None):
+        if overflow not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Invalid overflow policy {overflow}")
         self.handlers = defaultdict(list)
-        self.events = deque()
+        self.maxlen = maxlen
+        self.overflow = overflow
+        self.budget = budget
+        self.priorities: Dict[str, int] = {}
+        self.stats = Counter()
+        self.fired = Counter()
+        self.__queues: Dict[int, deque] = {}
+        self.__size = 0
+        self.__mergers: Dict[str, Callable] = {}
+        self.__pending: Dict[str, list] = {}
+        self.__running = set()
+
+    def __len__(self):
+        return self.__size
 
     def register(self, event, handler):
         self.handlers[event].append(handler)
@@ -12,11 +52,100 @@ class EventHandler:
     def unregister(self, event, handler):
         self.handlers[event].remove(handler)
 
+    def set_priority(self, event, priority: int):
+        self.priorities[event] = priority
+
+    def coalesce(self, event, merge: Optional[Callable[[dict, dict], dict]] = None):
+        """Merge repeated `event`s while one is pending.
+
+        `merge(old_kwargs, new_kwargs)` returns the merged keyword arguments;
+        by default the newest ones win. Positional arguments are always the
+        newest.
+        """
+        self.__mergers[event] = merge or (lambda old, new: new)
+
     def fire(self, event, *args, **kwargs):
-        self.events.append((event, args, kwargs))
+        self.fired[event] += 1
+        pending = self.__pending.get(event)
+        if pending is not None:
+            pending[1] = args
+            pending[2] = self.__mergers[event](pending[2], kwargs)
+            self.stats["coalesced"] += 1
+            return
+        if self.__size >= self.maxlen:
+            if self.overflow == DROP_NEWEST:
+                self.stats["dropped"] += 1
+                return
+            self.__drop_oldest()
+        entry = [event, args, kwargs]
+        priority = self.priorities.get(event, 0)
+        queue = self.__queues.get(priority)
+        if queue is None:
+            queue = self.__queues[priority] = deque()
+            self.__queues = dict(sorted(self.__queues.items(), reverse=True))
+        queue.append(entry)
+        if event in self.__mergers:
+            self.__pending[event] = entry
+        self.__size += 1
+        self.stats["queued"] += 1
+
+    def __drop_oldest(self):
+        # 优先丢弃优先级最低的队列中最早的事件
+        for queue in reversed(self.__queues.values()):
+            if queue:
+                self.__forget(queue.popleft())
+                self.stats["dropped"] += 1
+                return
+
+    def __forget(self, entry):
+        self.__size -= 1
+        if self.__pending.get(entry[0]) is entry:
+            del self.__pending[entry[0]]
+
+    async def poll(self, budget: Optional[float] = None):
+        """Dispatch every pending event.
+
+        Handlers run concurrently. With a budget (seconds, defaulting to
+        `self.budget`) this returns once it is used up even if some handlers
+        are still running; without one it waits for all of them.
+
+        The first handler that failed within the budget is re-raised once all
+        of them are collected; the other failures, and those of handlers that
+        finish later, are logged.
+        """
+        tasks = []
+        for queue in self.__queues.values():
+            while queue:
+                entry = queue.popleft()
+                self.__forget(entry)
+                event, args, kwargs = entry
+                for handler in self.handlers[event]:
+                    result = handler(*args, **kwargs)
+                    if inspect.isawaitable(result):
+                        tasks.append(asyncio.ensure_future(result))
+                self.stats["dispatched"] += 1
+        if not tasks:
+            return
+        budget = self.budget if budget is None else budget
+        done, running = await asyncio.wait(tasks, timeout=budget)
+        for task in running:
+            self.__running.add(task)
+            task.add_done_callback(self.__finished)
+        failed = None
+        # 按派发顺序取，重新抛出的总是最先派发的那个
+        for task in (task for task in tasks if task in done):
+            error = None if task.cancelled() else task.exception()
+            if error is None:
+                continue
+            if failed is None:
+                failed = error
+            else:
+                logger.error("Event handler failed", exc_info=error)
+        if failed is not None:
+            raise failed
 
-    async def poll(self):
-        while self.events:
-            event, args, kwargs = self.events.popleft()
-            for handler in self.handlers[event]:
-                await handler(*args, **kwargs)
+    def __finished(self, task: asyncio.Task):
+        self.__running.discard(task)
+        # 超出预算的处理函数没有人等它，异常在这里取走并记录
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Event handler failed after its budget", exc_info=task.exception())
@@ -1,2 +1,2 @@
-class CapacityExceed(Exception):
+class CapacityExceed(ValueError):
     pass
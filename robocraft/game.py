@@ -1,16 +1,28 @@
 import asyncio
 from collections import defaultdict
-import copy
 import contextvars
 from functools import wraps
 import inspect
+import itertools
+import logging
+import time
 from numbers import Number
-from typing import List, Tuple, Set
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Set
 from uuid import UUID
 
+import numpy as np
+
+from .clock import Clock, RealtimeClock, VirtualClock
 from .config import CONFIG
-from .entities import Entity, EntityFactory
+from .entities import Entity, EntityFactory, EntityStore
 from .events import EventHandler
+from .loadout import loadout
+from .metrics import Metrics
+from .navigation import DistanceField, Navigator, _absolute
+from .observation import TYPE, Observer
+from .recording import Recorder
+from .spectate import SpectatorFeed
+from .visibility import Visibility
 from . import env
 from .robot import Robot
 from .utils.vector import Vector
@@ -18,184 +30,415 @@ from .utils.property import *
 from . import exceptions
 
 
+logger = logging.getLogger(__name__)
+
+
+STATUS_FIELDS = ("type", "uuid", "enhancements", "timeCosts", "properties", "location", "direction", "alive")
+PLAN_ACTIONS = ("moveForward", "moveBackward", "moveUpward", "moveDownward",
+                "rotateLeft", "rotateRight", "attack", "defend", "halt")
+BLOCKED = "blocked"
+
+
+class PlanResult(NamedTuple):
+    """Outcome of `Game.execute`."""
+    completed: int
+    # 提前结束的原因：abort中的事件名或"blocked"，完整执行时为None
+    aborted: Optional[str]
+    results: list
+
+
+class Changes:
+    """Rows changed since the last `pop`, collected for one consumer; see `Game.track_changes`."""
+
+    def __init__(self):
+        self.__rows: Set[int] = set()
+
+    def add(self, row: int):
+        self.__rows.add(row)
+
+    def pop(self) -> Set[int]:
+        rows, self.__rows = self.__rows, set()
+        return rows
+
+
 def delay(fn):
     @wraps(fn)
     async def wrapped(self, player, *args, **kwags):
-        fn_name = fn.__qualname__.split(".")[-1]
-        delay = getattr(self.getTimeCosts(player), fn_name, 0)
+        started, start = time.perf_counter(), self.clock.now
+        delay = self.store.ticks[player.id].get(fn_name, 0)
         if delay:
-            delay = max(int(delay), 1)
-            await asyncio.sleep(delay * env.TICK.get())
-        if inspect.iscoroutinefunction(fn):
-            return await fn(self, player, *args, **kwags)
-        else:
-            return fn(self, player, *args, **kwags)
+            await self.clock.sleep(delay)
+        elapsed = self.clock.now - start
+        try:
+            if is_coroutine:
+                return await fn(self, player, *args, **kwags)
+            else:
+                return fn(self, player, *args, **kwags)
+        finally:
+            self.metrics.api(player.uuid, fn_name, delay, elapsed, time.perf_counter() - started)
+    fn_name = fn.__qualname__.split(".")[-1]
+    is_coroutine = inspect.iscoroutinefunction(fn)
     return wrapped
 
 
+def _rotate(points: np.ndarray, direction: np.ndarray) -> np.ndarray:
+    """Vectorized `Vector.__mul__`: express every row in the frame facing `direction`."""
+    dx, _, dz = direction.tolist()
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    return np.stack([x * dx + z * dz, y, -x * dz + z * dx], axis=1)
+
+
 class Game:
-    def __init__(self):
+    def __init__(self, headless: bool = False, recorder: Optional[Recorder] = None,
+                 room: Optional[dict] = None, timeout: Optional[float] = None,
+                 metrics: Optional[Metrics] = None, spectators: Optional[SpectatorFeed] = None):
+        """
+        :param headless: run on a virtual clock instead of wall time, so a
+            match finishes as fast as the CPU allows
+        :param recorder: if given, every API call and state change of the
+            match is written to it
+        :param room: overrides of `init.room` in the config, e.g.
+            `{"length": 1000, "width": 1000, "height": 10}`
+        :param timeout: match length in seconds instead of `init.game.timeout`
+        :param metrics: where API latencies and tick lateness are collected;
+            dumped when the match ends
+        :param spectators: if given, a keyframe and then per-tick deltas of
+            the match are streamed to whoever connects to it
+        """
         self.events = EventHandler()
-        env.TICK.set(1 / CONFIG['init']['game']['ticksPerSec'])
+        self.recorder = recorder
+        self.spectators = spectators
+        # 观战和渲染需要知道哪些行变了，每个消费者各有一份，互不影响
+        self.__changes: List[Changes] = []
+        self.metrics = metrics if metrics is not None else Metrics()
+        tick = 1 / CONFIG['init']['game']['ticksPerSec']
+        self.clock: Clock = VirtualClock(tick) if headless else RealtimeClock(tick)
+        if timeout is None:
+            timeout = CONFIG['init']['game']['timeout']
+        self.__timeout: int = int(timeout * CONFIG['init']['game']['ticksPerSec'])
         self.__ready: bool = False
+        # 比赛开始时set，机器人等它而不是轮询is_ready
+        self.__started = asyncio.Event()
         self.__alive_count = 0
         self.__entities = EntityFactory()
-        self.__entity_status: Dict[Entity, Dict] = {}
+        # 所有实体的状态按列存放，实体的id就是行号
+        self.__store = EntityStore()
+        self.__occupancy: Dict[Vector, Entity] = {}
+        self.__visibility = Visibility(self.__store, CONFIG['init']['game']['fogDistance'],
+                                       CONFIG['init']['game']['surroundingDistance'])
+        # 任何状态变化都会让版本号加一，版本号不变时感知结果直接复用
+        self.__version = 0
+        self.__sensed_cache: Dict[tuple, Tuple[int, List[dict]]] = {}
+        # 每个tick末尾调用一次
+        self.tick_hooks: List[Callable[[], None]] = []
         self.__players: Dict[UUID, Entity.Player] = {}
-        self.__height: int = CONFIG['init']['room']['height']
-        self.__width: int = CONFIG['init']['room']['width']
-        self.__length: int = CONFIG['init']['room']['length']
+        self.__scores: Dict[int, Dict[str, float]] = defaultdict(lambda: {"kills": 0, "damage": 0.0, "damageTaken": 0.0})
+        room = dict(CONFIG['init']['room'], **(room or {}))
+        self.__height: int = room['height']
+        self.__width: int = room['width']
+        self.__length: int = room['length']
         self.__spwan_status = [
-            (Vector(-(self.__length // 2), 0, 0), Vector(1, 0, 0)),
-            (Vector(self.__length // 2, 0, 0), Vector(-1, 0, 0)),
-            (Vector(0, 0, -(self.__width // 2)), Vector(0, 0, 1)),
-            (Vector(0, 0, self.__width // 2), Vector(0, 0, -1)),
+            (Vector(-(self.__length // 2), 0, 0), Vector.FORWARD),
+            (Vector(self.__length // 2, 0, 0), Vector.BACKWARD),
+            (Vector(0, 0, -(self.__width // 2)), Vector.RIGHT),
+            (Vector(0, 0, self.__width // 2), Vector.LEFT),
         ]
+        self.__free_cells = None
+        self.__observer: Optional[Observer] = None
+        self.__navigator: Optional[Navigator] = None
+        self.__construct_walls()
 
     def run(self):
+        """Play the match on a new event loop of its own."""
+        loop = self.clock.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.play())
+        finally:
+            # 机器人自己开的任务也一并取消
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    async def play(self):
+        """Play the match on the running event loop.
+
+        Every match runs in its own task, so `env.game` and `env.TICK` are
+        set in that task's context only and the tasks of its robots inherit
+        them; many matches can be awaited side by side on one loop (see
+        `robocraft.host`). A headless match needs a `VirtualEventLoop`.
+        """
+        loop = asyncio.get_running_loop()
         env.game.set(self)
+        env.TICK.set(self.clock.tick)
         self.events.register("kills", self.evnt_kills)
-        for player in self.__players.values():
-            context = contextvars.copy_context()
-            context.run(player.main)
-        self.__ready = True
-        asyncio.get_event_loop().run_until_complete(self.loop())
+        self.clock.start(loop)
+        tasks = []
+        try:
+            if self.recorder is not None:
+                self.recorder.start(self)
+            if self.spectators is not None:
+                await self.spectators.start(self)
+            for player in self.__players.values():
+                task = contextvars.copy_context().run(player.main)
+                if task is not None:
+                    tasks.append(task)
+            self.__ready = True
+            self.__started.set()
+            await self.loop()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.spectators is not None:
+                await self.spectators.close()
+            self.clock.stop(loop)
+            if self.recorder is not None:
+                self.recorder.close()
+            self.metrics.dump()
 
     async def loop(self):
-        while self.__alive_count > 1:
-            # for entity in self.__entity_status.keys():
-            #     print(entity, self._get_status(entity, 'location'))
-            await asyncio.sleep(env.TICK.get())
+        """End-of-tick work: kills, recording and tick hooks.
+
+        It only wakes at the ticks some action is due (or the next one while
+        events are pending), after every action of that tick has run; the
+        ticks in between change nothing and are skipped.
+        """
+        while self.__alive_count > 1 and self.clock.now < self.__timeout:
+            limit = self.clock.now + 1 if len(self.events) else self.__timeout
+            due = await self.clock.idle(limit)
+            self.metrics.tick(self.clock.now - due, self.clock.lateness(due))
             await self.events.poll()
+            if self.recorder is not None:
+                self.recorder.tick(self.clock.now, self.__store)
+            for hook in self.tick_hooks:
+                hook()
 
     def is_ready(self) -> bool:
         return self.__ready
 
+    async def started(self):
+        """Wait until the match starts."""
+        await self.__started.wait()
+
     def register(self, player: Robot):
-        entity = self.entities.get_or_create(player.uuid, Entity.Player, player)
-        self._check_capacity(player.components)
-        enhancement = self._components_enhancement(player.components)
-        origin_property = RobotProperty(**CONFIG['init']['player']['properties'])
-        enhanced_property = origin_property * (enhancement + 1)
+        compiled = loadout(player.components)
         location, direction = self._get_next_spawn_status()
-        self.__entity_status[entity] = {
-            "type": Entity.Player,
-            "uuid": player.uuid,
-            "enhancements": enhancement,
-            "timeCosts": SpeedProperty(**CONFIG['ticks']) / (enhanced_property.speed + 1),
-            "properties": enhanced_property,
-            "location": location,
-            "direction": direction,
-            "alive": True,
-        }
+        # 检查都通过之后才分配id，保证id和存储的行号一致
+        entity = self.entities.get_or_create(player.uuid, Entity.Player, player)
+        self.__store.add(
+            entity, location, direction,
+            hp=compiled.properties.hp,
+            properties=compiled.properties,
+            enhancements=compiled.enhancement,
+            timeCosts=compiled.timeCosts,
+            ticks=compiled.ticks,
+        )
+        self.__occupancy[location] = entity
         self.__players[player.uuid] = player
+        self.__visibility.add_player(entity.id)
+        self.__version += 1
+        for changes in self.__changes:
+            changes.add(entity.id)
+        if self.recorder is not None and self.recorder.started:
+            self.recorder.spawn(self.clock.now, entity.id, Entity.Player, location, direction, compiled.properties.hp)
         self.__alive_count += 1
 
     def __create_wall(self, x: int, y: int, z: int):
         wall = self.entities.create(Entity.Wall)
-        self.__entity_status[wall] = {
-            "init": {
-                "type": Entity.Wall,
-                "uuid": wall.uuid,
-            },
-            "status": {
-                "location": Vector(x, y, z),
-            }
-        }
+        location = Vector(x, y, z)
+        self.__store.add(wall, location)
+        self.__occupancy[location] = wall
+        if self.__navigator is not None:
+            self.__navigator.block(location)
 
     def __construct_walls(self):
-        for x in range(-self.length // 2, self.length // 2 + 1):
-            for y in range(-self.height // 2, self.height // 2 + 1):
-                self.__create_wall(x, y, -self.width // 2)
-                self.__create_wall(x, y, self.width // 2)
-
-        for x in range(-self.length // 2, self.length // 2 + 1):
-            for z in range(-self.width // 2, self.width // 2 + 1):
-                self.__create_wall(x, -self.height // 2, z)
-                self.__create_wall(x, self.height // 2, z)
-
-        for z in range(-self.width // 2, self.width // 2 + 1):
-            for y in range(-self.height // 2, self.height // 2 + 1):
-                self.__create_wall(-self.length // 2, y, z)
-                self.__create_wall(self.length // 2, y, z)
-
-    def _check_capacity(self, components: List[str]):
-        capacities = CapacityProperty(**CONFIG['init']['player']['properties']['capacity'])
-        for component in components:
-            if component not in CONFIG['components']:
-                raise ValueError(f"Invalid component {component}")
-            cost = CapacityProperty(**CONFIG['components'][component]['costs'])
-            capacities = capacities - cost
-        if capacities.weight < 0 or capacities.space < 0:
-            raise ValueError("Capacity exceeded")
-
-    def _components_enhancement(self, components: List[str]) -> dict:
-        enhancement = ComponentProperty()
-        for component in components:
-            properties = ComponentProperty(**CONFIG['components'][component]['properties'])
-            enhancement = enhancement + properties
-        return enhancement
+        # 房间内部是 |x| <= length // 2 等，墙贴着内部围一圈，棱和角只建一次
+        hx, hy, hz = self.length // 2 + 1, self.height // 2 + 1, self.width // 2 + 1
+        for y in range(-hy, hy + 1):
+            for z in range(-hz, hz + 1):
+                self.__create_wall(-hx, y, z)
+                self.__create_wall(hx, y, z)
+
+        for x in range(-hx + 1, hx):
+            for z in range(-hz, hz + 1):
+                self.__create_wall(x, -hy, z)
+                self.__create_wall(x, hy, z)
+
+        for x in range(-hx + 1, hx):
+            for y in range(-hy + 1, hy):
+                self.__create_wall(x, y, -hz)
+                self.__create_wall(x, y, hz)
 
     def _get_next_spawn_status(self) -> Tuple[Vector, Vector]:
-        return self.__spwan_status.pop()
+        # 四个固定出生点用完之后，按顺序找房间里的空格子
+        while self.__spwan_status:
+            location, direction = self.__spwan_status.pop()
+            if not self._has_entity(location):
+                return location, direction
+        if self.__free_cells is None:
+            hx, hy, hz = self.__length // 2, self.__height // 2, self.__width // 2
+            self.__free_cells = itertools.product(range(-hx, hx + 1), range(-hy, hy + 1), range(-hz, hz + 1))
+        for cell in self.__free_cells:
+            location = Vector(*cell)
+            if not self._has_entity(location):
+                return location, Vector.FORWARD
+        raise ValueError("No room left to spawn")
 
     def _has_entity(self, loc: Vector):
-        if not (-self.__length // 2 <= loc.x <= self.__length and
-                -self.__width // 2 <= loc.z <= self.__width and
-                -self.__height // 2 <= loc.y <= self.__height):
-            return Entity.Wall
-        for player in self.__entity_status.keys():
-            if self._get_status(player, "location") == loc:
-                return player
-        return None
+        x, y, z = loc
+        if not (abs(x) <= self.__length // 2 and
+                abs(z) <= self.__width // 2 and
+                abs(y) <= self.__height // 2):
+            return self.__occupancy.get(loc, Entity.Wall)
+        return self.__occupancy.get(loc)
 
     def _set_status(self, player: Entity, attr, value):
-        if attr in ("location", "direction"):
-            self.__entity_status[player][attr] = value
+        store, i = self.__store, player.id
+        if attr == "location":
+            old_location = Vector(*store.location[i].tolist())
+            if self.__occupancy.get(old_location) is player:
+                del self.__occupancy[old_location]
+            self.__occupancy[value] = player
+            store.location[i] = value
+            self.__visibility.moved(i)
+        elif attr == "direction":
+            store.direction[i] = value
+            self.__visibility.turned(i)
+        elif attr == "hp":
+            store.hp[i] = value
+        elif attr == "alive":
+            store.alive[i] = value
         else:
-            setattr(self.__entity_status[player]["properties"], attr, value)
-
-    def _get_status(self, player: Entity, attr=None):
-        if attr:
-            if attr in ("location", "direction"):
-                return self.__entity_status[player][attr]
-            else:
-                return getattr(self.__entity_status[player]['properties'], attr)
+            # 写时复制：已经交给机器人的只读视图继续指向旧对象
+            properties = store.properties[i].copy()
+            setattr(properties, attr, value)
+            store.properties[i] = properties
+        self.__version += 1
+        for changes in self.__changes:
+            changes.add(i)
+        if self.recorder is not None:
+            self.recorder.status(self.clock.now, i, attr, value)
+
+    def _get_status(self, player: Entity, attr=None, fields=None):
+        """One attribute of `player`, or a status dict.
+
+        The dict is built fresh on every call but shares its values with the
+        game: vectors and uuids are immutable and properties are returned as
+        read-only `PropertyView`s, so nothing is deep-copied. `fields`
+        restricts the dict to the given keys (default `STATUS_FIELDS`).
+        """
+        store, i = self.__store, player.id
+        if attr == "location":
+            return Vector(*store.location[i].tolist())
+        elif attr == "direction":
+            return Vector(*store.direction[i].tolist())
+        elif attr == "hp":
+            return float(store.hp[i])
+        elif attr == "alive":
+            return bool(store.alive[i])
+        elif attr == "type":
+            return store.type_of(i)
+        elif attr == "uuid":
+            return player.uuid
+        elif attr == "properties":
+            return self.getProperties(player)
+        elif attr == "enhancements":
+            return self.getEnhancements(player)
+        elif attr == "timeCosts":
+            return self.getTimeCosts(player)
+        elif attr:
+            return getattr(store.properties[i], attr)
         else:
-            return copy.deepcopy(self.__entity_status[player])
+            return {field: self._get_status(player, field) for field in fields or STATUS_FIELDS}
 
-    def _get_relative_status(self, origin: Entity, other: Entity) -> dict:
-        origin_location = self._get_status(origin, "location")
+    def _get_relative_status(self, origin: Entity, other: Entity, fields=None) -> dict:
+        status = self._get_status(other, fields=fields)
         origin_direction = self._get_status(origin, "direction")
-        other_location = self._get_status(other, "location")
-        other_direction = self._get_status(other, "direction")
-        relative_location = (other_location - origin_location) * origin_direction
-        relative_direction = other_direction * origin_direction
-        status = self._get_status(other)
-        status['location'] = relative_location
-        status['direction'] = relative_direction
+        if 'location' in status:
+            status['location'] = (status['location'] - self._get_status(origin, "location")) * origin_direction
+        if 'direction' in status:
+            status['direction'] = status['direction'] * origin_direction
         return status
 
     def _calc_harm(self, source: Entity.Player, target: Entity.Player) -> float:
-        attacks = self.getProperties(source).attack
-        defenses = self.getProperties(target).defense
-        if self._get_relative_status(source, target)['direction'] == Vector(1, 0, 0):
+        attacks = self.__store.properties[source.id].attack
+        defenses = self.__store.properties[target.id].defense
+        if self._get_status(target, "direction") * self._get_status(source, "direction") == Vector.FORWARD:
             attack, defense = attacks.back, defenses.back
         else:
             attack, defense = attacks.normal, defenses.normal
         return attack / defense
 
-    def tolist(self):
-        background = [["."] * self.__length for _ in range(self._width)]
-        for entity in self.__entity_status.keys():
-            x, y, z = self._get_status(entity, "location")
-            background[x][z] = "x"
-        return background
+    def observe(self) -> np.ndarray:
+        """The board as a `(CHANNELS, X, Y, Z)` tensor, see `robocraft.observation`.
+
+        The array is a buffer refilled in place by the next call.
+        """
+        return self.__get_observer().observe()
+
+    def observe_around(self, player: Entity.Player, radius: int, vertical: Optional[int] = None) -> np.ndarray:
+        """The cells around `player` in its own frame, see `Observer.observe_around`."""
+        return self.__get_observer().observe_around(player, radius, vertical)
+
+    def __get_observer(self) -> Observer:
+        if self.__observer is None:
+            self.__observer = Observer(self)
+        return self.__observer
+
+    def tolist(self, y: int = 0) -> List[List[str]]:
+        """The horizontal slice at height `y`, walls included, as rows of "x" and "."."""
+        types = self.observe()[TYPE, :, y + self.__observer.offset[1], :]
+        return [["x" if t else "." for t in row] for row in types.tolist()]
+
+    def scoreboard(self) -> Dict[UUID, Dict]:
+        """Kills, damage dealt/taken and survival of every registered robot."""
+        board = {}
+        for uuid in self.__players:
+            entity = self.entities.get_or_create(uuid)
+            board[uuid] = dict(self.__scores[entity.id], alive=bool(self.__store.alive[entity.id]))
+        return board
 
     @property
     def entities(self):
         return self.__entities
 
+    @property
+    def store(self) -> EntityStore:
+        return self.__store
+
+    def track_changes(self) -> Changes:
+        """Start collecting the rows that change, for a new consumer.
+
+        Every consumer gets its own `Changes`, so popping one doesn't empty
+        the others. Pass it to `untrack_changes` when done.
+        """
+        changes = Changes()
+        self.__changes.append(changes)
+        return changes
+
+    def untrack_changes(self, changes: Changes):
+        self.__changes.remove(changes)
+
+    @property
+    def version(self) -> int:
+        """Bumped on every change of the world."""
+        return self.__version
+
+    @property
+    def visibility(self) -> Visibility:
+        return self.__visibility
+
+    @property
+    def navigator(self) -> Navigator:
+        """Distance fields over the walls, built on first use."""
+        if self.__navigator is None:
+            self.__navigator = Navigator.of(self)
+        return self.__navigator
+
     @property
     def length(self):
         return self.__length
@@ -211,14 +454,22 @@ class Game:
     # ====================== Events ===================== #
 
     async def evnt_kills(self, source: Entity.Player, target: Entity.Player):
-        self.__entity_status[target]['alive'] = False
+        if not self.__store.alive[target.id]:
+            return
+        self._set_status(target, "alive", False)
+        if self.recorder is not None:
+            self.recorder.kill(self.clock.now, source.id, target.id)
+        self.__scores[source.id]["kills"] += 1
+        location = self._get_status(target, "location")
+        if self.__occupancy.get(location) is target:
+            del self.__occupancy[location]
         self.__alive_count -= 1
 
     # ======================= API ======================= #
 
     @delay
-    def getStatus(self, player: Entity.Player):
-        return self._get_relative_status(player, player)
+    def getStatus(self, player: Entity.Player, fields=None):
+        return self._get_relative_status(player, player, fields)
 
     @delay
     def moveForward(self, player: Entity.Player):
@@ -230,19 +481,19 @@ class Game:
 
     @delay
     def moveUpward(self, player: Entity.Player):
-        return self.__move(player, Vector(0, 1, 0))
+        return self.__move(player, Vector.UP)
 
     @delay
     def moveDownward(self, player: Entity.Player):
-        return self.__move(player, Vector(0, -1, 0))
+        return self.__move(player, Vector.DOWN)
 
     @delay
     def rotateLeft(self, player: Entity.Player):
-        return self.__rotate(player, Vector(1, 0, 0))
+        return self.__rotate(player, Vector.RIGHT)
 
     @delay
     def rotateRight(self, player: Entity.Player):
-        return self.__rotate(player, Vector(-1, 0, 0))
+        return self.__rotate(player, Vector.LEFT)
 
     @delay
     def attack(self, player: Entity.Player):
@@ -252,9 +503,12 @@ class Game:
             harm = self._calc_harm(player, entity)
             health = self._get_status(entity, "hp") - harm
             self._set_status(entity, "hp", health)
+            self.__scores[player.id]["damage"] += harm
+            self.__scores[entity.id]["damageTaken"] += harm
             entity.robot.events.fire("attacked", source=self._get_relative_status(entity, player), harm=harm)
             if health <= 0:
                 self.events.fire("kills", player, entity)
+                self.clock.touch(self.clock.now + 1)
                 entity.robot.events.fire("dead")
                 player.robot.events.fire("kills")
 
@@ -264,35 +518,91 @@ class Game:
 
     @delay
     async def halt(self, player: Entity.Player, ticks: int):
-        await asyncio.sleep(ticks * env.TICK.get())
+        await self.clock.sleep(ticks)
+
+    async def execute(self, player: Entity.Player, plan: Sequence, abort: Iterable[str] = ()) -> PlanResult:
+        """Run `plan` as one call; see `Robot.execute`.
+
+        The actions and their arguments are validated up front, so an invalid
+        plan raises `ValueError` before anything runs. They are then scheduled
+        here directly, each with its usual tick cost, instead of each going
+        through the robot-side wrapper and the `delay` decorator.
+        """
+        steps = []
+        for action in plan:
+            name, *args = (action,) if isinstance(action, str) else action
+            if name not in PLAN_ACTIONS:
+                raise ValueError(f"Invalid action {name}")
+            fn = getattr(Game, name).__wrapped__
+            try:
+                inspect.signature(fn).bind(self, player, *args)
+            except TypeError as e:
+                raise ValueError(f"Invalid arguments for {name}: {e}") from None
+            steps.append((fn, name, args, inspect.iscoroutinefunction(fn)))
+        abort = set(abort)
+        events = player.robot.events
+        seen = {event: events.fired[event] for event in abort if event != BLOCKED}
+        ticks = self.__store.ticks[player.id]
+        results = []
+        for fn, name, args, is_coroutine in steps:
+            started, start = time.perf_counter(), self.clock.now
+            delay = ticks.get(name, 0)
+            if delay:
+                await self.clock.sleep(delay)
+            elapsed = self.clock.now - start
+            for event, count in seen.items():
+                if events.fired[event] != count:
+                    return PlanResult(len(results), event, results)
+            if self.recorder is not None:
+                self.recorder.call(self.clock.now, player.id, name, tuple(args))
+            result = await fn(self, player, *args) if is_coroutine else fn(self, player, *args)
+            self.metrics.api(player.uuid, name, delay, elapsed, time.perf_counter() - started)
+            results.append(result)
+            if result is False and BLOCKED in abort:
+                return PlanResult(len(results), BLOCKED, results)
+        return PlanResult(len(results), None, results)
 
     @delay
-    def senseForward(self, player: Entity.Player):
-        entities = []
-        my_location = self._get_status(player, "location")
-        for entity in self.__entity_status.keys():
-            if entity is player:
-                continue
-            target_location = self._get_status(entity, "location")
-            relative_location = target_location - my_location
-            if relative_location @ my_direction <= CONFIG['init']['game']['fogDistance']:
-                status = self._get_relative_status(player, entity)
-                entities.append(status)
-        return entities
+    def senseForward(self, player: Entity.Player, fields=None):
+        return self.__sense(player, self.__visibility.forward, fields)
 
     @delay
-    def senseSurroundings(self, player: Entity.Player):
-        distance: float = CONFIG['init']['game']['surroundingDistance']
+    def senseSurroundings(self, player: Entity.Player, fields=None):
+        return self.__sense(player, self.__visibility.around, fields)
+
+    def __sense(self, player: Entity.Player, visible, fields=None) -> List[dict]:
+        key = (player.id, visible.__name__, fields if fields is None else tuple(fields))
+        cached = self.__sensed_cache.get(key)
+        if cached is None or cached[0] != self.__version:
+            cached = self.__sensed_cache[key] = (self.__version, self.__sensed(player, visible(player.id), fields))
+        return [dict(status) for status in cached[1]]
+
+    def __sensed(self, player: Entity.Player, rows: np.ndarray, fields=None) -> List[dict]:
+        """Relative statuses of the entities in `rows`.
+
+        The frame rotation is done for all rows at once.
+        """
+        store = self.__store
+        origin_direction = store.direction[player.id]
+        relative = store.location[rows] - store.location[player.id]
+        locations = _rotate(relative, origin_direction).tolist()
+        directions = _rotate(store.direction[rows], origin_direction).tolist()
         entities = []
-        my_location = self._get_status(player, "location")
-        for entity in self.__entity_status.keys():
-            if entity is player:
-                continue
-            target_location = self._get_status(entity, "location")
-            relative_location = target_location - my_location
-            if abs(relative_location) <= CONFIG['init']['game']['surroundingDistance']:
-                status = self._get_relative_status(player, entity)
-                entities.append(status)
+        wall_status = None
+        for row, location, direction in zip(rows.tolist(), locations, directions):
+            entity = store.entities[row]
+            if entity.__class__ is Entity.Wall:
+                # 墙除了位置和朝向之外状态都一样，只构造一次
+                if wall_status is None:
+                    wall_status = self._get_status(entity, fields=fields)
+                status = dict(wall_status)
+            else:
+                status = self._get_status(entity, fields=fields)
+            if 'location' in status:
+                status['location'] = Vector(*location)
+            if 'direction' in status:
+                status['direction'] = Vector(*direction)
+            entities.append(status)
         return entities
 
     def __move(self, player: Entity.Player, direction: Vector):
@@ -300,21 +610,44 @@ class Game:
         new_location: Vector = location + direction
         if not self._has_entity(new_location):
             self._set_status(player, 'location', new_location)
-        else:
-            print("blocked")
+            return True
+        logger.debug("%s blocked at %s", player, new_location)
+        return False
 
     def __rotate(self, player: Entity.Player, offset: Vector):
+        # d * offset 是d在以offset为前方的坐标系中的方向，所以乘RIGHT是左转，乘LEFT是右转
         direction: Vector = self._get_status(player, 'direction')
         self._set_status(player, "direction", direction * offset)
 
+    @delay
+    def getPathTo(self, player: Entity.Player, target: Vector) -> Optional[List[Vector]]:
+        location, direction = self._get_status(player, "location"), self._get_status(player, "direction")
+        path = self.navigator.path(location, _absolute(location, direction, target))
+        if path is None:
+            return None
+        return [(cell - location) * direction for cell in path]
+
+    @delay
+    def getDistanceField(self, player: Entity.Player, target: Vector) -> DistanceField:
+        location, direction = self._get_status(player, "location"), self._get_status(player, "direction")
+        navigator = self.navigator
+        return DistanceField(navigator.field(_absolute(location, direction, target)), navigator.offset,
+                             location, direction)
+
     def getProperties(self, player: Entity.Player):
-        return copy.deepcopy(self.__entity_status[player]['properties'])
+        properties = self.__store.properties[player.id]
+        if properties is not None:
+            return PropertyView(properties, hp=float(self.__store.hp[player.id]))
 
     def getEnhancements(self, player: Entity.Player):
-        return copy.deepcopy(self.__entity_status[player]['enhancements'])
+        enhancements = self.__store.enhancements[player.id]
+        if enhancements is not None:
+            return PropertyView(enhancements)
 
     def getTimeCosts(self, player: Entity.Player):
-        return copy.deepcopy(self.__entity_status[player]['timeCosts'])
+        time_costs = self.__store.timeCosts[player.id]
+        if time_costs is not None:
+            return PropertyView(time_costs)
 
     def getSize(self, player: Entity.Player):
-        return (self.__length, self.__height, __self.__width)
+        return (self.__length, self.__height, self.__width)
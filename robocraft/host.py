@@ -0,0 +1,146 @@
+"""
+Many matches at once on a single event loop.
+
+..  code-block::python
+
+    host = MatchHost()
+    for _ in range(200):
+        game = Game(headless=True)
+        game.register(MyBot())
+        game.register(OtherBot())
+        host.start(game)
+    for match in host.as_completed():
+        print(match.id, match.ticks, match.result)
+    host.close()
+
+Each match is one task running `Game.play`, with its own clock, its own
+robots and its own `env` context. Headless matches share the host's
+`VirtualEventLoop`: whenever no match has anything left to run, every
+clock jumps to its own next due tick. Loop timers set inside a match, such
+as a robot's plain `asyncio.sleep`, are kept by that match's clock, so a
+hosted match plays out exactly as it would alone.
+"""
+import asyncio
+import itertools
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+from uuid import UUID
+
+from .clock import VirtualClock
+from .config import CONFIG
+from .game import Game
+
+
+class MatchStatus(NamedTuple):
+    id: int
+    ticks: int
+    alive: int
+    done: bool
+
+
+class Match:
+    """A match started by `MatchHost.start`."""
+
+    def __init__(self, id: int, game: Game, task: asyncio.Task):
+        self.id = id
+        self.game = game
+        self.task = task
+
+    @property
+    def done(self) -> bool:
+        return self.task.done()
+
+    @property
+    def ticks(self) -> int:
+        return self.game.clock.now
+
+    @property
+    def result(self) -> Dict[UUID, Dict]:
+        """The scoreboard; raises if the match failed or is still running."""
+        self.task.result()
+        return self.game.scoreboard()
+
+    def status(self) -> MatchStatus:
+        alive = sum(score["alive"] for score in self.game.scoreboard().values())
+        return MatchStatus(self.id, self.ticks, alive, self.done)
+
+    def cancel(self):
+        self.task.cancel()
+
+    def __await__(self):
+        return self.task.__await__()
+
+    def __repr__(self):
+        return f"Match(id={self.id}, ticks={self.ticks}, done={self.done})"
+
+
+class MatchHost:
+    """Starts, monitors and collects matches that share one event loop.
+
+    :param headless: whether the matches run on virtual clocks; a host runs
+        either only headless or only real-time matches
+    """
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        if headless:
+            self.loop = VirtualClock(1 / CONFIG['init']['game']['ticksPerSec']).new_event_loop()
+        else:
+            self.loop = asyncio.new_event_loop()
+        self.matches: Dict[int, Match] = {}
+        self.__ids = itertools.count()
+
+    def start(self, game: Game) -> Match:
+        """Schedule `game`; it begins as soon as the host's loop runs."""
+        if isinstance(game.clock, VirtualClock) != self.headless:
+            raise ValueError("Headless and real-time matches can't share a host")
+        match = Match(next(self.__ids), game, self.loop.create_task(game.play()))
+        self.matches[match.id] = match
+        return match
+
+    def status(self) -> List[MatchStatus]:
+        return [match.status() for match in self.matches.values()]
+
+    def running(self) -> List[Match]:
+        return [match for match in self.matches.values() if not match.done]
+
+    def wait(self, matches: Optional[Iterable[Match]] = None, first: bool = False) -> List[Match]:
+        """Run the loop until `matches` (default all) are over, or any of them with `first`.
+
+        Returns the matches that are over.
+        """
+        matches = list(self.matches.values() if matches is None else matches)
+        tasks = [match.task for match in matches if not match.done]
+        if tasks:
+            when = asyncio.FIRST_COMPLETED if first else asyncio.ALL_COMPLETED
+            self.loop.run_until_complete(asyncio.wait(tasks, return_when=when))
+        return [match for match in matches if match.done]
+
+    def as_completed(self, matches: Optional[Iterable[Match]] = None) -> Iterator[Match]:
+        """Yield `matches` (default all) as they finish, running the loop in between."""
+        remaining = list(self.matches.values() if matches is None else matches)
+        while remaining:
+            finished = self.wait(remaining, first=True)
+            for match in finished:
+                remaining.remove(match)
+                yield match
+
+    def collect(self, matches: Optional[Iterable[Match]] = None) -> Dict[int, Dict[UUID, Dict]]:
+        """Scoreboards of `matches` (default all), once they are over."""
+        return {match.id: match.result for match in self.wait(matches)}
+
+    def forget(self, match: Match):
+        """Drop a finished match so the host no longer tracks it."""
+        if not match.done:
+            raise ValueError("Match is still running")
+        del self.matches[match.id]
+
+    def close(self):
+        """Cancel whatever is still running and close the loop."""
+        for match in self.running():
+            match.cancel()
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.close()
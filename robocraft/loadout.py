@@ -0,0 +1,59 @@
+"""
+Robot loadouts compiled from the config tables.
+
+A loadout depends only on the multiset of components, so the result is
+cached by it; registering a robot whose loadout was seen before is a cache
+hit. The returned properties are shared between robots and must be treated
+as read-only (the game copies them before writing).
+"""
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, Iterable, Mapping, NamedTuple, Tuple
+
+from .config import BASE_PROPERTIES, BASE_TIME_COSTS, COMPONENTS
+from .exceptions import CapacityExceed
+from .utils.property import ComponentProperty, RobotProperty, SpeedProperty
+
+
+# API名和ticks配置中的名字不一致的，左右转共用rotate
+COST_NAMES = {"rotateLeft": "rotate", "rotateRight": "rotate"}
+
+
+class Loadout(NamedTuple):
+    enhancement: ComponentProperty
+    properties: RobotProperty
+    timeCosts: SpeedProperty
+    # API名 -> 调用前等待的整数ticks
+    ticks: Mapping[str, int]
+
+
+def loadout(components: Iterable[str]) -> Loadout:
+    """Check the capacity of `components` and compute the robot they build.
+
+    :raises ValueError: for an unknown component
+    :raises CapacityExceed: if the components weigh or take up too much
+    """
+    return _compile(frozenset(Counter(components).items()))
+
+
+@lru_cache(maxsize=1024)
+def _compile(components: FrozenSet[Tuple[str, int]]) -> Loadout:
+    capacity = BASE_PROPERTIES.capacity
+    enhancement = ComponentProperty()
+    for name, count in sorted(components):
+        component = COMPONENTS.get(name)
+        if component is None:
+            raise ValueError(f"Invalid component {name}")
+        for _ in range(count):
+            capacity = capacity - component.costs
+            enhancement = enhancement + component.properties
+    if capacity.weight < 0 or capacity.space < 0:
+        raise CapacityExceed("Capacity exceeded")
+    properties = BASE_PROPERTIES * (enhancement + 1)
+    time_costs = BASE_TIME_COSTS / (properties.speed + 1)
+    ticks = {name: max(int(getattr(time_costs, name)), 1) for name in time_costs.keys() if getattr(time_costs, name)}
+    for api, name in COST_NAMES.items():
+        if name in ticks:
+            ticks[api] = ticks[name]
+    return Loadout(enhancement, properties, time_costs, MappingProxyType(ticks))
@@ -0,0 +1,150 @@
+"""
+Always-on latency instrumentation.
+
+Every API call records, per robot and per API, the ticks it asked to wait
+(its time cost), the ticks that actually passed before it ran, and its wall
+time. Every `Game.loop` iteration records how late it woke after its tick
+deadline. Samples go into fixed-bucket histograms: recording one is a
+`bisect` and a few integer additions, cheap enough to leave on.
+
+..  code-block::python
+
+    game.metrics.summary()["api"][str(robot.uuid)]["moveForward"]["lag"]["p99"]
+"""
+from bisect import bisect_left
+import json
+import logging
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# 桶的上界按2的幂增长，最后一个桶收下所有更大的值
+TICK_BOUNDS: Tuple[float, ...] = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+SECOND_BOUNDS: Tuple[float, ...] = tuple(1e-6 * 2 ** i for i in range(24))
+
+
+class Histogram:
+    """Counts of samples in buckets `(-inf, b0], (b0, b1], ..., (bn, inf)`."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q`-quantile, capped at the maximum."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class APIStats:
+    """Samples of one API of one robot."""
+
+    __slots__ = ("calls", "requested", "elapsed", "lag", "wall")
+
+    def __init__(self):
+        self.calls = 0
+        self.requested = 0
+        self.elapsed = 0
+        self.lag = Histogram(TICK_BOUNDS)
+        self.wall = Histogram(SECOND_BOUNDS)
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "requestedTicks": self.requested,
+            "elapsedTicks": self.elapsed,
+            "lag": self.lag.summary(),
+            "wall": self.wall.summary(),
+        }
+
+
+class Metrics:
+    """Latency histograms of a match.
+
+    :param path: if given, `dump` writes the summary there as JSON
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.apis: Dict[Tuple[Hashable, str], APIStats] = {}
+        self.tick_lag = Histogram(TICK_BOUNDS)
+        self.tick_late = Histogram(SECOND_BOUNDS)
+
+    def api(self, robot: Hashable, name: str, requested: int, elapsed: int, wall: float):
+        """One call of `name` by `robot`: ticks asked for, ticks waited and seconds spent."""
+        key = (robot, name)
+        stats = self.apis.get(key)
+        if stats is None:
+            stats = self.apis[key] = APIStats()
+        stats.calls += 1
+        stats.requested += requested
+        stats.elapsed += elapsed
+        stats.lag.add(elapsed - requested)
+        stats.wall.add(wall)
+
+    def tick(self, lag: int, late: float):
+        """One `Game.loop` iteration woke `lag` ticks and `late` seconds after its deadline."""
+        self.tick_lag.add(lag)
+        self.tick_late.add(late)
+
+    def query(self, robot: Optional[Hashable] = None, name: Optional[str] = None) -> Dict[Tuple[Hashable, str], APIStats]:
+        return {
+            key: stats for key, stats in self.apis.items()
+            if (robot is None or key[0] == robot) and (name is None or key[1] == name)
+        }
+
+    def summary(self) -> dict:
+        apis: Dict[str, Dict[str, dict]] = {}
+        for (robot, name), stats in self.apis.items():
+            apis.setdefault(str(robot), {})[name] = stats.summary()
+        return {
+            "api": apis,
+            "loop": {"lag": self.tick_lag.summary(), "late": self.tick_late.summary()},
+        }
+
+    def dump(self):
+        summary = self.summary()
+        loop = summary["loop"]
+        if loop["late"]["count"]:
+            logger.info("%d ticks, p99 lateness %.6fs, max %.6fs",
+                        loop["late"]["count"], loop["late"]["p99"], loop["late"]["max"])
+        if self.path is not None:
+            with open(self.path, "w") as f:
+                json.dump(summary, f, indent=2)
+        return summary
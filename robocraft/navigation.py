@@ -0,0 +1,253 @@
+"""
+Distance fields and shortest paths over the static geometry of a room.
+
+A distance field holds, for every cell of the room, the number of moves to
+one target cell, or -1 where the target can't be reached. It is computed
+once per target by a breadth-first search over the six neighbours of each
+cell, kept in an LRU cache bounded by bytes, and repaired in place when a
+cell becomes blocked or free, touching only the cells whose distance
+changes.
+
+Only walls are obstacles. Robots move all the time, so paths go through
+them; a robot that finds its path blocked can wait or ask again.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from .entities import Entity
+from .utils.vector import Vector
+
+
+UNREACHABLE = -1
+
+
+class DistanceField(NamedTuple):
+    """Distances to a target, as handed to a robot.
+
+    `field` is indexed by game coordinate + `offset`. `origin` and
+    `direction` are where the robot stood and faced when it asked, which is
+    the frame `at` takes its cells in.
+    """
+    field: np.ndarray
+    offset: Tuple[int, int, int]
+    origin: Vector
+    direction: Vector
+
+    def at(self, relative: Vector) -> int:
+        """Moves from the cell at `relative` (in the robot's frame) to the target."""
+        cell = _absolute(self.origin, self.direction, relative)
+        index = tuple(c + o for c, o in zip(cell, self.offset))
+        if not all(0 <= i < n for i, n in zip(index, self.field.shape)):
+            return UNREACHABLE
+        return int(self.field[index])
+
+
+def _absolute(origin: Vector, direction: Vector, relative: Vector) -> Vector:
+    """Inverse of the frame change in `Game._get_relative_status`."""
+    a, b, c = relative
+    dx, _, dz = direction
+    return origin + Vector(a * dx - c * dz, b, a * dz + c * dx)
+
+
+class Navigator:
+    """Distance fields of one room.
+
+    :param half: half extents of the inside of the room, `(x, y, z)`
+    :param blocked: cells inside the room that are obstacles
+    :param max_bytes: memory the cached fields may take
+    """
+
+    def __init__(self, half: Tuple[int, int, int], blocked: Iterable[Vector] = (), max_bytes: int = 1 << 28):
+        self.half = np.array(half, dtype=np.int64)
+        # 四周多留一格当墙，邻居下标不会越界也不会绕回
+        self.offset = tuple((self.half + 1).tolist())
+        self.shape = tuple((2 * self.half + 3).tolist())
+        self.free = np.zeros(self.shape, dtype=bool)
+        self.free[1:-1, 1:-1, 1:-1] = True
+        for cell in blocked:
+            self.free[self.index(cell)] = False
+        self.max_bytes = max_bytes
+        self.__fields: "OrderedDict[Vector, np.ndarray]" = OrderedDict()
+        strides = np.array(self.free.strides) // self.free.itemsize
+        self.__steps = np.concatenate([strides, -strides])
+
+    @classmethod
+    def of(cls, game) -> "Navigator":
+        store = game.store
+        half = (game.length // 2, game.height // 2, game.width // 2)
+        walls = [Vector(*store.location[i].tolist()) for i in range(len(store)) if store.type_of(i) is Entity.Wall]
+        return cls(half, [wall for wall in walls if np.all(np.abs(wall) <= half)])
+
+    def index(self, cell: Vector) -> Tuple[int, int, int]:
+        x, y, z = cell
+        ox, oy, oz = self.offset
+        return (x + ox, y + oy, z + oz)
+
+    def inside(self, cell: Vector) -> bool:
+        return bool(np.all(np.abs(np.array(cell)) <= self.half))
+
+    @property
+    def cached(self) -> List[Vector]:
+        return list(self.__fields)
+
+    def field(self, target: Vector) -> np.ndarray:
+        """Read-only distances to `target`; all unreachable if it is blocked or outside."""
+        field = self.__fields.get(target)
+        if field is not None:
+            self.__fields.move_to_end(target)
+            return field
+        field = self.__search(target)
+        field.flags.writeable = False
+        self.__fields[target] = field
+        while len(self.__fields) > 1 and len(self.__fields) * field.nbytes > self.max_bytes:
+            self.__fields.popitem(last=False)
+        return field
+
+    def path(self, start: Vector, target: Vector) -> Optional[List[Vector]]:
+        """Cells from `start` (excluded) to `target`, or None if there is no way."""
+        field = self.field(target)
+        if not self.inside(start):
+            return None
+        index = self.index(start)
+        distance = int(field[index])
+        if distance == UNREACHABLE:
+            return None
+        path = []
+        cell = start
+        while distance > 0:
+            # 按Vector.AXES的顺序取第一个更近的邻居，结果是确定的
+            for axis in Vector.AXES:
+                step = cell + axis
+                if field[self.index(step)] == distance - 1:
+                    cell = step
+                    break
+            distance -= 1
+            path.append(cell)
+        return path
+
+    def __search(self, target: Vector) -> np.ndarray:
+        flat = np.full(self.free.size, UNREACHABLE, dtype=np.int32)
+        free = self.free.ravel()
+        if self.inside(target):
+            start = np.ravel_multi_index(self.index(target), self.shape)
+            if free[start]:
+                self.__spread(flat, free, np.array([start]), 0)
+        return flat.reshape(self.shape)
+
+    def __spread(self, flat: np.ndarray, free: np.ndarray, frontier: np.ndarray, distance: int):
+        """Breadth-first search from `frontier`, which is at `distance`."""
+        flat[frontier] = distance
+        # 去重不排序：同一个格子被写多次时只保留最后一次写入的位置
+        slot = np.empty(len(flat), dtype=np.int64)
+        while len(frontier):
+            distance += 1
+            neighbours = (frontier[:, None] + self.__steps).ravel()
+            neighbours = neighbours[free[neighbours] & (flat[neighbours] == UNREACHABLE)]
+            order = np.arange(len(neighbours))
+            slot[neighbours] = order
+            neighbours = neighbours[slot[neighbours] == order]
+            flat[neighbours] = distance
+            frontier = neighbours
+
+    # ------------------ incremental updates ------------------ #
+
+    def block(self, cell: Vector):
+        """`cell` became an obstacle; repair the cached fields."""
+        if not self.inside(cell) or not self.free[self.index(cell)]:
+            return
+        self.free[self.index(cell)] = False
+        for target in list(self.__fields):
+            if target == cell:
+                del self.__fields[target]
+            else:
+                self.__repair(target, self.__blocked(self.__fields[target], cell))
+
+    def clear(self, cell: Vector):
+        """`cell` is no longer an obstacle; repair the cached fields."""
+        if not self.inside(cell) or self.free[self.index(cell)]:
+            return
+        self.free[self.index(cell)] = True
+        for target in list(self.__fields):
+            if target == cell:
+                del self.__fields[target]
+            else:
+                self.__repair(target, self.__cleared(self.__fields[target], cell))
+
+    def __repair(self, target: Vector, field: np.ndarray):
+        field.flags.writeable = False
+        self.__fields[target] = field
+
+    def __neighbours(self, i: int) -> np.ndarray:
+        return i + self.__steps
+
+    def __blocked(self, field: np.ndarray, cell: Vector) -> np.ndarray:
+        flat = field.ravel().copy()
+        free = self.free.ravel()
+        start = np.ravel_multi_index(self.index(cell), self.shape)
+        if flat[start] == UNREACHABLE:
+            return field
+        # 找出只能经过cell才能到达目标的格子：按距离从近到远，
+        # 一个格子所有距离少1的邻居都已经受影响，它才受影响
+        affected: Set[int] = {int(start)}
+        layer = [int(start)]
+        while layer:
+            following: Set[int] = set()
+            for i in layer:
+                for j in self.__neighbours(i).tolist():
+                    if j in affected or flat[j] != flat[i] + 1:
+                        continue
+                    parents = self.__neighbours(j)
+                    parents = parents[flat[parents] == flat[j] - 1].tolist()
+                    if all(p in affected for p in parents):
+                        following.add(j)
+            affected |= following
+            layer = list(following)
+        affected_cells = np.fromiter(affected, dtype=np.int64, count=len(affected))
+        flat[affected_cells] = UNREACHABLE
+        # 从受影响区域的边界按原来的距离重新往里扩散
+        boundary: Dict[int, int] = {}
+        for i in affected_cells.tolist():
+            if i == start:
+                continue
+            for j in self.__neighbours(i).tolist():
+                if flat[j] != UNREACHABLE:
+                    boundary[j] = flat[j]
+        self.__bucketed(flat, free, boundary)
+        return flat.reshape(self.shape)
+
+    def __cleared(self, field: np.ndarray, cell: Vector) -> np.ndarray:
+        flat = field.ravel().copy()
+        free = self.free.ravel()
+        start = int(np.ravel_multi_index(self.index(cell), self.shape))
+        neighbours = self.__neighbours(start)
+        known = flat[neighbours][flat[neighbours] != UNREACHABLE]
+        if not len(known):
+            return field
+        self.__bucketed(flat, free, {start: int(known.min()) + 1}, improve=True)
+        return flat.reshape(self.shape)
+
+    def __bucketed(self, flat: np.ndarray, free: np.ndarray, sources: Dict[int, int], improve: bool = False):
+        """Spread from `sources` at their own distances, lowering what gets shorter.
+
+        Without `improve` only unreachable cells are filled in.
+        """
+        buckets: Dict[int, List[int]] = {}
+        for i, distance in sources.items():
+            buckets.setdefault(distance, []).append(i)
+        if improve:
+            for i, distance in sources.items():
+                flat[i] = distance
+        distance = min(buckets) if buckets else 0
+        while buckets:
+            layer = buckets.pop(distance, [])
+            for i in layer:
+                # 已经被更短的距离覆盖过的条目直接跳过
+                if flat[i] != distance:
+                    continue
+                for j in self.__neighbours(i).tolist():
+                    if free[j] and (flat[j] == UNREACHABLE or flat[j] > distance + 1):
+                        flat[j] = distance + 1
+                        buckets.setdefault(distance + 1, []).append(j)
+            distance += 1
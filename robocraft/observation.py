@@ -0,0 +1,138 @@
+"""
+The whole board, or a robot's view of it, as an `int16` NumPy tensor.
+
+..  code-block::python
+
+    board = game.observe()                   # (CHANNELS, X, Y, Z)
+    walls = board[TYPE] == TYPE_IDS["Wall"]
+    view = game.observe_around(player, 5)    # (CHANNELS, 11, 11, 11), robot-centric
+
+Channels:
+
+- `TYPE`: 0 for empty cells, otherwise the entity's code in `TYPE_IDS`.
+- `OWNER`: 1 + the robot's registration order, 0 for anything else.
+- `HP`: hit points times `HP_SCALE`, rounded.
+- `FACING`: 1 + the index of the direction in `Vector.AXES`, 0 for walls.
+
+The board covers the room and its shell of walls, indexed by game
+coordinate + `offset`. Both tensors are buffers owned by the `Observer` and
+refilled in place. Walls never move, so they are written once and each
+refill only clears and rewrites the cells of robots.
+
+A crop is in the same frame as `Game._get_relative_status`: the first
+axis points where the robot faces and the robot is at the center.
+Directions in it are relative too. Cells outside the board read as walls.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .entities import Entity
+from .recording import TYPE_IDS
+from .utils.vector import Vector
+
+
+CHANNELS = ("type", "owner", "hp", "facing")
+TYPE, OWNER, HP, FACING = range(len(CHANNELS))
+HP_SCALE = 100
+
+# 方向按三进制编码成0..26，查表得到FACING的取值
+_CODE = np.array([9, 3, 1], dtype=np.int64)
+_FACING = np.zeros(27, dtype=np.int16)
+for _i, _axis in enumerate(Vector.AXES):
+    _FACING[(np.array(_axis) + 1) @ _CODE] = _i + 1
+# 以某个朝向为前方时，各个FACING取值变成什么
+_RELATIVE_FACING: Dict[Vector, np.ndarray] = {}
+for _origin in (Vector.FORWARD, Vector.BACKWARD, Vector.LEFT, Vector.RIGHT):
+    _table = np.zeros(len(Vector.AXES) + 1, dtype=np.int16)
+    for _i, _axis in enumerate(Vector.AXES):
+        _table[_i + 1] = Vector.AXES.index(_axis * _origin) + 1
+    _RELATIVE_FACING[_origin] = _table
+
+
+def facing(directions: np.ndarray) -> np.ndarray:
+    """`FACING` values of an array of direction vectors."""
+    return _FACING[(directions.astype(np.int64) + 1) @ _CODE]
+
+
+class Observer:
+    """Fills observation tensors of one game."""
+
+    def __init__(self, game):
+        self.__game = game
+        length, height, width = game.length, game.height, game.width
+        # 房间内部再加一圈墙
+        half = np.array([length // 2, height // 2, width // 2], dtype=np.int64) + 1
+        self.offset = half
+        self.board = np.zeros((len(CHANNELS),) + tuple(2 * half + 1), dtype=np.int16)
+        self.__cells: Optional[Tuple[np.ndarray, ...]] = None
+        self.__players = np.zeros(0, dtype=np.int64)
+        self.__static = 0
+        self.__crops: Dict[Tuple[int, int, Vector], np.ndarray] = {}
+        self.__crop_buffers: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def observe(self) -> np.ndarray:
+        """The board as it is now, in `board`."""
+        store = self.__game.store
+        board = self.board
+        if self.__static != len(store):
+            self.__rebuild(store)
+        elif self.__cells is not None:
+            board[(slice(None),) + self.__cells] = 0
+        players = self.__players
+        players = players[store.alive[players]]
+        x, y, z = (store.location[players] + self.offset).T
+        board[TYPE, x, y, z] = TYPE_IDS["Player"]
+        board[OWNER, x, y, z] = np.flatnonzero(store.alive[self.__players]) + 1
+        board[HP, x, y, z] = np.rint(store.hp[players] * HP_SCALE)
+        board[FACING, x, y, z] = facing(store.direction[players])
+        self.__cells = (x, y, z)
+        return board
+
+    def __rebuild(self, store):
+        n = len(store)
+        board = self.board
+        board[:] = 0
+        is_player = store.type[:n] == store.types.index(Entity.Player) if Entity.Player in store.types \
+            else np.zeros(n, dtype=bool)
+        self.__players = np.flatnonzero(is_player)
+        walls = np.flatnonzero(~is_player)
+        x, y, z = (store.location[walls] + self.offset).T
+        board[TYPE, x, y, z] = TYPE_IDS["Wall"]
+        self.__cells = None
+        self.__static = n
+
+    def observe_around(self, player: Entity, radius: int, vertical: Optional[int] = None) -> np.ndarray:
+        """The `(2 * radius + 1, 2 * vertical + 1, 2 * radius + 1)` cells around `player`, in its frame.
+
+        `vertical` defaults to `radius`. The result is a buffer reused by the
+        next call with the same sizes.
+        """
+        vertical = radius if vertical is None else vertical
+        board = self.observe()
+        store = self.__game.store
+        location = store.location[player.id]
+        direction = Vector(*store.direction[player.id].tolist())
+        x, y, z = self.__crop_offsets(radius, vertical, direction) + (location + self.offset)[:, None, None, None]
+        shape = board.shape[1:]
+        inside = (x >= 0) & (x < shape[0]) & (y >= 0) & (y < shape[1]) & (z >= 0) & (z < shape[2])
+        crop = self.__crop_buffers.get((radius, vertical))
+        if crop is None:
+            crop = self.__crop_buffers[(radius, vertical)] = np.zeros((len(CHANNELS),) + x.shape, dtype=np.int16)
+        crop[:] = 0
+        crop[TYPE][~inside] = TYPE_IDS["Wall"]
+        crop[:, inside] = board[:, x[inside], y[inside], z[inside]]
+        crop[FACING] = _RELATIVE_FACING[direction][crop[FACING]]
+        return crop
+
+    def __crop_offsets(self, radius: int, vertical: int, direction: Vector) -> np.ndarray:
+        """World offsets of the cells of a crop, `(3, a, b, c)`."""
+        key = (radius, vertical, direction)
+        offsets = self.__crops.get(key)
+        if offsets is None:
+            a, b, c = np.meshgrid(np.arange(-radius, radius + 1), np.arange(-vertical, vertical + 1),
+                                  np.arange(-radius, radius + 1), indexing="ij")
+            dx, _, dz = direction
+            # Vector.__mul__的逆变换
+            offsets = self.__crops[key] = np.stack([a * dx - c * dz, b, a * dz + c * dx])
+        return offsets
@@ -0,0 +1,278 @@
+"""
+Append-only binary match log and memory-mapped replay.
+
+..  code-block::python
+
+    game = Game(headless=True, recorder=Recorder("match.rec"))
+    ...
+    game.run()
+
+    replay = Replay("match.rec")
+    state = replay.state_at(120)     # entity columns as they were at tick 120
+    for call in replay.calls(0, 40):
+        print(call)
+
+Layout: a 32-byte header, then fixed 32-byte records (`RECORD`). A keyframe
+record is followed by one `ROW` per entity holding the full state. On close
+an index of keyframe offsets and a trailer pointing at it are appended, so a
+reader jumps straight to the keyframe before any tick and replays at most
+one keyframe interval of records.
+"""
+import mmap
+import struct
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+
+
+HEADER = struct.Struct("<8sdI12x")
+MAGIC = b"RCREC001"
+TRAILER = struct.Struct("<4s4xQ")
+TRAILER_MAGIC = b"RCIX"
+
+RECORD = struct.Struct("<IBBHIiiid")
+RECORD_DTYPE = np.dtype([
+    ("tick", "<u4"), ("kind", "u1"), ("aux", "u1"), ("aux2", "<u2"), ("entity", "<u4"),
+    ("a", "<i4"), ("b", "<i4"), ("c", "<i4"), ("value", "<f8"),
+])
+ROW_DTYPE = np.dtype([
+    ("location", "<i4", (3,)), ("direction", "i1", (3,)), ("type", "u1"), ("alive", "u1"),
+    ("pad", "V7"), ("hp", "<f8"),
+])
+INDEX_DTYPE = np.dtype([("tick", "<u4"), ("pad", "V4"), ("offset", "<u8")])
+assert RECORD.size == RECORD_DTYPE.itemsize == ROW_DTYPE.itemsize == 32
+
+# record kinds
+CALL, MOVE, ROTATE, HP, ALIVE, KILL, SPAWN, KEYFRAME, INDEX = range(1, 10)
+STATUS_KINDS = {"location": MOVE, "direction": ROTATE, "hp": HP, "alive": ALIVE}
+
+APIS = (
+    "getStatus", "moveForward", "moveBackward", "moveUpward", "moveDownward",
+    "rotateLeft", "rotateRight", "attack", "defend", "halt", "senseForward",
+    "senseSurroundings", "getProperties", "getEnhancements", "getTimeCosts", "getSize",
+    "execute", "getPathTo", "getDistanceField",
+)
+API_IDS = {name: i for i, name in enumerate(APIS)}
+UNKNOWN_API = 255
+TYPES = ("", "Wall", "Player")
+TYPE_IDS = {name: i for i, name in enumerate(TYPES)}
+
+
+def encode_rows(store, rows, dtype: np.dtype = ROW_DTYPE) -> np.ndarray:
+    """Location, direction, type, alive and hp of `rows` of `store` as `dtype` records."""
+    location = store.location[rows]
+    encoded = np.zeros(len(location), dtype=dtype)
+    encoded["location"] = location
+    encoded["direction"] = store.direction[rows]
+    encoded["hp"] = store.hp[rows]
+    encoded["alive"] = store.alive[rows]
+    codes = np.array([TYPE_IDS.get(t.__qualname__, 0) for t in store.types], dtype=np.uint8)
+    encoded["type"] = codes[store.type[rows]]
+    return encoded
+
+
+class Recorder:
+    """Writes a match log. Records are buffered and flushed in blocks."""
+
+    def __init__(self, path: str, keyframe_interval: int = 256, buffer_size: int = 1 << 16):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.__file = open(path, "wb")
+        self.__buffer = bytearray()
+        self.__buffer_size = buffer_size
+        self.__offset = 0
+        self.__keyframes = []
+        self.__next_keyframe = 0
+        self.started = False
+
+    def start(self, game):
+        self.__write(HEADER.pack(MAGIC, game.clock.tick, self.keyframe_interval))
+        self.started = True
+        self.tick(game.clock.now, game.store)
+
+    def tick(self, now: int, store):
+        if now >= self.__next_keyframe:
+            self.keyframe(now, store)
+            self.__next_keyframe = now - now % self.keyframe_interval + self.keyframe_interval
+
+    def keyframe(self, now: int, store):
+        n = len(store)
+        rows = encode_rows(store, slice(None, n), ROW_DTYPE)
+        self.__keyframes.append((now, self.__offset))
+        self.__write(RECORD.pack(now, KEYFRAME, 0, 0, n, 0, 0, 0, 0.0))
+        self.__write(rows.tobytes())
+
+    def call(self, now: int, entity: int, api: str, args: tuple):
+        arg = args[0] if args and isinstance(args[0], int) else 0
+        self.__write(RECORD.pack(now, CALL, API_IDS.get(api, UNKNOWN_API), 0, entity, arg, 0, 0, 0.0))
+
+    def status(self, now: int, entity: int, attr: str, value):
+        kind = STATUS_KINDS.get(attr)
+        if kind is None:
+            return
+        if kind in (MOVE, ROTATE):
+            x, y, z = value
+            self.__write(RECORD.pack(now, kind, 0, 0, entity, x, y, z, 0.0))
+        else:
+            self.__write(RECORD.pack(now, kind, 0, 0, entity, 0, 0, 0, float(value)))
+
+    def kill(self, now: int, source: int, target: int):
+        self.__write(RECORD.pack(now, KILL, 0, 0, target, source, 0, 0, 0.0))
+
+    def spawn(self, now: int, entity: int, entity_type: type, location, direction, hp: float):
+        """An entity added after the last keyframe. Direction goes into aux as 3 base-3 digits."""
+        x, y, z = location
+        dx, dy, dz = direction
+        code = (dx + 1) * 9 + (dy + 1) * 3 + (dz + 1)
+        self.__write(RECORD.pack(now, SPAWN, code, TYPE_IDS.get(entity_type.__qualname__, 0),
+                                 entity, x, y, z, hp))
+
+    def __write(self, data: bytes):
+        self.__buffer += data
+        self.__offset += len(data)
+        if len(self.__buffer) >= self.__buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.__file.write(self.__buffer)
+        self.__buffer.clear()
+
+    def close(self):
+        if self.__file.closed:
+            return
+        if self.started:
+            index = np.zeros(len(self.__keyframes), dtype=INDEX_DTYPE)
+            if self.__keyframes:
+                index["tick"], index["offset"] = zip(*self.__keyframes)
+            index_offset = self.__offset
+            self.__write(RECORD.pack(0, INDEX, 0, 0, len(index), 0, 0, 0, 0.0))
+            self.__write(index.tobytes())
+            self.__write(TRAILER.pack(TRAILER_MAGIC, index_offset))
+        self.flush()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Call(NamedTuple):
+    tick: int
+    entity: int
+    api: str
+    arg: int
+
+
+class Replay:
+    """Reads a match log through `mmap` and rebuilds the state at any tick."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__file = open(path, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.tick_length, self.keyframe_interval = HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a match recording")
+        self.__end = len(self.__map)
+        ticks, offsets = self.__read_index()
+        self.__keyframe_ticks: np.ndarray = ticks
+        self.__keyframe_offsets: np.ndarray = offsets
+
+    def close(self):
+        self.__map.close()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def keyframes(self) -> np.ndarray:
+        return self.__keyframe_ticks
+
+    def __read_index(self):
+        if self.__end >= HEADER.size + TRAILER.size:
+            magic, offset = TRAILER.unpack_from(self.__map, self.__end - TRAILER.size)
+            if magic == TRAILER_MAGIC:
+                count = RECORD.unpack_from(self.__map, offset)[4]
+                index = np.frombuffer(self.__map, INDEX_DTYPE, count, offset + RECORD.size)
+                self.__end = offset
+                ticks, offsets = index["tick"].astype(np.int64), index["offset"].astype(np.int64)
+                del index
+                return ticks, offsets
+        # 录像没有正常关闭，没有索引，扫描一遍重建
+        ticks, offsets = [], []
+        for offset, record in self.__scan(HEADER.size):
+            if record["kind"] == KEYFRAME:
+                ticks.append(int(record["tick"]))
+                offsets.append(offset)
+        return np.array(ticks, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+    def __scan(self, offset: int) -> Iterator:
+        end = self.__end
+        while offset + RECORD.size <= end:
+            # 拷出来，不在mmap上留导出的缓冲区，否则close时会失败
+            record = np.frombuffer(self.__map, RECORD_DTYPE, 1, offset).copy()[0]
+            yield offset, record
+            offset += RECORD.size
+            if record["kind"] == KEYFRAME:
+                offset += int(record["entity"]) * ROW_DTYPE.itemsize
+
+    def __keyframe_before(self, tick: int) -> int:
+        ticks = self.__keyframe_ticks
+        if not len(ticks) or tick < ticks[0]:
+            raise ValueError(f"No recorded state at tick {tick}")
+        # 关键帧按固定间隔写入，直接按下标定位，只在间隔被打乱时往回找
+        k = min(tick // self.keyframe_interval, len(ticks) - 1)
+        while ticks[k] > tick:
+            k -= 1
+        return k
+
+    def state_at(self, tick: int) -> np.ndarray:
+        """Entity rows (`ROW_DTYPE`, indexed by entity id) at the end of `tick`."""
+        offset = int(self.__keyframe_offsets[self.__keyframe_before(tick)])
+        n = RECORD.unpack_from(self.__map, offset)[4]
+        rows = np.frombuffer(self.__map, ROW_DTYPE, n, offset + RECORD.size).copy()
+        for _, record in self.__scan(offset + RECORD.size + n * ROW_DTYPE.itemsize):
+            if record["tick"] > tick or record["kind"] in (KEYFRAME, INDEX):
+                break
+            kind, i = record["kind"], int(record["entity"])
+            if kind == SPAWN:
+                code = int(record["aux"])
+                row = np.zeros(1, dtype=ROW_DTYPE)
+                row["location"] = (record["a"], record["b"], record["c"])
+                row["direction"] = (code // 9 - 1, code // 3 % 3 - 1, code % 3 - 1)
+                row["type"], row["alive"], row["hp"] = record["aux2"], 1, record["value"]
+                rows = np.concatenate([rows, row])
+            elif kind == MOVE:
+                rows["location"][i] = (record["a"], record["b"], record["c"])
+            elif kind == ROTATE:
+                rows["direction"][i] = (record["a"], record["b"], record["c"])
+            elif kind == HP:
+                rows["hp"][i] = record["value"]
+            elif kind == ALIVE:
+                rows["alive"][i] = record["value"]
+        return rows
+
+    def records(self, start: int = 0, end: Optional[int] = None) -> Iterator[np.void]:
+        """All change and call records with start <= tick < end, in order."""
+        k = self.__keyframe_before(start) if len(self.__keyframe_ticks) and start >= self.__keyframe_ticks[0] else 0
+        offset = int(self.__keyframe_offsets[k]) if len(self.__keyframe_offsets) else HEADER.size
+        for _, record in self.__scan(offset):
+            if record["kind"] in (KEYFRAME, INDEX):
+                continue
+            if end is not None and record["tick"] >= end:
+                break
+            if record["tick"] >= start:
+                yield record
+
+    def calls(self, start: int = 0, end: Optional[int] = None) -> Iterator[Call]:
+        for record in self.records(start, end):
+            if record["kind"] == CALL:
+                api = int(record["aux"])
+                yield Call(int(record["tick"]), int(record["entity"]),
+                           APIS[api] if api < len(APIS) else "", int(record["a"]))
@@ -1,6 +1,7 @@
 import asyncio
 from functools import wraps
 import inspect
+import time
 
 from .. import env
 
@@ -10,12 +11,12 @@ class APIMeta(type):
         new_attrs = {}
         for attr_name, attr in attrs.items():
             if hasattr(attr, 'is_api'):
-                if attr_name.startswith("get"):
-                    fn_name = attr_name.strip("_")
-                    attr = wraps(attr)(cls.__make_func(fn_name))
-                else:
-                    fn_name = attr_name.strip("_")
+                fn_name = attr_name.strip("_")
+                # 声明成什么样，调用方拿到的就是什么样：花tick的接口都是协程
+                if inspect.iscoroutinefunction(attr):
                     attr = wraps(attr)(cls.__make_async_func(fn_name))
+                else:
+                    attr = wraps(attr)(cls.__make_func(fn_name))
             new_attrs[attr_name] = attr
         return type.__new__(cls, name, bases, new_attrs)
 
@@ -25,18 +26,32 @@ class APIMeta(type):
             game = env.game.get()
             f = getattr(game, name)
             entity = game.entities.get_or_create(player.uuid)
-            if inspect.iscoroutinefunction(f):
-                return await f(entity, *args, **kwargs)
-            else:
-                return f(entity, *args, **kwargs)
+            if game.recorder is not None:
+                game.recorder.call(game.clock.now, entity.id, name, args)
+            result = f(entity, *args, **kwargs)
+            # 工作进程里的GameClient返回的是future
+            if inspect.isawaitable(result):
+                return await result
+            return result
         return fn
 
     @staticmethod
     def __make_func(name):
         def fn(player, *args, **kwargs):
+            started = time.perf_counter()
             game = env.game.get()
             entity = game.entities.get_or_create(player.uuid)
-            return getattr(game, name)(entity, *args, **kwargs)
+            if game.recorder is not None:
+                game.recorder.call(game.clock.now, entity.id, name, args)
+            awaitable = False
+            try:
+                result = getattr(game, name)(entity, *args, **kwargs)
+                awaitable = inspect.isawaitable(result)
+                return result
+            finally:
+                # 同步的get*接口不经过delay，在这里记录耗时；经过delay的由delay记录
+                if not awaitable:
+                    game.metrics.api(player.uuid, name, 0, 0, time.perf_counter() - started)
         fn.name = name
         return fn
 
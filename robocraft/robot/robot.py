@@ -1,6 +1,6 @@
 import asyncio
 from typing import List
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from ..entities import Entity
 from ..events import EventHandler
@@ -9,13 +9,31 @@ from ..config import CONFIG
 from .meta import APIMeta, api
 
 
+def _merge_attacked(old: dict, new: dict) -> dict:
+    return dict(new, harm=old["harm"] + new["harm"])
+
+
 class Robot(metaclass=APIMeta):
     components: List[str] = []
 
     def __init__(self):
         self.events = EventHandler()
+        # 还没处理的多次受击合并成一次，伤害累加，来源取最近一次
+        self.events.coalesce("attacked", _merge_attacked)
+        self.events.set_priority("dead", 1)
         self.__uuid = uuid4()
 
+    @classmethod
+    def with_uuid(cls, uuid: UUID) -> "Robot":
+        """A new robot with a known uuid instead of a random one.
+
+        Subclasses keep their own `__init__` signature, so the uuid is not a
+        constructor argument.
+        """
+        robot = cls()
+        robot.__uuid = uuid
+        return robot
+
     @property
     def uuid(self):
         return self.__uuid
@@ -28,17 +46,16 @@ class Robot(metaclass=APIMeta):
         self.game = game.get()
 
         async def _():
-            while not self.game.is_ready():
-                await asyncio.sleep(env.TICK.get() * 0.5)
+            await self.game.started()
             await self.run()
 
-        asyncio.ensure_future(_())
+        return asyncio.ensure_future(_())
 
     # ------------------------- API ------------------------- #
 
     @api
-    async def getStatus(self):
-        pass
+    async def getStatus(self, fields=None):
+        """Own status; `fields` limits it to the given keys"""
 
     @api
     async def moveForward(self):
@@ -77,12 +94,45 @@ class Robot(metaclass=APIMeta):
         """Do nothing, and wait for n ticks to pass"""
 
     @api
-    async def senseForward(self):
-        pass
+    async def execute(self, plan, abort=()):
+        """Run a sequence of actions as one call
+
+        Each action is an API name, or a tuple of the name and its
+        arguments, e.g. `["moveForward", "rotateLeft", ("halt", 5), "attack"]`.
+        Only moves, rotations, `attack`, `defend` and `halt` can be planned.
+        Every action still costs its usual ticks.
+
+        The plan stops early, before its next action, once any event named in
+        `abort` has been fired at this robot since the plan started (e.g.
+        `"attacked"`), or on `"blocked"` right after a move that could not be
+        made. Returns a `PlanResult`.
+        """
 
     @api
-    async def senseSurroundings(self):
-        pass
+    async def senseForward(self, fields=None):
+        """Statuses of what is ahead; `fields` limits each to the given keys"""
+
+    @api
+    async def senseSurroundings(self, fields=None):
+        """Statuses of what is nearby; `fields` limits each to the given keys"""
+
+    @api
+    async def getPathTo(self, target):
+        """Shortest way around the walls to `target`
+
+        `target` and the returned cells are in the robot's own frame, as in
+        `getStatus`. The path leaves out the current cell and ends at
+        `target`. It is None if `target` can't be reached. Other robots are
+        not obstacles, so a move along the path can still be blocked.
+        """
+
+    @api
+    async def getDistanceField(self, target):
+        """Moves from every cell to `target`, as a `DistanceField`
+
+        `field.at(cell)` takes cells in the frame the robot had when it
+        asked, and returns -1 where `target` can't be reached.
+        """
 
     @api
     def getProperties(self):
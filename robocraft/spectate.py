@@ -0,0 +1,229 @@
+"""
+Live spectator feed of a match over a local TCP stream.
+
+..  code-block::python
+
+    feed = SpectatorFeed(port=7777)
+    game = Game(spectators=feed)
+    game.run()
+
+and in a viewer::
+
+    reader, _ = await asyncio.open_connection("127.0.0.1", 7777)
+    state = SpectatorState()
+    while (frame := await read_frame(reader)) is not None:
+        state.apply(frame)
+
+Every frame is a `FRAME` header followed by `count` 32-byte `DELTA_DTYPE`
+records. A new subscriber first gets a keyframe of every entity, then one
+delta per tick holding only the entities that changed in it. A delta frame is
+encoded once per tick and shared by all subscribers, so the cost of a tick
+grows with the number of changes, not with the size of the world.
+
+Each subscriber has a bounded queue. When a viewer falls that far behind,
+its backlog is dropped and it is sent a fresh keyframe instead, so a slow
+viewer skips frames and never slows the simulation down.
+"""
+import asyncio
+import struct
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .recording import TYPES, encode_rows
+
+
+FRAME = struct.Struct("<BxxxII")
+DELTA_DTYPE = np.dtype([
+    ("entity", "<u4"), ("location", "<i4", (3,)), ("direction", "i1", (3,)), ("type", "u1"),
+    ("alive", "u1"), ("pad", "V3"), ("hp", "<f8"),
+])
+assert DELTA_DTYPE.itemsize == 32
+
+# frame kinds
+KEYFRAME, DELTA = 1, 2
+
+
+def encode_frame(kind: int, tick: int, store, rows) -> bytes:
+    encoded = encode_rows(store, rows, DELTA_DTYPE)
+    encoded["entity"] = rows
+    return FRAME.pack(kind, tick, len(encoded)) + encoded.tobytes()
+
+
+class Frame(NamedTuple):
+    kind: int
+    tick: int
+    rows: np.ndarray
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Frame]:
+    """The next frame of a feed, or None once it has ended."""
+    try:
+        kind, tick, count = FRAME.unpack(await reader.readexactly(FRAME.size))
+        body = await reader.readexactly(count * DELTA_DTYPE.itemsize)
+    except asyncio.IncompleteReadError:
+        return None
+    return Frame(kind, tick, np.frombuffer(body, DELTA_DTYPE))
+
+
+class SpectatorState:
+    """Entity columns rebuilt from a feed."""
+
+    def __init__(self):
+        self.tick = -1
+        self.location = np.zeros((0, 3), dtype=np.int32)
+        self.direction = np.zeros((0, 3), dtype=np.int8)
+        self.hp = np.zeros(0, dtype=np.float64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.type = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.hp)
+
+    def apply(self, frame: Frame):
+        rows = frame.rows
+        entities = rows["entity"].astype(np.int64)
+        if frame.kind == KEYFRAME:
+            self.__resize(0)
+        if len(entities):
+            self.__resize(max(len(self), int(entities.max()) + 1))
+        self.location[entities] = rows["location"]
+        self.direction[entities] = rows["direction"]
+        self.hp[entities] = rows["hp"]
+        self.alive[entities] = rows["alive"].astype(bool)
+        self.type[entities] = rows["type"]
+        self.tick = frame.tick
+
+    def type_name(self, i: int) -> str:
+        return TYPES[self.type[i]]
+
+    def __resize(self, n: int):
+        for column in ("location", "direction", "hp", "alive", "type"):
+            array = getattr(self, column)
+            resized = np.zeros((n,) + array.shape[1:], dtype=array.dtype)
+            keep = min(n, len(array))
+            resized[:keep] = array[:keep]
+            setattr(self, column, resized)
+
+
+class Subscriber:
+    """One connected viewer: a bounded queue of frames and the task sending them."""
+
+    def __init__(self, writer: asyncio.StreamWriter, buffer: int):
+        self.writer = writer
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(buffer)
+        self.sent = 0
+        self.skipped = 0
+        self.needs_keyframe = True
+        self.task: Optional[asyncio.Task] = None
+
+    def offer(self, frame: Optional[bytes]) -> bool:
+        """Queue `frame`; if the queue is full, drop the backlog and ask for a keyframe."""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.skipped += 1
+            self.skipped += 1
+            self.needs_keyframe = True
+            return False
+
+    async def send(self):
+        writer = self.writer
+        try:
+            while True:
+                frame = await self.queue.get()
+                if frame is None:
+                    break
+                writer.write(frame)
+                await writer.drain()
+                self.sent += 1
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+
+class SpectatorFeed:
+    """Streams a game to every viewer connected to `host:port`.
+
+    :param port: 0 picks a free port; see `address` once started
+    :param buffer: frames a viewer may fall behind before it is resynced
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, buffer: int = 64):
+        self.host = host
+        self.port = port
+        self.buffer = buffer
+        self.subscribers: List[Subscriber] = []
+        self.__game = None
+        self.__changes = None
+        self.__server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.__server.sockets[0].getsockname()[:2]
+
+    async def start(self, game):
+        self.__game = game
+        self.__changes = game.track_changes()
+        self.__server = await asyncio.start_server(self.__subscribe, self.host, self.port)
+        game.tick_hooks.append(self.publish)
+
+    def __subscribe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriber = Subscriber(writer, self.buffer)
+        self.subscribers.append(subscriber)
+        self.__offer(subscriber, None, self.__keyframe())
+        subscriber.task = asyncio.ensure_future(subscriber.send())
+        subscriber.task.add_done_callback(lambda _: self.subscribers.remove(subscriber))
+
+    def __keyframe(self) -> bytes:
+        store = self.__game.store
+        return encode_frame(KEYFRAME, self.__game.clock.now, store, np.arange(len(store)))
+
+    def __offer(self, subscriber: Subscriber, delta: Optional[bytes], keyframe: Optional[bytes]):
+        if subscriber.needs_keyframe:
+            subscriber.needs_keyframe = False
+            subscriber.offer(keyframe)
+        elif delta is not None:
+            subscriber.offer(delta)
+
+    def publish(self):
+        """Send what changed since the last call. Runs at the end of every tick."""
+        changed = self.__changes.pop()
+        if not self.subscribers:
+            return
+        delta = None
+        if changed:
+            rows = np.fromiter(changed, dtype=np.int64, count=len(changed))
+            rows.sort()
+            delta = encode_frame(DELTA, self.__game.clock.now, self.__game.store, rows)
+        # 关键帧只有落后的观众需要，一个tick最多编码一次
+        keyframe = None
+        for subscriber in self.subscribers:
+            if subscriber.needs_keyframe and keyframe is None:
+                keyframe = self.__keyframe()
+            self.__offer(subscriber, delta, keyframe)
+
+    async def close(self):
+        """Flush the last changes and end every stream."""
+        if self.__server is None:
+            return
+        self.publish()
+        self.__game.tick_hooks.remove(self.publish)
+        self.__game.untrack_changes(self.__changes)
+        self.__server.close()
+        subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            if not subscriber.offer(None):
+                subscriber.offer(None)
+        tasks = [subscriber.task for subscriber in subscribers]
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=1.0)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.__server.wait_closed()
+        self.__server = None
@@ -0,0 +1,204 @@
+"""
+Rank robots against each other by playing many headless matches in parallel.
+
+..  code-block::python
+
+    from robocraft.tournament import Tournament
+
+    tournament = Tournament([MyBot, "bots.other:OtherBot"], schedule="swiss", rounds=5)
+    for result in tournament.play():
+        print(result)
+    print(tournament.standings())
+
+or from the command line::
+
+    python -m robocraft.tournament bots.mine:MyBot bots.other:OtherBot --schedule round-robin
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import importlib
+import itertools
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+def robot_spec(robot: Union[type, str]) -> str:
+    """`module:QualName` of a robot class, which is how workers import it."""
+    if isinstance(robot, str):
+        return robot
+    return f"{robot.__module__}:{robot.__qualname__}"
+
+
+def load_robot(spec: str) -> type:
+    module_name, _, qualname = spec.partition(":")
+    obj = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+@dataclass
+class MatchResult:
+    match: int
+    robots: Tuple[str, ...]
+    winner: Optional[str]
+    ticks: int
+    alive: Tuple[bool, ...]
+    kills: Tuple[int, ...]
+    damage: Tuple[float, ...]
+    damage_taken: Tuple[float, ...]
+
+
+@dataclass
+class Standing:
+    robot: str
+    played: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    byes: int = 0
+    kills: int = 0
+    damage: float = 0.0
+    damage_taken: float = 0.0
+    opponents: set = field(default_factory=set, repr=False)
+
+    @property
+    def points(self) -> float:
+        return self.wins + self.byes + 0.5 * self.draws
+
+
+def play_match(match: int, robots: Sequence[str]) -> MatchResult:
+    """Play one headless match. Runs inside a worker process."""
+    from .game import Game
+
+    game = Game(headless=True)
+    players = [load_robot(spec)() for spec in robots]
+    for player in players:
+        game.register(player)
+    game.run()
+    board = game.scoreboard()
+    scores = [board[player.uuid] for player in players]
+    alive = tuple(score["alive"] for score in scores)
+    winner = robots[alive.index(True)] if sum(alive) == 1 else None
+    return MatchResult(
+        match=match,
+        robots=tuple(robots),
+        winner=winner,
+        ticks=game.clock.now,
+        alive=alive,
+        kills=tuple(score["kills"] for score in scores),
+        damage=tuple(score["damage"] for score in scores),
+        damage_taken=tuple(score["damageTaken"] for score in scores),
+    )
+
+
+def round_robin(robots: Sequence[str], rounds: int = 1) -> Iterator[List[Tuple[str, str]]]:
+    """Every pair meets once per round, swapping spawn sides every other round."""
+    for i in range(rounds):
+        pairs = list(itertools.combinations(robots, 2))
+        yield pairs if i % 2 == 0 else [(b, a) for a, b in pairs]
+
+
+def swiss(standings: Dict[str, Standing]) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """Pair robots with similar scores, avoiding rematches where possible.
+
+    Returns the pairs and the robot that sits this round out, if any.
+    """
+    ranked = sorted(standings.values(), key=lambda s: (-s.points, -s.damage, s.robot))
+    bye = None
+    if len(ranked) % 2:
+        candidates = [s for s in reversed(ranked) if not s.byes] or [ranked[-1]]
+        bye = candidates[0].robot
+        ranked = [s for s in ranked if s.robot != bye]
+    pairs = []
+    while ranked:
+        first = ranked.pop(0)
+        partner = next((s for s in ranked if s.robot not in first.opponents), ranked[0])
+        ranked.remove(partner)
+        pairs.append((first.robot, partner.robot))
+    return pairs, bye
+
+
+SCHEDULES = ("round-robin", "swiss")
+
+
+class Tournament:
+    def __init__(self, robots: Sequence[Union[type, str]], schedule: str = "round-robin",
+                 rounds: int = 1, workers: Optional[int] = None):
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Invalid schedule {schedule}")
+        self.robots = [robot_spec(robot) for robot in robots]
+        if len(set(self.robots)) != len(self.robots):
+            raise ValueError("Each robot can only enter once")
+        self.schedule = schedule
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count()
+        self.results: List[MatchResult] = []
+        self.__standings = {robot: Standing(robot) for robot in self.robots}
+        self.__match_ids = itertools.count()
+
+    def play(self) -> Iterator[MatchResult]:
+        """Play the whole schedule, yielding each result as soon as it finishes."""
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            if self.schedule == "round-robin":
+                # 循环赛的对阵与结果无关，所有轮次可以一起提交
+                pairs = [pair for round_ in round_robin(self.robots, self.rounds) for pair in round_]
+                yield from self.__play_round(executor, pairs)
+            else:
+                for _ in range(self.rounds):
+                    pairs, bye = swiss(self.__standings)
+                    if bye is not None:
+                        self.__standings[bye].byes += 1
+                    yield from self.__play_round(executor, pairs)
+
+    def __play_round(self, executor, pairs) -> Iterator[MatchResult]:
+        futures = [executor.submit(play_match, next(self.__match_ids), pair) for pair in pairs]
+        for future in as_completed(futures):
+            result = future.result()
+            self.__record(result)
+            yield result
+
+    def __record(self, result: MatchResult):
+        self.results.append(result)
+        for i, robot in enumerate(result.robots):
+            standing = self.__standings[robot]
+            standing.played += 1
+            standing.kills += result.kills[i]
+            standing.damage += result.damage[i]
+            standing.damage_taken += result.damage_taken[i]
+            standing.opponents.update(r for r in result.robots if r != robot)
+            if result.winner is None:
+                standing.draws += 1
+            elif result.winner == robot:
+                standing.wins += 1
+            else:
+                standing.losses += 1
+
+    def standings(self) -> List[Standing]:
+        return sorted(self.__standings.values(), key=lambda s: (-s.points, -s.kills, -s.damage, s.robot))
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m robocraft.tournament",
+                                     description="Rank robots by playing headless matches in parallel.")
+    parser.add_argument("robots", nargs="+", help="robot classes as module:ClassName")
+    parser.add_argument("--schedule", choices=SCHEDULES, default="round-robin")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of CPUs")
+    args = parser.parse_args(argv)
+
+    tournament = Tournament(args.robots, args.schedule, args.rounds, args.workers)
+    for result in tournament.play():
+        players = " vs ".join(result.robots)
+        print(f"#{result.match} {players}: winner={result.winner} ticks={result.ticks} "
+              f"kills={result.kills} damage={result.damage}")
+    print()
+    print(f"{'robot':40} {'pts':>5} {'W':>4} {'D':>4} {'L':>4} {'kills':>6} {'damage':>8} {'taken':>8}")
+    for s in tournament.standings():
+        print(f"{s.robot:40} {s.points:5.1f} {s.wins:4d} {s.draws:4d} {s.losses:4d} "
+              f"{s.kills:6d} {s.damage:8.2f} {s.damage_taken:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,165 @@
-import inspect
-from numbers import Real, Real
+from numbers import Real
+import operator
 
-from .typecheck import overload
+
+_MISSING = object()
+_OPERATORS = {
+    "__add__": ("+", operator.add),
+    "__sub__": ("-", operator.sub),
+    "__mul__": ("*", operator.mul),
+    "__truediv__": ("/", operator.truediv),
+}
 
 
 class PropertyMeta(type):
-    def __new__(cls, name, bases, attrs):
-        if '__annotations__' in attrs and '__init__' in attrs:
-            attrs['__init__'].__annotations__ = attrs['__annotations__']
-        return super().__new__(cls, name, bases, attrs)
+    """Generates straight-line methods for every property class.
 
+    At class-creation time each subclass gets `__slots__` for its fields and
+    specialized `__init__`, arithmetic, `__repr__` and copy methods, so no
+    signature binding or per-field loop happens at runtime.
+    """
 
-class PropertyBase(metaclass=PropertyMeta):
-    @overload
-    def __init__(self, *args, **kwargs):
-        params = [
-            inspect.Parameter(key, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=_type, default=_type())
-            for key, _type in self.__annotations__.items()
+    def __new__(cls, name, bases, attrs):
+        inherited = {}
+        for base in reversed(bases):
+            inherited.update(getattr(base, '_fields', {}))
+        own = attrs.get('__annotations__', {})
+        attrs['__slots__'] = tuple(key for key in own if key not in inherited)
+        new_cls = super().__new__(cls, name, bases, attrs)
+        new_cls._fields = dict(inherited, **own)
+        if new_cls._fields:
+            cls.__generate(new_cls)
+        return new_cls
+
+    @staticmethod
+    def __generate(new_cls):
+        fields = new_cls._fields
+        namespace = {"Real": Real, "_MISSING": _MISSING, "_new": object.__new__, "cls": new_cls}
+        lines = []
+
+        # ------------------------- __init__ ------------------------- #
+        params = ", ".join(f"{key}=_MISSING" for key in fields)
+        body = []
+        for i, (key, _type) in enumerate(fields.items()):
+            namespace[f"T{i}"] = _type
+            if issubclass(_type, PropertyBase):
+                body += [
+                    f"    if {key} is _MISSING: {key} = T{i}()",
+                    f"    elif {key}.__class__ is not T{i}: {key} = T{i}._coerce({key})",
+                    f"    else: {key} = {key}.copy()",
+                ]
+            else:
+                check = "Real" if issubclass(_type, Real) else f"T{i}"
+                body += [
+                    f"    if {key} is _MISSING: {key} = T{i}()",
+                    f"    elif not isinstance({key}, {check}):",
+                    f"        raise TypeError(f\"Field `{key}` of {new_cls.__qualname__} needs {_type.__qualname__}, "
+                    f"got {{{key}!r}}\")",
+                ]
+            body.append(f"    self.{key} = {key}")
+        lines.append(f"def _init_fields(self, {params}):")
+        lines += body
+
+        if new_cls._pure:
+            lines += [
+                "def __init__(self, *args, **kwargs):",
+                "    if kwargs or len(args) != 1 or not isinstance(args[0], Real):",
+                "        return self._init_fields(*args, **kwargs)",
+                "    value = args[0]",
+            ]
+            lines += [f"    self.{key} = value" for key in fields]
+        else:
+            lines.append("__init__ = _init_fields")
+
+        # ------------------------ arithmetic ------------------------ #
+        for method, (op, _) in _OPERATORS.items():
+            lines += [
+                f"def {method}(self, other):",
+                "    result = _new(cls)",
+                "    if isinstance(other, Real):",
+            ]
+            lines += [f"        result.{key} = self.{key} {op} other" for key in fields]
+            lines += [
+                "        return result",
+                "    if other.__class__ is cls:",
+            ]
+            lines += [f"        result.{key} = self.{key} {op} other.{key}" for key in fields]
+            lines += [
+                "        return result",
+                f"    return self._generic(other, '{method}')",
+            ]
+
+        # ----------------------- repr & copy ------------------------ #
+        data = " ".join(f"{key}={{self.{key}!r}}" for key in fields)
+        lines += [
+            "def __repr__(self):",
+            f"    return f\"<{new_cls.__qualname__} {data}>\"",
+            "def __copy__(self):",
+            "    result = _new(cls)",
         ]
-        signature = inspect.Signature(params)
-
-        params = signature.bind(*args, **kwargs)
-        params.apply_defaults()
-        for key, value in params.arguments.items():
-            _type = self.__annotations__[key]
+        lines += [f"    result.{key} = self.{key}" for key in fields]
+        lines += [
+            "    return result",
+            "def copy(self):",
+            "    result = _new(cls)",
+        ]
+        for key, _type in fields.items():
             if issubclass(_type, PropertyBase):
-                if isinstance(value, dict):
-                    value = _type(**value)
-                elif isinstance(value, PropertyBase):
-                    kwargs = {key: getattr(value, key) for key in value.__annotations__}
-                    value = _type(**kwargs)
-                else:
-                    value = _type(value)
-            setattr(self, key, value)
-
-    def __repr__(self):
-        data = " ".join(f"{key}={repr(getattr(self, key))}" for key in self.__annotations__)
-        return f"<{self.__class__.__qualname__} {data}>"
-
-    @overload
-    def __add__(self, other):
-        result = self.__class__()
-        for key in other.__annotations__.keys():
-            setattr(result, key, getattr(self, key) + getattr(other, key))
-        return result
-
-    @__add__.register
-    def __add__(self, other: Real):
-        result = self.__class__()
-        for key in self.__annotations__.keys():
-            setattr(result, key, getattr(self, key) + other)
-        return result
-
-    @overload
-    def __sub__(self, other):
-        result = self.__class__()
-        for key in other.__annotations__.keys():
-            setattr(result, key, getattr(self, key) - getattr(other, key))
-        return result
-
-    @__sub__.register
-    def __sub__(self, other: Real):
-        result = self.__class__()
-        for key in self.__annotations__.keys():
-            setattr(result, key, getattr(self, key) - other)
-        return result
-
-    @overload
-    def __mul__(self, other):
-        result = self.__class__()
-        for key in self.__annotations__.keys():
-            if hasattr(other, key):
-                setattr(result, key, getattr(self, key) * getattr(other, key))
+                lines.append(f"    result.{key} = self.{key}.copy()")
             else:
-                setattr(result, key, getattr(self, key))
-        return result
+                lines.append(f"    result.{key} = self.{key}")
+        lines += [
+            "    return result",
+            "def __deepcopy__(self, memo):",
+            "    return self.copy()",
+        ]
 
-    @__mul__.register
-    def __mul__(self, other: Real):
-        result = self.__class__()
-        for key in self.__annotations__.keys():
-            setattr(result, key, getattr(self, key) * other)
-        return result
+        exec("\n".join(lines), namespace)
+        for method in ("_init_fields", "__init__", *_OPERATORS, "__repr__", "__copy__", "copy", "__deepcopy__"):
+            function = namespace[method]
+            function.__qualname__ = f"{new_cls.__qualname__}.{method}"
+            setattr(new_cls, method, function)
 
-    @overload
-    def __truediv__(self, other):
-        result = self.__class__()
-        for key in other.__annotations__.keys():
-            setattr(result, key, getattr(self, key) / getattr(other, key))
-        return result
 
-    @__truediv__.register
-    def __truediv__(self, other: Real):
+class PropertyBase(metaclass=PropertyMeta):
+    _pure = False
+
+    def __init__(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__qualname__} has no fields")
+
+    @classmethod
+    def _coerce(cls, value):
+        if isinstance(value, dict):
+            return cls(**value)
+        elif isinstance(value, PropertyBase):
+            return cls(**{key: getattr(value, key) for key in value.keys()})
+        else:
+            return cls(value)
+
+    def _generic(self, other, method):
+        """Arithmetic between two different property classes."""
+        if not isinstance(other, PropertyBase):
+            return NotImplemented
         result = self.__class__()
-        for key in self.__annotations__.keys():
-            setattr(result, key, getattr(self, key) / other)
+        if method == "__mul__":
+            for key in self.keys():
+                if hasattr(other, key):
+                    setattr(result, key, getattr(self, key) * getattr(other, key))
+                else:
+                    setattr(result, key, getattr(self, key))
+        else:
+            op = _OPERATORS[method][1]
+            for key in other.keys():
+                setattr(result, key, op(getattr(self, key), getattr(other, key)))
         return result
 
     def keys(self):
-        return self.__annotations__.keys()
-
-    def __setattr__(self, key, value):
-        if key in self.__annotations__:
-            _type = self.__annotations__[key]
-            assert isinstance(value, _type)
-        super().__setattr__(key, value)
+        return self._fields.keys()
 
 
 class PureProperty(PropertyBase):
-    @PropertyBase.__init__.register
-    def __init__(self, value: Real):
-        for key in self.__annotations__.keys():
-            setattr(self, key, value)
+    """A property whose fields can all be set from a single number."""
+    _pure = True
 
 
 class AttackProperty(PureProperty):
@@ -128,6 +176,8 @@ class SpeedProperty(PureProperty):
     moveUpward: float
     moveDownward: float
     attack: float
+    getPathTo: float
+    getDistanceField: float
 
 
 class CapacityProperty(PureProperty):
@@ -153,5 +203,69 @@ class ComponentProperty(PropertyBase):
     costs: CapacityProperty
 
 
+class PropertyView:
+    """Read-only view of a property tree that shares its data instead of copying it.
+
+    The game never mutates a property object once a view of it may exist
+    (updates replace the object), so a view is a stable snapshot. `overrides`
+    replaces individual fields, e.g. the current hp which is kept elsewhere.
+    """
+    __slots__ = ("_target", "_overrides")
+
+    def __init__(self, target: PropertyBase, **overrides):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_overrides", overrides)
+
+    def __getattr__(self, key):
+        if key in self._overrides:
+            return self._overrides[key]
+        value = getattr(self._target, key)
+        if isinstance(value, PropertyBase):
+            return PropertyView(value)
+        return value
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self._target.__class__.__qualname__} is read-only")
+
+    def keys(self):
+        return self._target.keys()
+
+    def copy(self) -> PropertyBase:
+        """A mutable deep copy."""
+        result = self._target.copy()
+        for key, value in self._overrides.items():
+            setattr(result, key, value)
+        return result
+
+    def __repr__(self):
+        data = " ".join(f"{key}={getattr(self, key)!r}" for key in self.keys())
+        return f"<{self._target.__class__.__qualname__} {data}>"
+
+    def __reduce__(self):
+        return _view, (self._target, self._overrides)
+
+    def __add__(self, other):
+        return self.copy() + _unwrap(other)
+
+    def __sub__(self, other):
+        return self.copy() - _unwrap(other)
+
+    def __mul__(self, other):
+        return self.copy() * _unwrap(other)
+
+    def __truediv__(self, other):
+        return self.copy() / _unwrap(other)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+
+def _unwrap(value):
+    return value.copy() if isinstance(value, PropertyView) else value
+
 
-CapacityProperty(100, 100)
\ No newline at end of file
+def _view(target: PropertyBase, overrides: dict) -> PropertyView:
+    return PropertyView(target, **overrides)
@@ -45,6 +45,10 @@ overload
     fn(1)            # 1 is int
     fn(2.0)          # 2.0 is float
 
+Signatures are computed once at registration. When every annotation is a
+plain class, the chosen function is cached by the argument types, so later
+calls with the same shapes skip binding altogether.
+
 """
 from functools import wraps
 from inspect import signature, _empty
@@ -106,7 +110,10 @@ def _check_union_type(type, value):
 
 
 def _check_function(fn, args, kwargs):
-    sig = signature(fn)
+    _check_signature(fn, signature(fn), args, kwargs)
+
+
+def _check_signature(fn, sig, args, kwargs):
     bounded = sig.bind(*args, **kwargs)
     bounded.apply_defaults()
     for name, param in sig.parameters.items():
@@ -120,13 +127,30 @@ def _check_function(fn, args, kwargs):
             raise TypeError(f"Argument `{name}` of {fn.__name__} needs {_type}")
 
 
+def _depends_on_types_only(sig):
+    """Whether binding `sig` succeeds or fails purely on the argument types.
+
+    True when every annotation is a plain class (or a Union of them), so the
+    outcome can be cached by argument types.
+    """
+    def simple(annotation):
+        if annotation is _empty or annotation is Any:
+            return True
+        if _check_is_complex_type(annotation):
+            return annotation.__origin__ is Union and all(simple(t) for t in annotation.__args__)
+        return isinstance(annotation, type)
+    return all(simple(param.annotation) for param in sig.parameters.values())
+
+
 def type_check(check_elements=False):
     def decorator(fn):
+        sig = signature(fn)
+
         @wraps(fn)
         def wrapped(*args, **kwargs):
             global CHECK_ELEMENTS
             token, CHECK_ELEMENTS = CHECK_ELEMENTS, check_elements
-            _check_function(fn, args, kwargs)
+            _check_signature(fn, sig, args, kwargs)
             CHECK_ELEMENTS = token
             result = fn(*args, **kwargs)
             return result
@@ -135,21 +159,37 @@ def type_check(check_elements=False):
 
 
 def overload(func):
-    registered = [func]
+    registered = []
+    # (argument types, keyword names and types) -> chosen function
+    dispatch = {}
 
     def register(f):
-        registered.append(f)
+        sig = signature(f)
+        registered.insert(0, (f, sig, _depends_on_types_only(sig)))
+        dispatch.clear()
         return wrapped
 
     @wraps(func)
     def wrapped(*args, **kwargs):
-        for fn in reversed(registered):
+        if kwargs:
+            key = (tuple(map(type, args)), tuple((k, type(v)) for k, v in kwargs.items()))
+        else:
+            key = tuple(map(type, args))
+        fn = dispatch.get(key)
+        if fn is not None:
+            return fn(*args, **kwargs)
+        cacheable = True
+        for fn, sig, types_only in registered:
+            cacheable = cacheable and types_only
             try:
-                _check_function(fn, args, kwargs)
+                _check_signature(fn, sig, args, kwargs)
             except TypeError:
                 continue
+            if cacheable:
+                dispatch[key] = fn
             return fn(*args, **kwargs)
         raise TypeError
 
+    register(func)
     wrapped.register = register
     return wrapped
@@ -1,53 +1,105 @@
-from dataclasses import dataclass
+from operator import itemgetter
 
 
-@dataclass
-class Vector:
-    x: int
-    y: int
-    z: int
+class Vector(tuple):
+    """Immutable integer 3-vector.
+
+    Being a tuple it is hashable and can key dicts (e.g. the game's
+    occupancy index). The six axis directions are interned and rotating or
+    negating them is a table lookup, so turning never allocates.
+    """
+    __slots__ = ()
+
+    def __new__(cls, x: int, y: int, z: int):
+        return tuple.__new__(cls, (x, y, z))
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+    z = property(itemgetter(2))
+
+    def __repr__(self):
+        return f"Vector(x={self[0]}, y={self[1]}, z={self[2]})"
 
     def __neg__(self):
-        return Vector(-self.x, -self.y, -self.z)
+        result = _NEGATIONS.get(self)
+        if result is None:
+            x, y, z = self
+            result = Vector(-x, -y, -z)
+        return result
 
     def __sub__(self, other):
-        return Vector(self.x - other.x,
-                      self.y - other.y,
-                      self.z - other.z)
+        x, y, z = self
+        ox, oy, oz = other
+        return Vector(x - ox, y - oy, z - oz)
 
     def __add__(self, other):
-        return Vector(self.x + other.x,
-                      self.y + other.y,
-                      self.z + other.z)
+        x, y, z = self
+        ox, oy, oz = other
+        return Vector(x + ox, y + oy, z + oz)
 
-    def __iadd__(self, other):
-        self.x += other.x
-        self.y += other.y
-        self.z += other.z
+    # tuple的拼接和重复对向量没有意义，从右边参与运算时只接受三元组
+    def __radd__(self, other):
+        if not _is_triple(other):
+            if isinstance(other, tuple):
+                # 返回NotImplemented的话会退回到tuple的拼接
+                raise TypeError(f"Can't add a {len(other)}-tuple and a Vector")
+            return NotImplemented
+        return self + other
 
-    def __isub__(self, other):
-        self.x -= other.x
-        self.y -= other.y
-        self.z -= other.z
+    def __rsub__(self, other):
+        if not _is_triple(other):
+            return NotImplemented
+        x, y, z = self
+        ox, oy, oz = other
+        return Vector(ox - x, oy - y, oz - z)
 
-    def __eq__(self, other):
-        return (self.x == other.x and
-                self.y == other.y and
-                self.z == other.z)
+    def __rmul__(self, other):
+        return NotImplemented
 
     def __abs__(self):
-        return (self.x * self.x +
-                self.y * self.y +
-                self.x * self.z) ** 0.5
+        x, y, z = self
+        return (x * x + y * y + z * z) ** 0.5
 
     def __matmul__(self, other):
-        return (self.x * other.x +
-                self.y * other.y +
-                self.z * other.z)
+        x, y, z = self
+        ox, oy, oz = other
+        return x * ox + y * oy + z * oz
 
     def __mul__(self, other):
         """根据other的方向做旋转"""
-        x = self.x * other.x + self.z * other.z
-        y = self.y
-        z = -self.x * other.z + self.z * other.x
-        return Vector(x, y, z)
+        table = _ROTATIONS.get(other)
+        if table is not None:
+            result = table.get(self)
+            if result is not None:
+                return result
+        x, y, z = self
+        ox, _, oz = other
+        return Vector(x * ox + z * oz, y, -x * oz + z * ox)
+
+
+def _is_triple(value) -> bool:
+    return isinstance(value, (tuple, list)) and len(value) == 3
+
+
+Vector.FORWARD = Vector(1, 0, 0)
+Vector.BACKWARD = Vector(-1, 0, 0)
+Vector.UP = Vector(0, 1, 0)
+Vector.DOWN = Vector(0, -1, 0)
+Vector.LEFT = Vector(0, 0, -1)
+Vector.RIGHT = Vector(0, 0, 1)
+Vector.AXES = (Vector.FORWARD, Vector.BACKWARD, Vector.UP, Vector.DOWN, Vector.LEFT, Vector.RIGHT)
+
+_INTERNED = {axis: axis for axis in Vector.AXES}
+_NEGATIONS = {axis: _INTERNED[Vector(-axis.x, -axis.y, -axis.z)] for axis in Vector.AXES}
+# 水平方向之间的旋转结果全部预先算好并复用同一批实例
+_ROTATIONS = {}
+for _direction in (Vector.FORWARD, Vector.BACKWARD, Vector.LEFT, Vector.RIGHT):
+    _ROTATIONS[_direction] = {}
+    for _axis in Vector.AXES:
+        _x, _y, _z = _axis
+        _rotated = Vector(_x * _direction.x + _z * _direction.z, _y, -_x * _direction.z + _z * _direction.x)
+        _ROTATIONS[_direction][_axis] = _INTERNED[_rotated]
+del _direction, _axis, _x, _y, _z, _rotated
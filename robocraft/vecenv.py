@@ -0,0 +1,235 @@
+"""
+Many arenas stepped in lockstep, one tick per step, for training bots.
+
+..  code-block::python
+
+    env = VecArena(1024, [MyBot, ["HeavySword"]])
+    obs = env.reset()
+    while training:
+        actions = policy(obs)                  # (arenas, robots) indices of ACTIONS
+        obs, rewards, dones, info = env.step(actions)
+
+The arenas are plain NumPy columns with one row per arena, and every
+rule is applied to all arenas at once. Robots are visited in registration
+order, as `Game` wakes same-tick callers in arrival order. Spawn points,
+hit points, attack/defense and per-robot tick costs come from a template
+`Game` built with the same robots, so the rules match a real match:
+
+- An action chosen at tick `t` runs at `t + ticks[action]`, as under the
+  `delay` decorator. The robot takes no other action until it has run;
+  `info["ready"]` tells which robots will read their entry of the next
+  action array.
+- `halt` waits one tick after its cost, like `halt(1)`.
+- Moves are blocked by the room's walls and by living robots, and attacks
+  hit the living robot in the facing cell.
+- A robot whose hp drops to 0 dies at the end of the tick, as `Game`
+  processes kills at its end-of-tick event poll.
+
+A step returns the observations, the rewards of the step (damage dealt
+minus damage taken, plus `kill_reward` per kill) and whether each arena's
+match is over. A finished arena is reset at once (see `auto_reset`), so the
+observation of a done arena is the first one of its next match.
+
+Observations are `(arenas, robots, robots, FEATURES)` float32. Row `j` of
+robot `i` is robot `j` in `i`'s frame, as in `Game._get_relative_status`:
+relative location, relative direction, hp and alive. Robot `i`'s own
+row holds its absolute location and direction instead, which is all it
+needs to know where the walls are.
+"""
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config import CONFIG
+from .entities import Entity
+from .game import Game
+from .robot import Robot
+
+
+ACTIONS = ("halt", "moveForward", "moveBackward", "moveUpward", "moveDownward",
+           "rotateLeft", "rotateRight", "attack", "defend")
+(HALT, MOVE_FORWARD, MOVE_BACKWARD, MOVE_UPWARD, MOVE_DOWNWARD,
+ ROTATE_LEFT, ROTATE_RIGHT, ATTACK, DEFEND) = range(len(ACTIONS))
+FEATURES = 8
+# 没有待执行的动作
+IDLE = -1
+
+_UP = np.array([0, 1, 0], dtype=np.int32)
+
+
+def _rotate(vectors: np.ndarray, directions: np.ndarray) -> np.ndarray:
+    """`Vector.__mul__` over the last axis: `vectors` in the frame facing `directions`."""
+    x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+    dx, dz = directions[..., 0], directions[..., 2]
+    return np.stack([x * dx + z * dz, y, -x * dz + z * dx], axis=-1)
+
+
+class VecArena:
+    """`arenas` independent matches between the same `robots`.
+
+    :param robots: robot classes, or lists of component names
+    :param room: overrides of `init.room`, as for `Game`
+    :param timeout: match length in seconds, as for `Game`
+    :param kill_reward: added to the reward of a robot for each kill
+    :param auto_reset: reset finished arenas inside `step`; without it they
+        keep their final state and ignore further steps until `reset`
+    """
+
+    def __init__(self, arenas: int, robots: Sequence[Union[type, Sequence[str]]],
+                 room: Optional[dict] = None, timeout: Optional[float] = None, kill_reward: float = 0.0,
+                 auto_reset: bool = True):
+        self.arenas = arenas
+        self.auto_reset = auto_reset
+        self.robots = len(robots)
+        self.kill_reward = kill_reward
+        template = Game(headless=True, room=room, timeout=timeout)
+        for spec in robots:
+            robot = Robot()
+            robot.components = list(spec.components if isinstance(spec, type) else spec)
+            template.register(robot)
+        store = template.store
+        rows = [i for i in range(len(store)) if store.type_of(i) is Entity.Player]
+        self.half = np.array([template.length // 2, template.height // 2, template.width // 2], dtype=np.int32)
+        if timeout is None:
+            timeout = CONFIG['init']['game']['timeout']
+        self.timeout = int(timeout * CONFIG['init']['game']['ticksPerSec'])
+
+        self.__start_location = store.location[rows].astype(np.int32)
+        self.__start_direction = store.direction[rows].astype(np.int32)
+        self.__start_hp = store.hp[rows].astype(np.float64)
+        properties = [store.properties[i] for i in rows]
+        self.attack = np.array([[p.attack.normal, p.attack.back] for p in properties])
+        self.defense = np.array([[p.defense.normal, p.defense.back] for p in properties])
+        # 每个机器人每种动作要等的ticks，和delay装饰器用的是同一张表
+        self.costs = np.array([[store.ticks[i].get(name, 0) for name in ACTIONS] for i in rows], dtype=np.int64)
+        self.costs[:, HALT] += 1
+
+        shape = (arenas, self.robots)
+        self.location = np.zeros(shape + (3,), dtype=np.int32)
+        self.direction = np.zeros(shape + (3,), dtype=np.int32)
+        self.hp = np.zeros(shape, dtype=np.float64)
+        self.alive = np.zeros(shape, dtype=bool)
+        self.pending = np.full(shape, IDLE, dtype=np.int64)
+        self.due = np.zeros(shape, dtype=np.int64)
+        self.now = np.zeros(arenas, dtype=np.int64)
+        self.__rewards = np.zeros(shape, dtype=np.float32)
+        self.__robot_index = np.arange(self.robots)
+        self.reset()
+
+    def reset(self, arenas: Optional[np.ndarray] = None) -> np.ndarray:
+        """Start new matches in `arenas` (a mask or indices, default all)."""
+        if arenas is None:
+            arenas = slice(None)
+        self.location[arenas] = self.__start_location
+        self.direction[arenas] = self.__start_direction
+        self.hp[arenas] = self.__start_hp
+        self.alive[arenas] = True
+        self.pending[arenas] = IDLE
+        self.due[arenas] = 0
+        self.now[arenas] = 0
+        return self.observe()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """Advance every arena by one tick.
+
+        `actions` is an `(arenas, robots)` array of indices into `ACTIONS`;
+        only the entries of ready robots are read.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != self.pending.shape:
+            raise ValueError(f"Expected actions of shape {self.pending.shape}, got {actions.shape}")
+        over = self.__over()
+        ready = (self.pending == IDLE) & self.alive & ~over[:, None]
+        if np.any(ready & ((actions < 0) | (actions >= len(ACTIONS)))):
+            raise ValueError("Invalid action")
+        chosen = np.where(ready, actions, 0)
+        self.pending = np.where(ready, chosen, self.pending)
+        self.due = np.where(ready, self.now[:, None] + self.costs[self.__robot_index, chosen], self.due)
+        rewards = self.__rewards
+        rewards[:] = 0
+        # 不花时间的动作当场执行，其余的等到它们的tick
+        self.__run_due(over)
+        self.now += ~over
+        self.__run_due(over)
+        # 和Game一样，击杀在tick末尾才处理，同一tick里血量见底的机器人照样行动
+        dying = self.alive & (self.hp <= 0)
+        if dying.any():
+            self.alive[dying] = False
+            self.pending[dying] = IDLE
+        dones = self.__over() & ~over
+        info = {"ticks": self.now.copy()}
+        if self.auto_reset and dones.any():
+            self.reset(dones)
+        info["ready"] = (self.pending == IDLE) & self.alive
+        return self.observe(), rewards.copy(), dones, info
+
+    def __over(self) -> np.ndarray:
+        return (self.alive.sum(axis=1) <= 1) | (self.now >= self.timeout)
+
+    def __run_due(self, over: np.ndarray):
+        for r in range(self.robots):
+            due = (self.pending[:, r] != IDLE) & (self.due[:, r] <= self.now) & self.alive[:, r] & ~over
+            if not due.any():
+                continue
+            action = np.where(due, self.pending[:, r], IDLE)
+            self.pending[due, r] = IDLE
+            self.__move(r, action)
+            self.__turn(r, action)
+            self.__attack(r, action == ATTACK)
+
+    def __move(self, r: int, action: np.ndarray):
+        moving = (action >= MOVE_FORWARD) & (action <= MOVE_DOWNWARD)
+        if not moving.any():
+            return
+        arenas = np.flatnonzero(moving)
+        action = action[arenas, None]
+        direction = self.direction[arenas, r]
+        delta = np.where(action == MOVE_FORWARD, direction,
+                         np.where(action == MOVE_BACKWARD, -direction,
+                                  np.where(action == MOVE_UPWARD, _UP, -_UP)))
+        target = self.location[arenas, r] + delta
+        inside = np.all(np.abs(target) <= self.half, axis=1)
+        others = self.alive[arenas].copy()
+        others[:, r] = False
+        taken = np.any(np.all(self.location[arenas] == target[:, None], axis=2) & others, axis=1)
+        free = inside & ~taken
+        self.location[arenas[free], r] = target[free]
+
+    def __turn(self, r: int, action: np.ndarray):
+        for code, offset in ((ROTATE_LEFT, (0, 0, 1)), (ROTATE_RIGHT, (0, 0, -1))):
+            turning = action == code
+            if turning.any():
+                self.direction[turning, r] = _rotate(self.direction[turning, r], np.array(offset))
+
+    def __attack(self, r: int, attacking: np.ndarray):
+        if not attacking.any():
+            return
+        arenas = np.flatnonzero(attacking)
+        facing = self.location[arenas, r] + self.direction[arenas, r]
+        hit = np.all(self.location[arenas] == facing[:, None], axis=2) & self.alive[arenas]
+        hit[:, r] = False
+        struck = hit.any(axis=1)
+        if not struck.any():
+            return
+        arenas, victims = arenas[struck], hit[struck].argmax(axis=1)
+        # 对方和自己朝向相同就是背刺
+        back = np.all(self.direction[arenas, victims] == self.direction[arenas, r], axis=1).astype(np.int64)
+        harm = self.attack[r, back] / self.defense[victims, back]
+        before = self.hp[arenas, victims]
+        self.hp[arenas, victims] = before - harm
+        self.__rewards[arenas, r] += harm
+        self.__rewards[arenas, victims] -= harm
+        self.__rewards[arenas, r] += self.kill_reward * ((before > 0) & (before - harm <= 0))
+
+    def observe(self) -> np.ndarray:
+        location, direction = self.location, self.direction
+        origin = direction[:, :, None, :]
+        obs = np.empty((self.arenas, self.robots, self.robots, FEATURES), dtype=np.float32)
+        obs[..., 0:3] = _rotate(location[:, None, :, :] - location[:, :, None, :], origin)
+        obs[..., 3:6] = _rotate(np.broadcast_to(direction[:, None, :, :], obs.shape[:3] + (3,)), origin)
+        obs[..., 6] = self.hp[:, None, :]
+        obs[..., 7] = self.alive[:, None, :]
+        own = self.__robot_index
+        obs[:, own, own, 0:3] = location
+        obs[:, own, own, 3:6] = direction
+        return obs
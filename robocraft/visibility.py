@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .entities import EntityStore
+
+
+class Visibility:
+    """Which entities each robot can sense, kept up to date incrementally.
+
+    - `forward`: entities ahead, `0 < relative @ direction <= fog`.
+    - `around`: entities within `surrounding` (euclidean) of the robot.
+
+    Players are tracked in per-robot sets that only change when a player
+    moves or turns, and then only the pairs involving that player are
+    recomputed. Everything else (walls) never moves, so it is looked up
+    through per-axis sorted indexes and cached per robot until that robot
+    moves or turns.
+    """
+
+    def __init__(self, store: EntityStore, fog: float, surrounding: float):
+        self.__store = store
+        self.fog = fog
+        self.surrounding = surrounding
+        self.__players: List[int] = []
+        self.__forward: Dict[int, Set[int]] = {}
+        self.__around: Dict[int, Set[int]] = {}
+        self.__static: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        # 每个坐标轴上静态实体按坐标排好序：(坐标, 行号)
+        self.__index: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
+        self.__indexed = 0
+
+    def add_player(self, i: int):
+        self.__players.append(i)
+        self.__forward[i] = set()
+        self.__around[i] = set()
+        self.moved(i)
+
+    def moved(self, i: int):
+        """Player `i` changed location."""
+        others, relative = self.__relative(i)
+        ahead = relative @ self.__store.direction[i]
+        in_forward = (ahead > 0) & (ahead <= self.fog)
+        in_around = np.einsum("ij,ij->i", relative, relative) <= self.surrounding * self.surrounding
+        # 从对方的角度看自己在不在它前方
+        behind = np.einsum("ij,ij->i", -relative, self.__store.direction[others])
+        seen_forward = (behind > 0) & (behind <= self.fog)
+        self.__forward[i] = set(others[in_forward].tolist())
+        self.__around[i] = set(others[in_around].tolist())
+        for other, forward, around in zip(others.tolist(), seen_forward.tolist(), in_around.tolist()):
+            (self.__forward[other].add if forward else self.__forward[other].discard)(i)
+            (self.__around[other].add if around else self.__around[other].discard)(i)
+        self.__static.pop(i, None)
+
+    def turned(self, i: int):
+        """Player `i` changed direction."""
+        others, relative = self.__relative(i)
+        ahead = relative @ self.__store.direction[i]
+        self.__forward[i] = set(others[(ahead > 0) & (ahead <= self.fog)].tolist())
+        self.__static.pop(i, None)
+
+    def forward(self, i: int) -> np.ndarray:
+        """Rows ahead of player `i`, ascending."""
+        return self.__rows(self.__static_rows(i)[0], self.__forward[i])
+
+    def around(self, i: int) -> np.ndarray:
+        """Rows around player `i`, ascending."""
+        return self.__rows(self.__static_rows(i)[1], self.__around[i])
+
+    @staticmethod
+    def __rows(static: np.ndarray, players: Set[int]) -> np.ndarray:
+        if not players:
+            return static
+        return np.sort(np.concatenate([static, np.fromiter(players, dtype=np.int64, count=len(players))]))
+
+    def __relative(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        players = np.array(self.__players, dtype=np.int64)
+        others = players[players != i]
+        location = self.__store.location
+        return others, location[others] - location[i]
+
+    def __static_rows(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self.__static.get(i)
+        if cached is None or self.__indexed != len(self.__store) - len(self.__players):
+            cached = self.__static[i] = (self.__static_forward(i), self.__static_around(i))
+        return cached
+
+    def __axis_index(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        store = self.__store
+        static = len(store) - len(self.__players)
+        if self.__index is None or self.__indexed != static:
+            is_static = np.ones(len(store), dtype=bool)
+            is_static[self.__players] = False
+            rows = np.flatnonzero(is_static)
+            self.__index = []
+            for axis in range(3):
+                coordinates = store.location[rows, axis]
+                order = np.argsort(coordinates, kind="stable")
+                self.__index.append((coordinates[order], rows[order]))
+            self.__indexed = static
+            self.__static.clear()
+        return self.__index
+
+    def __slab(self, axis: int, low: int, high: int) -> np.ndarray:
+        """Static rows whose coordinate on `axis` is in [low, high]."""
+        coordinates, rows = self.__axis_index()[axis]
+        start = np.searchsorted(coordinates, low, side="left")
+        stop = np.searchsorted(coordinates, high, side="right")
+        return rows[start:stop]
+
+    def __static_forward(self, i: int) -> np.ndarray:
+        store = self.__store
+        location, direction = store.location[i], store.direction[i]
+        axes = np.flatnonzero(direction)
+        fog = int(np.floor(self.fog))
+        if len(axes) == 1 and abs(direction[axes[0]]) == 1:
+            axis = axes[0]
+            if direction[axis] > 0:
+                rows = self.__slab(axis, location[axis] + 1, location[axis] + fog)
+            else:
+                rows = self.__slab(axis, location[axis] - fog, location[axis] - 1)
+        else:
+            rows = self.__axis_index()[0][1]
+            ahead = (store.location[rows] - location) @ direction
+            rows = rows[(ahead > 0) & (ahead <= self.fog)]
+        return np.sort(rows)
+
+    def __static_around(self, i: int) -> np.ndarray:
+        location = self.__store.location[i]
+        reach = int(np.floor(self.surrounding))
+        rows = self.__slab(0, location[0] - reach, location[0] + reach)
+        relative = self.__store.location[rows] - location
+        rows = rows[np.einsum("ij,ij->i", relative, relative) <= self.surrounding * self.surrounding]
+        return np.sort(rows)
@@ -0,0 +1,435 @@
+"""
+Robots running in their own worker processes.
+
+..  code-block::python
+
+    game = Game()
+    game.register(RemoteRobot("bots.mine:MyBot"))
+    game.register(RemoteRobot(OtherBot))
+    game.run()
+
+The robot class is imported and run in a separate process, so heavy
+strategy code runs on its own core and never blocks the game loop, and the
+robot never holds the real `Game`. Its API calls travel as small tuples over
+a pipe. World state is published every tick (and before every reply) into a
+shared-memory snapshot, from which the worker answers `getStatus` and the
+other free getters without a round trip.
+
+In headless mode the virtual clock is held while a worker is busy, so time
+only jumps ahead once every worker is waiting on the game.
+"""
+import asyncio
+import inspect
+import multiprocessing
+from multiprocessing import shared_memory
+import selectors
+from typing import Dict, Optional, Union
+from uuid import UUID
+import weakref
+
+import numpy as np
+
+from . import env
+from .entities import Entity, EntityStore
+from .game import STATUS_FIELDS
+from .metrics import Metrics
+from .recording import API_IDS, APIS
+from .robot import Robot
+from .tournament import load_robot, robot_spec
+from .utils.property import PropertyView
+from .utils.vector import Vector
+
+
+# 消息类型
+START, REQUEST, RESULT, ERROR, EVENT, IDLE, STOP = range(7)
+
+HEADER = np.dtype([("sequence", "<i8"), ("tick", "<i8"), ("count", "<i8"), ("version", "<i8")])
+
+
+class Snapshot:
+    """Entity columns of a game in shared memory, guarded by a seqlock.
+
+    The writer makes `sequence` odd while it writes and even afterwards; a
+    reader retries until it sees the same even sequence before and after
+    copying.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, count: int):
+        self.memory = memory
+        self.count = count
+        buffer, offset = memory.buf, 0
+        self.header = np.ndarray((), HEADER, buffer, offset)
+        offset += HEADER.itemsize
+        self.location = np.ndarray((count, 3), np.int32, buffer, offset)
+        offset += self.location.nbytes
+        self.hp = np.ndarray(count, np.float64, buffer, offset)
+        offset += self.hp.nbytes
+        self.direction = np.ndarray((count, 3), np.int8, buffer, offset)
+        offset += self.direction.nbytes
+        self.alive = np.ndarray(count, np.bool_, buffer, offset)
+
+    @staticmethod
+    def nbytes(count: int) -> int:
+        return HEADER.itemsize + count * (3 * 4 + 8 + 3 + 1)
+
+    @classmethod
+    def create(cls, count: int) -> "Snapshot":
+        return cls(shared_memory.SharedMemory(create=True, size=cls.nbytes(count)), count)
+
+    @classmethod
+    def attach(cls, name: str, count: int) -> "Snapshot":
+        # spawn出来的工作进程和主进程共用一个resource_tracker，重复登记没有影响，
+        # 回收只由创建者在close之后unlink
+        return cls(shared_memory.SharedMemory(name=name), count)
+
+    def write(self, store: EntityStore, rows, tick: int, version: int):
+        header = self.header
+        header["sequence"] += 1
+        self.location[rows] = store.location[rows]
+        self.direction[rows] = store.direction[rows]
+        self.hp[rows] = store.hp[rows]
+        self.alive[rows] = store.alive[rows]
+        header["tick"], header["count"], header["version"] = tick, len(store), version
+        header["sequence"] += 1
+
+    def read(self, i: int):
+        """Location, direction, hp and alive of row `i`, consistently."""
+        header = self.header
+        while True:
+            sequence = int(header["sequence"])
+            if sequence % 2:
+                continue
+            row = (Vector(*self.location[i].tolist()), Vector(*self.direction[i].tolist()),
+                   float(self.hp[i]), bool(self.alive[i]))
+            if int(header["sequence"]) == sequence:
+                return row
+
+    def close(self):
+        # 释放numpy视图之后才能关闭共享内存
+        del self.header, self.location, self.hp, self.direction, self.alive
+        self.memory.close()
+
+
+class _Publisher:
+    """Host side of the snapshot of one game."""
+
+    def __init__(self, game):
+        self.game = game
+        store = game.store
+        self.snapshot = Snapshot.create(len(store))
+        self.players = np.array([i for i in range(len(store)) if store.type_of(i) is Entity.Player], dtype=np.int64)
+        self.snapshot.write(store, slice(None, len(store)), game.clock.now, game.version)
+        self.version = game.version
+        self.workers = 0
+        game.tick_hooks.append(self.flush)
+
+    def flush(self):
+        # 墙不会动，只需要重写玩家的行
+        if self.game.version != self.version:
+            self.version = self.game.version
+            self.snapshot.write(self.game.store, self.players, self.game.clock.now, self.version)
+
+    def close(self):
+        self.workers -= 1
+        if not self.workers:
+            self.game.tick_hooks.remove(self.flush)
+            self.snapshot.close()
+            self.snapshot.memory.unlink()
+            del _publishers[self.game]
+
+
+_publishers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class _ForwardingEvents:
+    """Robot events on the host that are also sent to the worker."""
+
+    def __init__(self, events, send):
+        self.__events = events
+        self.__send = send
+
+    def fire(self, event, *args, **kwargs):
+        self.__events.fire(event, *args, **kwargs)
+        self.__send((EVENT, event, args, kwargs))
+
+    def __getattr__(self, key):
+        return getattr(self.__events, key)
+
+
+class RemoteRobot(Robot):
+    """Host-side stand-in for a robot that runs in a worker process.
+
+    :param robot: the robot class, or its `module:QualName`; it must be
+        importable by the worker
+    """
+
+    def __init__(self, robot: Union[type, str]):
+        super().__init__()
+        self.spec = robot_spec(robot)
+        self.components = load_robot(self.spec).components
+        self.events = _ForwardingEvents(self.events, self.__send)
+        self.__connection = None
+        self.__process = None
+        self.__busy = False
+
+    def main(self):
+        game = self.game = env.game.get()
+        self.__entity = game.entities.get_or_create(self.uuid)
+        publisher = _publishers.get(game)
+        if publisher is None:
+            publisher = _publishers[game] = _Publisher(game)
+        publisher.workers += 1
+        self.__publisher = publisher
+        context = multiprocessing.get_context("spawn")
+        self.__connection, child = context.Pipe()
+        store, i = game.store, self.__entity.id
+        info = {
+            "uuid": self.uuid,
+            "id": i,
+            "snapshot": (publisher.snapshot.memory.name, publisher.snapshot.count),
+            "properties": store.properties[i],
+            "enhancements": store.enhancements[i],
+            "timeCosts": store.timeCosts[i],
+            "ticks": dict(store.ticks[i]),
+            "size": game.getSize(self.__entity),
+        }
+        self.__process = context.Process(target=_worker_main, args=(self.spec, child, info), daemon=True)
+        self.__process.start()
+        child.close()
+        return asyncio.ensure_future(self.__serve_worker())
+
+    def __send(self, message):
+        if self.__connection is None:
+            return
+        if not self.__busy:
+            # 工作进程处理完消息之前，虚拟时钟不能往前跳
+            self.__busy = True
+            self.game.clock.hold()
+        self.__connection.send(message)
+
+    def __idle(self):
+        if self.__busy:
+            self.__busy = False
+            self.game.clock.release()
+
+    async def __serve_worker(self):
+        loop = asyncio.get_running_loop()
+        closed = loop.create_future()
+        loop.add_reader(self.__connection.fileno(), self.__receive, closed)
+        try:
+            self.__send((START,))
+            await closed
+        finally:
+            loop.remove_reader(self.__connection.fileno())
+            self.__idle()
+            try:
+                self.__connection.send((STOP,))
+            except (BrokenPipeError, OSError):
+                pass
+            self.__connection.close()
+            self.__connection = None
+            self.__process.join(1)
+            if self.__process.is_alive():
+                self.__process.terminate()
+            self.__publisher.close()
+
+    def __receive(self, closed: asyncio.Future):
+        try:
+            message = self.__connection.recv()
+        except (EOFError, OSError):
+            if not closed.done():
+                closed.set_result(None)
+            return
+        if message[0] == REQUEST:
+            _, seq, api, args, kwargs = message
+            asyncio.ensure_future(self.__call(seq, APIS[api], args, kwargs))
+        elif message[0] == IDLE:
+            self.__idle()
+
+    async def __call(self, seq: int, name: str, args, kwargs):
+        try:
+            result = getattr(self.game, name)(self.__entity, *args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            reply = (RESULT, seq, result)
+        except Exception as e:
+            reply = (ERROR, seq, e)
+        self.__publisher.flush()
+        self.__send(reply)
+
+
+# ====================== worker process ===================== #
+
+
+class _IdleSelector(selectors.DefaultSelector):
+    """Tells the host when the worker has nothing left to run."""
+
+    def __init__(self, connection):
+        super().__init__()
+        self.connection = connection
+        self.busy = True
+
+    def select(self, timeout=None):
+        if self.busy and (timeout is None or timeout > 0):
+            self.busy = False
+            try:
+                self.connection.send((IDLE,))
+            except OSError:
+                pass
+        return super().select(timeout)
+
+
+class _ClientEntity:
+    __slots__ = ("id", "uuid")
+
+    def __init__(self, id: int, uuid: UUID):
+        self.id = id
+        self.uuid = uuid
+
+
+class _ClientEntities:
+    def __init__(self, entity: _ClientEntity):
+        self.__entity = entity
+
+    def get_or_create(self, uuid, *args, **kwargs):
+        return self.__entity
+
+
+class _ClientClock:
+    def __init__(self, client: "GameClient"):
+        self.__client = client
+
+    @property
+    def now(self) -> int:
+        return int(self.__client.snapshot.header["tick"])
+
+    async def sleep(self, ticks: int):
+        await self.__client.call("halt", (ticks,), {})
+
+
+class GameClient:
+    """What `env.game` is inside a worker: forwards API calls to the host.
+
+    The getters that cost no ticks are answered from the shared snapshot and
+    the robot's loadout, which is fixed for the match.
+    """
+
+    recorder = None
+
+    def __init__(self, connection, info: dict, selector: _IdleSelector):
+        self.__connection = connection
+        self.__selector = selector
+        self.__info = info
+        self.__futures: Dict[int, asyncio.Future] = {}
+        self.__seq = 0
+        self.snapshot = Snapshot.attach(*info["snapshot"])
+        self.entities = _ClientEntities(_ClientEntity(info["id"], info["uuid"]))
+        self.clock = _ClientClock(self)
+        self.metrics = Metrics()
+        self.robot: Optional[Robot] = None
+        self.stopped = asyncio.get_event_loop().create_future()
+
+    def is_ready(self) -> bool:
+        return True
+
+    async def started(self):
+        pass
+
+    def call(self, name: str, args, kwargs) -> asyncio.Future:
+        self.__seq += 1
+        future = self.__futures[self.__seq] = asyncio.get_event_loop().create_future()
+        self.__connection.send((REQUEST, self.__seq, API_IDS[name], args, kwargs))
+        return future
+
+    def receive(self):
+        self.__selector.busy = True
+        try:
+            message = self.__connection.recv()
+        except (EOFError, OSError):
+            message = (STOP,)
+        kind = message[0]
+        if kind == START:
+            self.robot.main()
+        elif kind == RESULT:
+            self.__futures.pop(message[1]).set_result(message[2])
+        elif kind == ERROR:
+            self.__futures.pop(message[1]).set_exception(message[2])
+        elif kind == EVENT:
+            _, event, args, kwargs = message
+            self.robot.events.fire(event, *args, **kwargs)
+        elif kind == STOP and not self.stopped.done():
+            self.stopped.set_result(None)
+
+    def __getattr__(self, name):
+        if name not in API_IDS:
+            raise AttributeError(name)
+
+        async def remote(entity, *args, **kwargs):
+            return await self.call(name, args, kwargs)
+        return remote
+
+    # ------------------- answered locally ------------------- #
+
+    def __own(self):
+        return self.snapshot.read(self.__info["id"])
+
+    def getStatus(self, entity, fields=None):
+        if self.__info["ticks"].get("getStatus"):
+            return self.call("getStatus", (), {"fields": fields})
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(self.__status(fields))
+        return future
+
+    def __status(self, fields=None) -> dict:
+        # 和Game._get_relative_status(player, player)的结果一致
+        _, direction, hp, alive = self.__own()
+        info = self.__info
+        known = {
+            "type": lambda: Entity.Player,
+            "uuid": lambda: info["uuid"],
+            "enhancements": lambda: PropertyView(info["enhancements"]),
+            "timeCosts": lambda: PropertyView(info["timeCosts"]),
+            "properties": lambda: PropertyView(info["properties"], hp=hp),
+            "location": lambda: Vector(0, 0, 0),
+            "direction": lambda: direction * direction,
+            "alive": lambda: alive,
+            "hp": lambda: hp,
+        }
+        return {
+            field: known[field]() if field in known else getattr(info["properties"], field)
+            for field in fields or STATUS_FIELDS
+        }
+
+    def getProperties(self, entity):
+        return PropertyView(self.__info["properties"], hp=self.__own()[2])
+
+    def getEnhancements(self, entity):
+        return PropertyView(self.__info["enhancements"])
+
+    def getTimeCosts(self, entity):
+        return PropertyView(self.__info["timeCosts"])
+
+    def getSize(self, entity):
+        return self.__info["size"]
+
+
+def _worker_main(spec: str, connection, info: dict):
+    selector = _IdleSelector(connection)
+    loop = asyncio.SelectorEventLoop(selector)
+    asyncio.set_event_loop(loop)
+    client = GameClient(connection, info, selector)
+    # 和主进程里的替身用同一个uuid，感知到的uuid才对得上
+    client.robot = load_robot(spec).with_uuid(info["uuid"])
+    env.game.set(client)
+    loop.add_reader(connection.fileno(), client.receive)
+    try:
+        loop.run_until_complete(client.stopped)
+    finally:
+        loop.remove_reader(connection.fileno())
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        client.snapshot.close()
+        loop.close()
+        connection.close()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from robocraft.display.geometry import CUBE, RobotBuffer, arena_faces
+from robocraft.entities import Entity
+from robocraft.game import Game
+from robocraft.robot import Robot
+from robocraft.utils.vector import Vector
+
+
+class ArenaFacesTest(unittest.TestCase):
+    def test_faces(self):
+        faces = arena_faces(13, 3, 7)
+        self.assertIs(faces, arena_faces(13, 3, 7))
+        self.assertEqual(len(faces), 6)
+        for face in faces:
+            self.assertEqual(face.vertices.shape, (6, 3))
+            self.assertFalse(face.vertices.flags.writeable)
+            # 法线朝向房间内部，三角形从内部看是逆时针
+            normal = face.normals[0]
+            self.assertLess(face.vertices[0] @ normal, 0)
+            for triangle in face.vertices.reshape(2, 3, 3):
+                self.assertGreater(np.cross(triangle[1] - triangle[0], triangle[2] - triangle[0]) @ normal, 0)
+        left = faces[0]
+        self.assertTrue(np.all(left.vertices[:, 0] == -6.5))
+        self.assertEqual(left.texcoords.max(axis=0).tolist(), [3, 7])
+
+    def test_size_independent(self):
+        small, large = arena_faces(13, 3, 7), arena_faces(1000, 10, 1000)
+        self.assertEqual([len(f.vertices) for f in small], [len(f.vertices) for f in large])
+
+
+class RobotBufferTest(unittest.TestCase):
+    def test_update_only_changed(self):
+        game = Game()
+        robots = [Robot() for _ in range(3)]
+        for robot in robots:
+            game.register(robot)
+        players = [game.entities.get_or_create(robot.uuid) for robot in robots]
+        buffer = RobotBuffer(capacity=2)
+        buffer.update_from_store(game.store, range(len(game.store)), Entity.Player)
+        self.assertEqual(buffer.capacity, 4)
+        self.assertEqual(buffer.take_dirty(), (0, 3 * len(CUBE)))
+        self.assertIsNone(buffer.take_dirty())
+        changes, other = game.track_changes(), game.track_changes()
+        game._set_status(players[1], "location", Vector(0, 0, 0))
+        buffer.update_from_store(game.store, changes.pop(), Entity.Player)
+        self.assertEqual(buffer.take_dirty(), (len(CUBE), 2 * len(CUBE)))
+        cube = buffer.vertices[len(CUBE):2 * len(CUBE)]
+        np.testing.assert_array_equal(cube, CUBE)
+        game._set_status(players[1], "alive", False)
+        buffer.update_from_store(game.store, changes.pop(), Entity.Player)
+        # 另一个消费者的变化集合不受影响
+        self.assertEqual(other.pop(), {players[1].id})
+        game.untrack_changes(other)
+        self.assertTrue(np.all(buffer.vertices[len(CUBE):2 * len(CUBE)] == 0))
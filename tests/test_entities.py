@@ -0,0 +1,33 @@
+import unittest
+from uuid import uuid4
+
+from robocraft.entities import Entity, EntityFactory, EntityStore
+
+
+class EntityFactoryTest(unittest.TestCase):
+    def test_ids(self):
+        factory = EntityFactory()
+        walls = [factory.create(Entity.Wall) for _ in range(3)]
+        uuid = uuid4()
+        player = factory.get_or_create(uuid, Entity.Player, None)
+        self.assertEqual([wall.id for wall in walls] + [player.id], [0, 1, 2, 3])
+        self.assertIs(factory.get_or_create(uuid), player)
+        self.assertIsNone(walls[0].uuid)
+        self.assertEqual(list(factory.keys()), [uuid])
+        self.assertEqual(len(factory), 4)
+        with self.assertRaises(KeyError):
+            factory.get_or_create(uuid4())
+
+    def test_slots(self):
+        wall = EntityFactory().create(Entity.Wall)
+        with self.assertRaises(AttributeError):
+            wall.name = "wall"
+        self.assertNotEqual(wall, Entity.Wall())
+        self.assertEqual(len({wall, wall}), 1)
+
+    def test_store_order(self):
+        factory, store = EntityFactory(), EntityStore()
+        first, second = factory.create(Entity.Wall), factory.create(Entity.Wall)
+        with self.assertRaises(ValueError):
+            store.add(second, (0, 0, 0))
+        self.assertEqual(store.add(first, (0, 0, 0)), 0)
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+
+from robocraft.events import DROP_NEWEST, EventHandler
+
+
+class EventHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+
+    async def handler(self, *args, **kwargs):
+        self.received.append((args, kwargs))
+
+    def test_poll(self):
+        events = EventHandler()
+        events.register("a", self.handler)
+        events.fire("a", 1, x=2)
+        asyncio.run(events.poll())
+        self.assertEqual(self.received, [((1,), {"x": 2})])
+        self.assertEqual(len(events), 0)
+        self.assertEqual(events.stats["dispatched"], 1)
+
+    def test_bounded(self):
+        events = EventHandler(maxlen=2)
+        events.register("a", self.handler)
+        for i in range(5):
+            events.fire("a", i)
+        asyncio.run(events.poll())
+        self.assertEqual([args for args, _ in self.received], [(3,), (4,)])
+        self.assertEqual(events.stats["dropped"], 3)
+
+        self.received.clear()
+        events = EventHandler(maxlen=2, overflow=DROP_NEWEST)
+        events.register("a", self.handler)
+        for i in range(5):
+            events.fire("a", i)
+        asyncio.run(events.poll())
+        self.assertEqual([args for args, _ in self.received], [(0,), (1,)])
+
+    def test_coalesce(self):
+        events = EventHandler()
+        events.register("attacked", self.handler)
+        events.coalesce("attacked", lambda old, new: dict(new, harm=old["harm"] + new["harm"]))
+        events.fire("attacked", harm=1.0)
+        events.fire("attacked", harm=2.0)
+        self.assertEqual(len(events), 1)
+        asyncio.run(events.poll())
+        events.fire("attacked", harm=4.0)
+        asyncio.run(events.poll())
+        self.assertEqual([kwargs["harm"] for _, kwargs in self.received], [3.0, 4.0])
+        self.assertEqual(events.stats["coalesced"], 1)
+
+    def test_priority(self):
+        events = EventHandler()
+        events.register("a", self.handler)
+        events.register("b", self.handler)
+        events.set_priority("b", 1)
+        events.fire("a", "a")
+        events.fire("b", "b")
+        asyncio.run(events.poll())
+        self.assertEqual([args for args, _ in self.received], [("b",), ("a",)])
+
+    def test_budget(self):
+        events = EventHandler()
+        finished = []
+
+        async def slow():
+            await asyncio.sleep(10)
+            finished.append("slow")
+
+        async def fast():
+            finished.append("fast")
+
+        events.register("a", slow)
+        events.register("a", fast)
+        events.fire("a")
+
+        async def main():
+            await events.poll(budget=0.01)
+            return list(finished)
+
+        self.assertEqual(asyncio.run(main()), ["fast"])
+
+    def test_failing_handlers(self):
+        events = EventHandler()
+
+        async def fail(name, delay=0):
+            await asyncio.sleep(delay)
+            raise RuntimeError(name)
+
+        events.register("a", lambda: fail("first"))
+        events.register("a", lambda: fail("second"))
+        events.register("a", lambda: fail("late", 0.02))
+        events.fire("a")
+
+        async def main():
+            with self.assertRaisesRegex(RuntimeError, "first"):
+                await events.poll(budget=0.01)
+            await asyncio.sleep(0.05)
+
+        with self.assertLogs("robocraft.events", "ERROR") as logs:
+            asyncio.run(main())
+        self.assertEqual([record.exc_info[1].args[0] for record in logs.records], ["second", "late"])
@@ -0,0 +1,246 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from robocraft.clock import VirtualClock
+from robocraft.entities import Entity
+from robocraft.game import Game
+from robocraft.robot import Robot
+from robocraft.utils.vector import Vector
+
+
+class Brawler(Robot):
+    async def run(self):
+        while True:
+            await self.moveForward()
+            await self.attack()
+
+
+class GameTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.robots = [Robot(), Robot()]
+        for robot in self.robots:
+            self.game.register(robot)
+        self.players = [self.game.entities.get_or_create(robot.uuid) for robot in self.robots]
+
+    def test_has_entity(self):
+        for player in self.players:
+            location = self.game._get_status(player, "location")
+            self.assertIs(self.game._has_entity(location), player)
+        self.assertIsNone(self.game._has_entity(Vector(0, 0, 0)))
+        self.assertIsInstance(self.game._has_entity(Vector(0, 0, self.game.width // 2 + 1)), Entity.Wall)
+        self.assertIs(self.game._has_entity(Vector(0, 0, self.game.width)), Entity.Wall)
+
+    def test_walls(self):
+        store = self.game.store
+        walls = [store.location[i].tolist() for i in range(len(store)) if store.type_of(i) is Entity.Wall]
+        self.assertEqual(len(walls), len(set(map(tuple, walls))))
+        l, h, w = self.game.length // 2 + 1, self.game.height // 2 + 1, self.game.width // 2 + 1
+        self.assertEqual(len(walls), (2 * l + 1) * (2 * h + 1) * (2 * w + 1) - (2 * l - 1) * (2 * h - 1) * (2 * w - 1))
+
+    def test_occupancy_follows_moves(self):
+        player = self.players[0]
+        location = self.game._get_status(player, "location")
+        new_location = location + Vector(1, 0, 0)
+        self.game._set_status(player, "location", new_location)
+        self.assertIsNone(self.game._has_entity(location))
+        self.assertIs(self.game._has_entity(new_location), player)
+
+    def sense(self, api, player):
+        sensed = asyncio.run(getattr(self.game, api)(player))
+        return [status for status in sensed if status["type"] is Entity.Player]
+
+    def test_sense(self):
+        me, other = self.players
+        self.assertEqual(self.sense("senseForward", me), [])
+        self.game._set_status(other, "location", Vector(0, 0, -1))
+        sensed = self.sense("senseForward", me)
+        self.assertEqual(len(sensed), 1)
+        self.assertEqual(sensed[0]["location"], Vector(4, 0, 0))
+        self.assertEqual(sensed[0]["direction"], Vector.BACKWARD)
+        self.assertEqual(sensed[0]["uuid"], self.robots[1].uuid)
+        self.assertEqual(self.sense("senseSurroundings", me), [])
+        self.game._set_status(other, "location", Vector(1, 0, 2))
+        sensed = self.sense("senseSurroundings", me)
+        self.assertEqual([s["location"] for s in sensed], [Vector(1, 0, 1)])
+
+    def test_status_snapshot(self):
+        me, other = self.players
+        status = asyncio.run(self.game.getStatus(me))
+        properties = status["properties"]
+        with self.assertRaises(AttributeError):
+            properties.hp = 100.0
+        self.game._set_status(me, "hp", 1.0)
+        self.game._set_status(me, "mp", 1.0)
+        self.assertEqual(properties.hp, 10.0)
+        self.assertEqual(properties.mp, 10.0)
+        self.assertEqual(self.game.getProperties(me).mp, 1.0)
+        self.assertEqual(asyncio.run(self.game.getStatus(me, fields=("hp", "location"))),
+                         {"hp": 1.0, "location": Vector(0, 0, 0)})
+
+
+class RoomTest(unittest.TestCase):
+    def test_spawn_many(self):
+        game = Game(headless=True, room={"length": 5, "width": 3, "height": 1}, timeout=1)
+        robots = [Robot() for _ in range(15)]
+        for robot in robots:
+            game.register(robot)
+        locations = {game._get_status(game.entities.get_or_create(robot.uuid), "location") for robot in robots}
+        self.assertEqual(len(locations), 15)
+        self.assertEqual(game.getSize(None), (5, 1, 3))
+        with self.assertRaises(ValueError):
+            game.register(Robot())
+
+
+class VisibilityTest(unittest.TestCase):
+    def brute_force(self, game, player, api):
+        store, me = game.store, player.id
+        relative = store.location[:len(store)] - store.location[me]
+        if api == "senseForward":
+            distance = relative @ store.direction[me]
+            mask = (distance > 0) & (distance <= game.visibility.fog)
+        else:
+            mask = np.einsum("ij,ij->i", relative, relative) <= game.visibility.surrounding ** 2
+            mask[me] = False
+        return [store.entities[row] for row in np.flatnonzero(mask)]
+
+    def test_incremental(self):
+        game = Game(room={"length": 9, "width": 9, "height": 3})
+        robots = [Robot() for _ in range(12)]
+        for robot in robots:
+            game.register(robot)
+        players = [game.entities.get_or_create(robot.uuid) for robot in robots]
+        random = np.random.default_rng(0)
+        for step in range(200):
+            player = players[random.integers(len(players))]
+            if random.random() < 0.3:
+                game._set_status(player, "direction", Vector.AXES[random.choice([0, 1, 4, 5])])
+            else:
+                location = game._get_status(player, "location") + Vector.AXES[random.integers(6)]
+                if not game._has_entity(location):
+                    game._set_status(player, "location", location)
+            for api, visible in (("senseForward", game.visibility.forward), ("senseSurroundings", game.visibility.around)):
+                for other in players[:3]:
+                    self.assertEqual([game.store.entities[row] for row in visible(other.id)],
+                                     self.brute_force(game, other, api))
+
+    def test_cached(self):
+        game = Game()
+        robots = [Robot(), Robot()]
+        for robot in robots:
+            game.register(robot)
+        me, other = (game.entities.get_or_create(robot.uuid) for robot in robots)
+        first = asyncio.run(game.senseSurroundings(me))
+        second = asyncio.run(game.senseSurroundings(me))
+        self.assertEqual(first, second)
+        self.assertIsNot(first[0], second[0])
+        game._set_status(other, "location", game._get_status(me, "location") + Vector(0, 0, 1))
+        third = asyncio.run(game.senseSurroundings(me))
+        self.assertIn(robots[1].uuid, [status["uuid"] for status in third])
+
+
+class PlanTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(headless=True)
+        self.robots = [Robot(), Robot()]
+        for robot in self.robots:
+            self.game.register(robot)
+        self.me, self.other = (self.game.entities.get_or_create(robot.uuid) for robot in self.robots)
+
+    def run_plan(self, *coroutines):
+        async def main():
+            return await asyncio.gather(*coroutines)
+
+        loop = self.game.clock.new_event_loop()
+        self.game.clock.start(loop)
+        try:
+            return loop.run_until_complete(main())[0]
+        finally:
+            loop.close()
+
+    def test_execute(self):
+        start = self.game._get_status(self.me, "location")
+        ticks = self.game.store.ticks[self.me.id]
+        result = self.run_plan(self.game.execute(self.me, ["moveForward", ("halt", 3), "rotateLeft", "moveForward"]))
+        self.assertEqual(result.completed, 4)
+        self.assertIsNone(result.aborted)
+        self.assertEqual(result.results, [True, None, None, True])
+        direction = Vector.LEFT * Vector.RIGHT
+        self.assertEqual(self.game._get_status(self.me, "location"), start + Vector.LEFT + direction)
+        self.assertEqual(self.game.clock.now, 2 * ticks["moveForward"] + ticks["rotateLeft"] + 3)
+
+    def test_abort(self):
+        async def attack():
+            await self.game.clock.sleep(5)
+            self.robots[0].events.fire("attacked", source=None, harm=1.0)
+
+        result = self.run_plan(self.game.execute(self.me, [("halt", 3)] * 10, abort=["attacked"]), attack())
+        self.assertEqual((result.completed, result.aborted), (2, "attacked"))
+        result = self.run_plan(self.game.execute(self.me, ["moveForward"] * 10, abort=["blocked"]))
+        self.assertEqual(result.aborted, "blocked")
+        self.assertEqual(result.results[-1], False)
+        with self.assertRaises(ValueError):
+            self.run_plan(self.game.execute(self.me, ["getStatus"]))
+        # 参数个数不对的计划一步都不执行
+        location, now = self.game._get_status(self.me, "location"), self.game.clock.now
+        for plan in (["rotateLeft", ("moveForward", 1)], ["rotateLeft", ("halt", 1, 2)], ["halt"]):
+            with self.assertRaises(ValueError):
+                self.run_plan(self.game.execute(self.me, plan))
+        self.assertEqual(self.game._get_status(self.me, "location"), location)
+        self.assertEqual(self.game.clock.now, now)
+
+
+class HeadlessTest(unittest.TestCase):
+    def play(self):
+        game = Game(headless=True)
+        robots = [Brawler(), Brawler()]
+        for robot in robots:
+            game.register(robot)
+        game.run()
+        players = [game.entities.get_or_create(robot.uuid) for robot in robots]
+        return game.clock.now, [(game._get_status(player, "hp"), game._get_status(player, "location"))
+                                for player in players]
+
+    def test_deterministic(self):
+        ticks, status = self.play()
+        self.assertGreater(ticks, 0)
+        self.assertEqual(self.play(), (ticks, status))
+
+    def test_loop_skips_idle_ticks(self):
+        game = Game(headless=True)
+        for robot in (Brawler(), Brawler()):
+            game.register(robot)
+        game.run()
+        self.assertLess(game.metrics.tick_lag.count, game.clock.now)
+        self.assertEqual(game.metrics.tick_lag.max, 0)
+
+
+class ClockTest(unittest.TestCase):
+    def test_wheel(self):
+        clock = VirtualClock(0.1)
+        loop = clock.new_event_loop()
+        woken = []
+
+        async def sleeper(name, ticks):
+            await clock.sleep(ticks)
+            woken.append((clock.now, name))
+
+        async def idler():
+            woken.append((await clock.idle(100), "idle"))
+            # 后来的sleep比等待的tick早，等待随之提前
+            waiting = asyncio.ensure_future(clock.idle(100))
+            await asyncio.sleep(0)
+            await clock.sleep(1)
+            woken.append((await waiting, "idle"))
+
+        async def main():
+            await asyncio.gather(sleeper("a", 5), sleeper("b", 3), idler(), sleeper("c", 3), sleeper("d", 5))
+
+        clock.start(loop)
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+        self.assertEqual(woken, [(3, "b"), (3, "c"), (3, "idle"), (4, "idle"), (5, "a"), (5, "d")])
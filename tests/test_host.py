@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from robocraft.game import Game
+from robocraft.host import MatchHost
+from robocraft.robot import Robot
+
+from tests.test_game import Brawler
+
+
+class Napper(Robot):
+    """Waits on plain asyncio timers between actions."""
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(0.5)
+            await self.moveForward()
+            await self.attack()
+
+
+def match(headless=True, robot=Brawler):
+    game = Game(headless=headless)
+    robots = [robot(), robot()]
+    for robot in robots:
+        game.register(robot)
+    return game, robots
+
+
+class MatchHostTest(unittest.TestCase):
+    def setUp(self):
+        self.host = MatchHost()
+        self.addCleanup(self.host.close)
+
+    def test_same_as_alone(self):
+        alone, robots = match()
+        alone.run()
+        expected = (alone.clock.now, sorted(tuple(score.values()) for score in alone.scoreboard().values()))
+        matches = [self.host.start(match()[0]) for _ in range(20)]
+        self.assertEqual([status.ticks for status in self.host.status()], [0] * 20)
+        finished = list(self.host.as_completed())
+        self.assertEqual(sorted(m.id for m in finished), [m.id for m in matches])
+        for m in matches:
+            self.assertEqual((m.ticks, sorted(tuple(score.values()) for score in m.result.values())), expected)
+        self.assertEqual(self.host.running(), [])
+
+    def test_asyncio_sleep_same_as_alone(self):
+        alone, _ = match(robot=Napper)
+        alone.run()
+        expected = (alone.clock.now, sorted(tuple(score.values()) for score in alone.scoreboard().values()))
+        self.assertTrue(any(score["kills"] for score in alone.scoreboard().values()))
+        # 每场比赛按自己的时钟计时，和主时钟、其他比赛无关
+        matches = [self.host.start(match(robot=Robot if i % 2 else Napper)[0]) for i in range(6)]
+        self.host.wait()
+        for m in matches[::2]:
+            self.assertEqual((m.ticks, sorted(tuple(score.values()) for score in m.result.values())), expected)
+
+    def test_cancel(self):
+        first, second = self.host.start(match()[0]), self.host.start(match()[0])
+        first.cancel()
+        self.assertEqual(self.host.wait([second]), [second])
+        self.assertTrue(first.done)
+        self.assertEqual(set(self.host.collect([second])), {second.id})
+        self.host.forget(first)
+        self.assertNotIn(first.id, self.host.matches)
+        with self.assertRaises(ValueError):
+            self.host.start(match(headless=False)[0])
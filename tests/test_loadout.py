@@ -0,0 +1,35 @@
+import unittest
+
+from robocraft.config import BASE_PROPERTIES, BASE_TIME_COSTS, COMPONENTS
+from robocraft.exceptions import CapacityExceed
+from robocraft.loadout import _compile, loadout
+
+
+class LoadoutTest(unittest.TestCase):
+    def test_tables(self):
+        self.assertEqual(COMPONENTS["Dagger"].properties.attack.back, 0.15)
+        self.assertEqual(COMPONENTS["HeavyArmor"].costs.weight, 30)
+        self.assertEqual(BASE_PROPERTIES.hp, 10.0)
+
+    def test_enhancement(self):
+        compiled = loadout(["LightSword", "SpeedCore"])
+        self.assertAlmostEqual(compiled.enhancement.attack.normal, 0.1)
+        self.assertAlmostEqual(compiled.enhancement.speed.moveForward, 0.15)
+        self.assertAlmostEqual(compiled.properties.attack.normal, 1.1)
+        self.assertAlmostEqual(compiled.timeCosts.moveForward, BASE_TIME_COSTS.moveForward / 2.15)
+        self.assertEqual(compiled.ticks["moveForward"], int(BASE_TIME_COSTS.moveForward / 2.15))
+        self.assertEqual(compiled.ticks["rotateLeft"], compiled.ticks["rotate"])
+
+    def test_cached(self):
+        _compile.cache_clear()
+        first = loadout(["LightArmor", "LightBoots", "LightArmor"])
+        second = loadout(["LightArmor", "LightArmor", "LightBoots"])
+        self.assertIs(first, second)
+        self.assertEqual(_compile.cache_info().hits, 1)
+        self.assertIsNot(loadout(["LightArmor", "LightBoots"]), first)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            loadout(["Jetpack"])
+        with self.assertRaises(CapacityExceed):
+            loadout(["HeavySword"] * 4)
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+from robocraft.game import Game
+from robocraft.metrics import Histogram, Metrics, TICK_BOUNDS
+from robocraft.robot import Robot
+from robocraft.utils.vector import Vector
+
+from tests.test_game import Brawler
+
+
+class HistogramTest(unittest.TestCase):
+    def test_buckets(self):
+        histogram = Histogram(TICK_BOUNDS)
+        for value in (0, 0, 1, 3, 3, 3, 2000):
+            histogram.add(value)
+        self.assertEqual(histogram.counts[:4], [2, 1, 0, 3])
+        self.assertEqual(histogram.counts[-1], 1)
+        self.assertEqual(histogram.quantile(0.5), 4)
+        self.assertEqual(histogram.quantile(1.0), 2000)
+        self.assertEqual(histogram.summary()["max"], 2000)
+        self.assertEqual(Histogram(TICK_BOUNDS).summary(), {"count": 0})
+
+
+class GameMetricsTest(unittest.TestCase):
+    def test_match(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            game = Game(headless=True, metrics=Metrics(path))
+            robots = [Brawler(), Brawler()]
+            for robot in robots:
+                game.register(robot)
+            game.run()
+            with open(path) as f:
+                dumped = json.load(f)
+        finally:
+            os.remove(path)
+        stats = game.metrics.query(robots[0].uuid, "moveForward")[robots[0].uuid, "moveForward"]
+        self.assertGreater(stats.calls, 0)
+        # 虚拟时钟下每个调用都准时完成
+        self.assertEqual(stats.elapsed, stats.requested)
+        self.assertEqual(stats.lag.max, 0)
+        self.assertEqual(dumped["api"][str(robots[0].uuid)]["moveForward"]["calls"], stats.calls)
+        self.assertEqual(dumped["loop"]["lag"]["count"], game.metrics.tick_lag.count)
+        self.assertEqual(game.metrics.tick_lag.max, 0)
+
+    def test_get_calls_counted_once(self):
+        class Getter(Robot):
+            async def run(self):
+                for _ in range(3):
+                    await self.getStatus()
+                await self.getPathTo(Vector(0, 0, 0))
+                self.getProperties()
+
+        game = Game(headless=True, timeout=1)
+        robots = [Getter(), Robot()]
+        for robot in robots:
+            game.register(robot)
+        game.run()
+        calls = {name: stats.calls for (_, name), stats in game.metrics.query(robots[0].uuid).items()}
+        self.assertEqual(calls, {"getStatus": 3, "getPathTo": 1, "getProperties": 1})
@@ -0,0 +1,86 @@
+import inspect
+import unittest
+
+import numpy as np
+
+from robocraft.game import Game
+from robocraft.navigation import UNREACHABLE, Navigator
+from robocraft.robot import Robot
+from robocraft.utils.vector import Vector
+
+
+class NavigatorTest(unittest.TestCase):
+    def test_field(self):
+        navigator = Navigator((6, 1, 3), blocked=[Vector(1, y, z) for y in (-1, 0, 1) for z in range(-3, 3)])
+        field = navigator.field(Vector(0, 0, 0))
+        self.assertIs(navigator.field(Vector(0, 0, 0)), field)
+        self.assertFalse(field.flags.writeable)
+        self.assertEqual(field[navigator.index(Vector(-1, 0, 0))], 1)
+        # 绕过 x=1 的墙，只能从 z=3 那一列过去
+        self.assertEqual(field[navigator.index(Vector(2, 0, 0))], 3 + 2 + 3)
+        self.assertEqual(field[navigator.index(Vector(1, 0, 0))], UNREACHABLE)
+        path = navigator.path(Vector(2, 0, 0), Vector(0, 0, 0))
+        self.assertEqual(len(path), field[navigator.index(Vector(2, 0, 0))])
+        self.assertEqual(path[-1], Vector(0, 0, 0))
+        for a, b in zip([Vector(2, 0, 0)] + path, path):
+            self.assertEqual(abs(b - a), 1)
+
+    def test_incremental(self):
+        half = (6, 1, 3)
+        navigator = Navigator(half, max_bytes=1 << 20)
+        targets = [Vector(0, 0, 0), Vector(6, 1, 3), Vector(-6, -1, -3)]
+        for target in targets:
+            navigator.field(target)
+        random = np.random.default_rng(0)
+        for _ in range(100):
+            cell = Vector(*(int(random.integers(-h, h + 1)) for h in half))
+            if random.random() < 0.6:
+                navigator.block(cell)
+            else:
+                navigator.clear(cell)
+            fresh = Navigator(half)
+            fresh.free[:] = navigator.free
+            for target in targets:
+                np.testing.assert_array_equal(navigator.field(target), fresh.field(target))
+
+    def test_lru(self):
+        navigator = Navigator((6, 1, 3))
+        navigator.max_bytes = 2 * navigator.field(Vector(0, 0, 0)).nbytes
+        navigator.field(Vector(1, 0, 0))
+        navigator.field(Vector(0, 0, 0))
+        navigator.field(Vector(2, 0, 0))
+        self.assertEqual(navigator.cached, [Vector(0, 0, 0), Vector(2, 0, 0)])
+
+
+class PathAPITest(unittest.TestCase):
+    def test_relative(self):
+        game = Game(headless=True)
+        robot = Robot()
+        game.register(robot)
+        player = game.entities.get_or_create(robot.uuid)
+        location, direction = game._get_status(player, "location"), game._get_status(player, "direction")
+
+        async def main():
+            path = await game.getPathTo(player, Vector(3, 0, 0))
+            field = await game.getDistanceField(player, Vector(3, 0, 0))
+            return path, field
+
+        loop = game.clock.new_event_loop()
+        game.clock.start(loop)
+        try:
+            path, field = loop.run_until_complete(main())
+        finally:
+            loop.close()
+        self.assertEqual(path, [Vector(1, 0, 0), Vector(2, 0, 0), Vector(3, 0, 0)])
+        self.assertEqual((field.at(Vector(0, 0, 0)), field.at(Vector(3, 0, 0))), (3, 0))
+        self.assertEqual(field.at(Vector(0, 0, 100)), UNREACHABLE)
+        self.assertEqual(game._get_status(player, "location"), location)
+        ticks = game.store.ticks[player.id]
+        self.assertEqual(game.clock.now, ticks["getPathTo"] + ticks["getDistanceField"])
+        self.assertNotEqual(direction, Vector.FORWARD)
+
+    def test_robot_api_is_coroutine(self):
+        robot = Robot()
+        self.assertTrue(inspect.iscoroutinefunction(robot.getPathTo))
+        self.assertTrue(inspect.iscoroutinefunction(robot.getDistanceField))
+        self.assertFalse(inspect.iscoroutinefunction(robot.getProperties))
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from robocraft.entities import Entity
+from robocraft.game import Game
+from robocraft.observation import FACING, HP, HP_SCALE, OWNER, TYPE
+from robocraft.recording import TYPE_IDS
+from robocraft.robot import Robot
+from robocraft.utils.vector import Vector
+
+
+class ObserverTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.robots = [Robot() for _ in range(3)]
+        for robot in self.robots:
+            self.game.register(robot)
+        self.players = [self.game.entities.get_or_create(robot.uuid) for robot in self.robots]
+
+    def cell(self, board, location):
+        return tuple(board[:, location[0] + 7, location[1] + 2, location[2] + 4].tolist())
+
+    def test_board(self):
+        game = self.game
+        board = game.observe()
+        self.assertEqual(board.dtype, np.int16)
+        self.assertEqual(int((board[TYPE] == TYPE_IDS["Wall"]).sum()),
+                         sum(game.store.type_of(i) is Entity.Wall for i in range(len(game.store))))
+        me = self.players[1]
+        location = game._get_status(me, "location")
+        self.assertEqual(self.cell(board, location), (TYPE_IDS["Player"], 2, 10 * HP_SCALE,
+                                                      Vector.AXES.index(game._get_status(me, "direction")) + 1))
+        game._set_status(me, "location", Vector(0, 0, 0))
+        game._set_status(me, "hp", 2.5)
+        self.assertIs(game.observe(), board)
+        self.assertEqual(self.cell(board, location), (0, 0, 0, 0))
+        self.assertEqual(self.cell(board, Vector(0, 0, 0))[:3], (TYPE_IDS["Player"], 2, 250))
+        self.assertEqual(len(game.tolist()), 15)
+
+    def test_crop(self):
+        game = self.game
+        me = self.players[0]
+        for direction in (Vector.FORWARD, Vector.RIGHT, Vector.BACKWARD, Vector.LEFT):
+            game._set_status(me, "direction", direction)
+            crop = game.observe_around(me, 6, 1)
+            self.assertEqual(crop.shape, (4, 13, 3, 13))
+            self.assertEqual(crop[OWNER, 6, 1, 6], 1)
+            self.assertEqual(crop[FACING, 6, 1, 6], Vector.AXES.index(Vector.FORWARD) + 1)
+            for other in self.players[1:]:
+                status = game._get_relative_status(me, other)
+                a, b, c = status["location"]
+                if max(abs(a), abs(c)) <= 6:
+                    self.assertEqual(crop[TYPE, a + 6, b + 1, c + 6], TYPE_IDS["Player"])
+                    self.assertEqual(crop[FACING, a + 6, b + 1, c + 6], Vector.AXES.index(status["direction"]) + 1)
+            # 看得到的墙和感知接口给出的相对位置一致
+            for status in asyncio.run(game.senseSurroundings(me)):
+                a, b, c = status["location"]
+                if status["type"] is Entity.Wall and max(abs(a), abs(c)) <= 6 and abs(b) <= 1:
+                    self.assertEqual(crop[TYPE, a + 6, b + 1, c + 6], TYPE_IDS["Wall"])
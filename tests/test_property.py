@@ -29,3 +29,28 @@ class PropertyTest(unittest.TestCase):
         p = ComponentProperty(attack=1.0, defense=0.0, speed=0.0, costs=0.0)
         self.assertEqual(p.attack.normal, 1.0)
         self.assertEqual(p.attack.back, 1.0)
+
+    def test_slots(self):
+        p = AttackProperty(1.0)
+        self.assertFalse(hasattr(p, "__dict__"))
+        with self.assertRaises(AttributeError):
+            p.front = 1.0
+
+    def test_init_type(self):
+        with self.assertRaises(TypeError):
+            AttackProperty(normal="1.0")
+
+    def test_mul_mixed(self):
+        p = RobotProperty(hp=10.0, attack=1.0, defense=2.0)
+        c = ComponentProperty(attack=AttackProperty(normal=2.0, back=3.0))
+        p = p * c
+        self.assertEqual(p.hp, 10.0)
+        self.assertEqual(p.attack.normal, 2.0)
+        self.assertEqual(p.attack.back, 3.0)
+        self.assertEqual(p.defense.normal, 0.0)
+
+    def test_copy(self):
+        p = ComponentProperty(attack=1.0)
+        q = p.copy()
+        q.attack.normal = 2.0
+        self.assertEqual(p.attack.normal, 1.0)
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from robocraft.game import Game
+from robocraft.recording import MOVE, Recorder, Replay, TYPE_IDS
+
+from tests.test_game import Brawler
+
+
+class RecordingTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".rec")
+        os.close(fd)
+        self.game = Game(headless=True, recorder=Recorder(self.path, keyframe_interval=16))
+        self.robots = [Brawler(), Brawler()]
+        for robot in self.robots:
+            self.game.register(robot)
+        self.players = [self.game.entities.get_or_create(robot.uuid) for robot in self.robots]
+        self.spawns = [self.game._get_status(player, "location") for player in self.players]
+        self.game.run()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_final_state(self):
+        with Replay(self.path) as replay:
+            state = replay.state_at(self.game.clock.now)
+            self.assertEqual(len(state), len(self.game.store))
+            for player in self.players:
+                row = state[player.id]
+                self.assertEqual(tuple(row["location"]), self.game._get_status(player, "location"))
+                self.assertEqual(tuple(row["direction"]), self.game._get_status(player, "direction"))
+                self.assertEqual(row["hp"], self.game._get_status(player, "hp"))
+                self.assertEqual(bool(row["alive"]), self.game._get_status(player, "alive"))
+                self.assertEqual(row["type"], TYPE_IDS["Player"])
+
+    def test_seek(self):
+        with Replay(self.path) as replay:
+            self.assertGreater(len(replay.keyframes), 1)
+            start = replay.state_at(0)
+            for player, location in zip(self.players, self.spawns):
+                self.assertEqual(tuple(start[player.id]["location"]), location)
+            # 跳到两个关键帧之间，结果应与逐条重放的最后一次移动一致
+            tick = int(replay.keyframes[1]) + 3
+            me = self.players[0].id
+            moves = [r for r in replay.records(0, tick + 1) if r["kind"] == MOVE and r["entity"] == me]
+            last = moves[-1] if moves else None
+            expected = (last["a"], last["b"], last["c"]) if last is not None else self.spawns[0]
+            self.assertEqual(tuple(replay.state_at(tick)[me]["location"]), tuple(expected))
+
+    def test_calls(self):
+        with Replay(self.path) as replay:
+            calls = list(replay.calls())
+        self.assertEqual({call.api for call in calls}, {"moveForward", "attack"})
+        self.assertEqual({call.entity for call in calls}, {player.id for player in self.players})
+        self.assertEqual([call.tick for call in calls], sorted(call.tick for call in calls))
@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from robocraft.game import Game
+from robocraft.spectate import DELTA, KEYFRAME, SpectatorFeed, SpectatorState, Subscriber, read_frame
+
+from tests.test_game import Brawler
+
+
+class SpectatorFeedTest(unittest.TestCase):
+    def test_stream(self):
+        feed = SpectatorFeed()
+        game = Game(headless=True, spectators=feed)
+        for robot in (Brawler(), Brawler()):
+            game.register(robot)
+        state = SpectatorState()
+        kinds = []
+
+        async def watch():
+            # 连上之前不让虚拟时钟往前跳
+            game.clock.hold()
+            while not game.is_ready():
+                await asyncio.sleep(0)
+            reader, writer = await asyncio.open_connection(*feed.address)
+            try:
+                while True:
+                    frame = await read_frame(reader)
+                    if frame is None:
+                        return
+                    if not kinds:
+                        game.clock.release()
+                    kinds.append((frame.kind, len(frame.rows)))
+                    state.apply(frame)
+            finally:
+                writer.close()
+
+        async def main():
+            play = asyncio.ensure_future(game.play())
+            await watch()
+            await play
+
+        loop = game.clock.new_event_loop()
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+        store = game.store
+        n = len(store)
+        self.assertEqual(kinds[0], (KEYFRAME, n))
+        # 墙不会变，每个增量帧最多只有两个机器人
+        self.assertEqual({kind for kind, _ in kinds[1:]}, {DELTA})
+        self.assertLessEqual(max(count for _, count in kinds[1:]), 2)
+        self.assertEqual(len(state), n)
+        np.testing.assert_array_equal(state.location, store.location[:n])
+        np.testing.assert_array_equal(state.direction, store.direction[:n])
+        np.testing.assert_array_equal(state.hp, store.hp[:n])
+        np.testing.assert_array_equal(state.alive, store.alive[:n])
+        self.assertEqual(state.type_name(n - 1), "Player")
+        self.assertEqual(state.tick, game.clock.now)
+
+    def test_slow_subscriber(self):
+        async def main():
+            subscriber = Subscriber(writer=None, buffer=2)
+            subscriber.needs_keyframe = False
+            self.assertTrue(subscriber.offer(b"1"))
+            self.assertTrue(subscriber.offer(b"2"))
+            self.assertFalse(subscriber.offer(b"3"))
+            self.assertEqual((subscriber.skipped, subscriber.queue.qsize()), (3, 0))
+            self.assertTrue(subscriber.needs_keyframe)
+
+        asyncio.run(main())
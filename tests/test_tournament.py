@@ -0,0 +1,43 @@
+import unittest
+
+from robocraft.robot import Robot
+from robocraft.tournament import Standing, Tournament, round_robin, swiss
+
+
+class Brawler(Robot):
+    async def run(self):
+        while True:
+            await self.moveForward()
+            await self.attack()
+
+
+class Idler(Robot):
+    async def run(self):
+        while True:
+            await self.halt(100)
+
+
+class ScheduleTest(unittest.TestCase):
+    def test_round_robin(self):
+        rounds = list(round_robin(["a", "b", "c"], rounds=2))
+        self.assertEqual(rounds[0], [("a", "b"), ("a", "c"), ("b", "c")])
+        self.assertEqual(rounds[1], [("b", "a"), ("c", "a"), ("c", "b")])
+
+    def test_swiss_avoids_rematch(self):
+        standings = {name: Standing(name) for name in "abcde"}
+        standings["a"].wins = standings["b"].wins = 1
+        standings["a"].opponents.add("b")
+        pairs, bye = swiss(standings)
+        self.assertEqual(bye, "e")
+        self.assertNotIn(("a", "b"), pairs)
+        self.assertEqual(len(pairs), 2)
+
+
+class TournamentTest(unittest.TestCase):
+    def test_play(self):
+        tournament = Tournament([Brawler, Idler], rounds=2, workers=2)
+        results = list(tournament.play())
+        self.assertEqual(len(results), 2)
+        self.assertEqual(sorted(r.match for r in results), [0, 1])
+        standings = tournament.standings()
+        self.assertEqual([s.played for s in standings], [2, 2])
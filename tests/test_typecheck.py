@@ -0,0 +1,64 @@
+import unittest
+from typing import List
+
+from robocraft.utils.typecheck import overload, type_check
+
+
+class OverloadTest(unittest.TestCase):
+    def setUp(self):
+        @overload
+        def fn(a):
+            return "any"
+
+        @fn.register
+        def _(a: int):
+            return "int"
+
+        @fn.register
+        def _(a: float, b: float = 1.0):
+            return "float"
+
+        self.fn = fn
+
+    def test_dispatch(self):
+        self.assertEqual(self.fn(1), "int")
+        self.assertEqual(self.fn(1.0), "float")
+        self.assertEqual(self.fn("a"), "any")
+        self.assertEqual(self.fn(a=1.0, b=2.0), "float")
+
+    def test_cached_dispatch(self):
+        for _ in range(3):
+            self.assertEqual(self.fn(1), "int")
+            self.assertEqual(self.fn(2.0), "float")
+            self.assertEqual(self.fn(a=1), "int")
+            self.assertEqual(self.fn([]), "any")
+
+    def test_register_after_call(self):
+        self.assertEqual(self.fn("a"), "any")
+
+        @self.fn.register
+        def _(a: str):
+            return "str"
+
+        self.assertEqual(self.fn("a"), "str")
+
+    def test_no_match(self):
+        @overload
+        def fn(a: int):
+            return a
+
+        with self.assertRaises(TypeError):
+            fn("a")
+
+
+class TypeCheckTest(unittest.TestCase):
+    def test_type_check(self):
+        @type_check(True)
+        def fn(a: int, b: List[int]):
+            return a
+
+        self.assertEqual(fn(1, [1, 2]), 1)
+        with self.assertRaises(TypeError):
+            fn(1.0, [])
+        with self.assertRaises(TypeError):
+            fn(1, [1.0])
@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from robocraft.game import Game
+from robocraft.vecenv import ACTIONS, ATTACK, FEATURES, HALT, MOVE_FORWARD, ROTATE_LEFT, VecArena
+
+from tests.test_game import Brawler
+
+
+def brawl(env: VecArena, steps: int):
+    """Play `Brawler`s: move forward, attack, repeat."""
+    attack = np.zeros((env.arenas, env.robots), dtype=bool)
+    ready = np.ones_like(attack)
+    for _ in range(steps):
+        obs, rewards, dones, info = env.step(np.where(attack, ATTACK, MOVE_FORWARD))
+        attack ^= ready
+        ready = info["ready"]
+        yield obs, rewards, dones, info
+
+
+class VecArenaTest(unittest.TestCase):
+    def test_same_as_game(self):
+        game = Game(headless=True)
+        robots = [Brawler(), Brawler()]
+        for robot in robots:
+            game.register(robot)
+        game.run()
+        players = [game.entities.get_or_create(robot.uuid) for robot in robots]
+
+        env = VecArena(3, [Brawler, Brawler], auto_reset=False)
+        total = np.zeros((3, 2))
+        for _, rewards, dones, info in brawl(env, game.clock.now + 10):
+            total += rewards
+            if dones.any():
+                self.assertTrue(dones.all())
+                self.assertEqual(info["ticks"].tolist(), [game.clock.now] * 3)
+        for i, player in enumerate(players):
+            self.assertEqual(env.hp[:, i].tolist(), [game._get_status(player, "hp")] * 3)
+            self.assertEqual(env.alive[:, i].tolist(), [game._get_status(player, "alive")] * 3)
+            self.assertEqual(env.location[0, i].tolist(), list(game._get_status(player, "location")))
+        board = game.scoreboard()
+        self.assertEqual(total[0].tolist(), [board[r.uuid]["damage"] - board[r.uuid]["damageTaken"] for r in robots])
+
+    def test_costs_and_reset(self):
+        env = VecArena(2, [["SpeedCore"], []])
+        self.assertLess(env.costs[0, MOVE_FORWARD], env.costs[1, MOVE_FORWARD])
+        self.assertEqual(env.costs[1, HALT], 1)
+        env = VecArena(2, [[], []])
+        direction = env.direction.copy()
+        actions = np.full((2, 2), ROTATE_LEFT)
+        for _ in range(env.costs[1, ROTATE_LEFT] - 1):
+            obs, _, _, info = env.step(actions)
+            self.assertFalse(info["ready"].any())
+        obs, _, _, info = env.step(actions)
+        self.assertTrue(info["ready"].all())
+        self.assertFalse((env.direction == direction).all(axis=2).any())
+        self.assertEqual(obs.shape, (2, 2, 2, FEATURES))
+        # 自己那一行是绝对位置和朝向，别人那一行和_get_relative_status一样是相对的
+        self.assertEqual(obs[0, 0, 0, :3].tolist(), env.location[0, 0].tolist())
+        self.assertEqual(obs[0, 0, 1, :3].tolist(), [0, 0, 6])
+        with self.assertRaises(ValueError):
+            env.step(np.full((2, 2), len(ACTIONS)))
+        env = VecArena(2, [Brawler, Brawler], timeout=1)
+        for _, _, dones, info in brawl(env, 40):
+            pass
+        self.assertTrue(dones.all())
+        self.assertEqual(env.now.tolist(), [0, 0])
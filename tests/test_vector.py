@@ -20,3 +20,36 @@ class VectorTest(unittest.TestCase):
         self.assertEqual(p1 * d, Vector(9, 8, -7))
         d = Vector(0, 0, -1)
         self.assertEqual(p1 * d, Vector(-9, 8, 7))
+
+    def test_hash(self):
+        locations = {Vector(1, 2, 3): "a"}
+        self.assertEqual(locations[Vector(1, 2, 3)], "a")
+
+    def test_immutable(self):
+        p = Vector(1, 2, 3)
+        with self.assertRaises(AttributeError):
+            p.x = 2
+        q = p
+        q += Vector(1, 0, 0)
+        self.assertEqual(p, Vector(1, 2, 3))
+        self.assertEqual(q, Vector(2, 2, 3))
+
+    def test_interned_rotation(self):
+        d = Vector.FORWARD
+        for _ in range(4):
+            d = d * Vector.RIGHT
+            self.assertIn(d, Vector.AXES)
+            self.assertIs(d, Vector.AXES[Vector.AXES.index(d)])
+        self.assertIs(d, Vector.FORWARD)
+        self.assertIs(-Vector.UP, Vector.DOWN)
+
+    def test_abs(self):
+        self.assertEqual(abs(Vector(1, 2, 2)), 3.0)
+
+    def test_no_tuple_operators(self):
+        v = Vector(1, 2, 3)
+        self.assertEqual((0, 0, 1) + v, Vector(1, 2, 4))
+        self.assertEqual((0, 0, 1) - v, Vector(-1, -2, -2))
+        for operation in (lambda: 2 * v, lambda: v * 2, lambda: (1, 2) + v, lambda: (1, 0, 0) * v):
+            with self.assertRaises(TypeError):
+                operation()
@@ -0,0 +1,53 @@
+import unittest
+from uuid import uuid4
+
+from robocraft.entities import Entity
+from robocraft.game import Game
+from robocraft.utils.vector import Vector
+from robocraft.workers import RemoteRobot, Snapshot
+
+from tests.test_game import Brawler
+
+
+class SnapshotTest(unittest.TestCase):
+    def test_write_read(self):
+        game = Game(headless=True)
+        robot = Brawler()
+        game.register(robot)
+        player = game.entities.get_or_create(robot.uuid)
+        snapshot = Snapshot.create(len(game.store))
+        try:
+            snapshot.write(game.store, slice(None, len(game.store)), 3, game.version)
+            reader = Snapshot.attach(snapshot.memory.name, snapshot.count)
+            location, direction, hp, alive = reader.read(player.id)
+            self.assertEqual(location, game._get_status(player, "location"))
+            self.assertEqual(direction, game._get_status(player, "direction"))
+            self.assertEqual((hp, alive), (game._get_status(player, "hp"), True))
+            self.assertEqual(int(reader.header["tick"]), 3)
+            game._set_status(player, "location", location + Vector.UP)
+            snapshot.write(game.store, [player.id], 4, game.version)
+            self.assertEqual(reader.read(player.id)[0], location + Vector.UP)
+            reader.close()
+        finally:
+            snapshot.close()
+            snapshot.memory.unlink()
+
+
+class RemoteRobotTest(unittest.TestCase):
+    def test_with_uuid(self):
+        uuid = uuid4()
+        robot = Brawler.with_uuid(uuid)
+        self.assertIsInstance(robot, Brawler)
+        self.assertEqual(robot.uuid, uuid)
+
+    def test_match(self):
+        game = Game(headless=True)
+        robots = [RemoteRobot("tests.test_game:Brawler"), Brawler()]
+        for robot in robots:
+            game.register(robot)
+        self.assertIs(robots[0].components, Brawler.components)
+        game.run()
+        scoreboard = game.scoreboard()
+        self.assertGreater(scoreboard[robots[0].uuid]["damage"], 0)
+        self.assertEqual(sum(not score["alive"] for score in scoreboard.values()), 1)
+        self.assertIs(game.store.type_of(game.entities.get_or_create(robots[0].uuid).id), Entity.Player)